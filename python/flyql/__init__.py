@@ -2,6 +2,7 @@ from .core.parser import Parser, ParserError, ParseResult, parse
 from .core.tree import Node
 from .core.expression import Expression, FunctionCall, Duration, Parameter
 from .bind import bind_params
+from .references import referenced_paths
 from .core.key import Key, parse_key
 from .core.column import Column, ColumnSchema
 from .core.constants import BoolOperator, Operator
@@ -70,6 +71,7 @@ __all__ = [
     "parse",
     "parse_flyql_type",
     "parse_key",
+    "referenced_paths",
     "tokenize",
     "type_permits_unknown_children",
 ]
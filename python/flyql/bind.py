@@ -10,14 +10,17 @@ concrete values. Parameters can appear in:
                                the key string; bind_params() does not rewrite
                                keys; downstream consumers handle this)
 
-bind_params() mutates the AST in place and returns the same Node.
+bind_params() mutates the AST in place and returns the same Node. A frozen
+AST (see flyql.core.frozen, e.g. from a ParseCache) is left unchanged: its
+mutable copy is bound and returned instead.
 """
 
 from typing import Any, Dict, Set, Union
 
 from flyql.core.exceptions import FlyqlError
 from flyql.core.expression import Expression, FunctionCall, Parameter, Duration
-from flyql.core.tree import Node
+from flyql.core.frozen import is_frozen, thaw
+from flyql.core.tree import Node, iter_nodes
 from flyql.literal import LiteralKind
 
 INT64_MIN = -(2**63)
@@ -201,17 +204,17 @@ def _walk(
 ) -> None:
     if node is None:
         return
-    if node.expression is not None:
-        _bind_expression(node.expression, params, consumed, max_positional)
-    _walk(node.left, params, consumed, max_positional)
-    _walk(node.right, params, consumed, max_positional)
+    for current in iter_nodes(node):
+        if current.expression is not None:
+            _bind_expression(current.expression, params, consumed, max_positional)
 
 
 def bind_params(node: Node, params: Dict[str, Any]) -> Node:
     """Substitute parameter placeholders in a parsed AST with concrete values.
 
     It mutates the tree in place. Do not reuse a bound AST with different
-    parameter sets — parse a fresh tree instead.
+    parameter sets — parse a fresh tree instead. A frozen tree is not
+    changed: a mutable copy of it is bound and returned.
 
     Args:
         node: The root Node of a parsed FlyQL query.
@@ -220,7 +223,7 @@ def bind_params(node: Node, params: Dict[str, Any]) -> Node:
             (e.g. ``{"1": 42}``).
 
     Returns:
-        The same Node, with parameters substituted in place.
+        The same Node (a copy for a frozen tree), with parameters substituted.
 
     Raises:
         FlyqlError: if a referenced parameter is missing, an extra parameter
@@ -229,6 +232,8 @@ def bind_params(node: Node, params: Dict[str, Any]) -> Node:
     if not isinstance(params, dict):
         raise FlyqlError("bind_params() params must be a dict")
 
+    if is_frozen(node):
+        node = thaw(node)
     consumed: Set[str] = set()
     max_positional = [0]
     _walk(node, params, consumed, max_positional)
@@ -25,7 +25,7 @@ from flyql.renderers.registry import (
     RendererRegistry,
     default_registry as default_renderer_registry,
 )
-from flyql.transformers.registry import TransformerRegistry, default_registry
+from flyql.transformers.registry import TransformerRegistry, shared_default_registry
 
 from .column import ParsedColumn
 
@@ -52,7 +52,7 @@ def diagnose(
     if not parsed_columns:
         return []
     if registry is None:
-        registry = default_registry()
+        registry = shared_default_registry()
     if renderer_registry is None:
         renderer_registry = default_renderer_registry()
 
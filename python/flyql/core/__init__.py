@@ -1,6 +1,7 @@
 from typing import Any
 
 from flyql.core.parser import Parser, ParserError, ParseResult, parse
+from flyql.core.parse_cache import ParseCache, default_parse_cache
 from flyql.core.tree import Node
 from flyql.core.expression import Expression
 from flyql.core.key import Key, KeyTransformer, parse_key
@@ -16,6 +17,8 @@ __all__ = [
     "Parser",
     "ParserError",
     "ParseResult",
+    "ParseCache",
+    "default_parse_cache",
     "Node",
     "Expression",
     "Key",
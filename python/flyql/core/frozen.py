@@ -0,0 +1,176 @@
+"""Frozen (immutable, shareable) ASTs.
+
+:func:`freeze` turns a parsed tree into a read-only one in place: its
+nodes, expressions and keys become :class:`FrozenNode`,
+:class:`FrozenExpression` and :class:`FrozenKey` — subclasses that refuse
+attribute assignment — and their lists become tuples. Freezing costs one
+walk over the tree and nothing on the parse path; a frozen tree reads,
+generates SQL, compiles and pickles like any other.
+
+The value objects a tree holds (:class:`FunctionCall`,
+:class:`Parameter`, :class:`KeyTransformer`, ...) keep their classes so
+they still compare equal to parsed ones; they are shared with the tree
+and must not be modified either.
+
+:func:`thaw` returns a mutable copy. :func:`~flyql.bind_params` binds
+frozen trees that way, so a cached tree is never changed.
+"""
+
+import dataclasses
+from typing import Any, Dict, List, NoReturn, Optional, Sequence, Tuple
+
+from flyql.core.exceptions import FlyqlError
+from flyql.core.expression import Expression, FunctionCall
+from flyql.core.key import Key
+from flyql.core.tree import Node
+
+
+def _refuse(obj: object) -> NoReturn:
+    raise FlyqlError(
+        f"cannot modify a frozen {type(obj).__name__}; thaw() the tree first"
+    )
+
+
+class FrozenNode(Node):
+    def __setattr__(self, name: str, value: Any) -> None:
+        _refuse(self)
+
+    def __delattr__(self, name: str) -> None:
+        _refuse(self)
+
+
+class FrozenExpression(Expression):
+    def __setattr__(self, name: str, value: Any) -> None:
+        _refuse(self)
+
+    def __delattr__(self, name: str) -> None:
+        _refuse(self)
+
+
+class FrozenKey(Key):
+    def __setattr__(self, name: str, value: Any) -> None:
+        _refuse(self)
+
+    def __delattr__(self, name: str) -> None:
+        _refuse(self)
+
+
+def _retype(obj: object, cls: type, **fields: Any) -> None:
+    """Set ``fields`` on ``obj`` bypassing ``__setattr__``, then make it a
+    ``cls``."""
+    vars(obj).update(fields)
+    obj.__class__ = cls
+
+
+def _as_tuple(items: Optional[Sequence[Any]]) -> Optional[Tuple[Any, ...]]:
+    return None if items is None else tuple(items)
+
+
+def _nodes(root: Node) -> List[Node]:
+    found = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        found.append(node)
+        if node.right is not None:
+            stack.append(node.right)
+        if node.left is not None:
+            stack.append(node.left)
+    return found
+
+
+def is_frozen(node: Node) -> bool:
+    return isinstance(node, FrozenNode)
+
+
+def freeze(root: Node) -> Node:
+    """Freeze the tree under ``root`` in place and return ``root``."""
+    for node in _nodes(root):
+        if isinstance(node, FrozenNode):
+            continue
+        expression = node.expression
+        if expression is not None and not isinstance(expression, FrozenExpression):
+            key = expression.key
+            if not isinstance(key, FrozenKey):
+                _retype(
+                    key,
+                    FrozenKey,
+                    segments=tuple(key.segments),
+                    quoted_segments=tuple(key.quoted_segments),
+                    transformers=tuple(key.transformers),
+                    segment_ranges=tuple(key.segment_ranges),
+                )
+            _retype(
+                expression,
+                FrozenExpression,
+                values=_as_tuple(expression.values),
+                values_types=_as_tuple(expression.values_types),
+                value_ranges=_as_tuple(expression.value_ranges),
+            )
+        _retype(node, FrozenNode)
+    return root
+
+
+def _copy(obj: Any, cls: type, **fields: Any) -> Any:
+    copy: Any = object.__new__(cls)
+    vars(copy).update(vars(obj), **fields)
+    return copy
+
+
+def _as_list(items: Optional[Sequence[Any]]) -> Optional[List[Any]]:
+    return None if items is None else list(items)
+
+
+def _thaw_key(key: Key) -> Key:
+    return _copy(  # type: ignore[no-any-return]
+        key,
+        Key,
+        segments=list(key.segments),
+        quoted_segments=list(key.quoted_segments),
+        transformers=[
+            dataclasses.replace(
+                t,
+                arguments=list(t.arguments),
+                argument_ranges=list(t.argument_ranges),
+            )
+            for t in key.transformers
+        ],
+        segment_ranges=list(key.segment_ranges),
+    )
+
+
+def _thaw_expression(expression: Expression) -> Expression:
+    value = expression.value
+    if isinstance(value, FunctionCall):
+        value = dataclasses.replace(
+            value,
+            duration_args=list(value.duration_args),
+            parameter_args=list(value.parameter_args),
+        )
+    return _copy(  # type: ignore[no-any-return]
+        expression,
+        Expression,
+        key=_thaw_key(expression.key),
+        value=value,
+        values=_as_list(expression.values),
+        values_types=_as_list(expression.values_types),
+        value_ranges=_as_list(expression.value_ranges),
+    )
+
+
+def thaw(root: Node) -> Node:
+    """A mutable copy of the (frozen or not) tree under ``root``."""
+    copies: Dict[int, Node] = {}
+    for node in reversed(_nodes(root)):
+        copies[id(node)] = _copy(
+            node,
+            Node,
+            expression=(
+                _thaw_expression(node.expression)
+                if node.expression is not None
+                else None
+            ),
+            left=copies[id(node.left)] if node.left is not None else None,
+            right=copies[id(node.right)] if node.right is not None else None,
+        )
+    return copies[id(root)]
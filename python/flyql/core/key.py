@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from typing import Any, List, Optional, Tuple
 
 from flyql.core.exceptions import FlyqlError, KeyParseError
-from flyql.core.range import Range
+from flyql.core.range import NO_RANGE, Range
 
 
 @dataclass
@@ -19,6 +19,10 @@ class KeyTransformer:
     argument_ranges: List[Range] = field(default_factory=list)
 
 
+def _span(start: int, end: int, ranges: bool) -> Range:
+    return Range(start, end) if ranges else NO_RANGE
+
+
 class Key:
     def __init__(
         self,
@@ -55,7 +59,10 @@ class Key:
 
 
 class KeyParser:
-    def __init__(self) -> None:
+    def __init__(self, ranges: bool = True) -> None:
+        # With ranges=False every source range is NO_RANGE (lean parsing);
+        # error ranges stay exact.
+        self.ranges = ranges
         self.input = ""
         self.pos = 0
         self.base_offset = 0
@@ -178,7 +185,7 @@ class KeyParser:
         self.current_segment_has_content = False
         self.current_segment_start = -1
 
-        key_range = Range(base_offset, base_offset + len(key_string))
+        key_range = _span(base_offset, base_offset + len(key_string), self.ranges)
 
         if not self.input:
             return Key([], self.input, [], range=key_range, segment_ranges=[])
@@ -196,7 +203,9 @@ class KeyParser:
                 seg_start = self.base_offset + self.current_segment_start
             self.segments.append(self.current_segment)
             self.quoted_segments.append(self.current_segment_quoted)
-            self.segment_ranges.append(Range(seg_start, self.base_offset + seg_end))
+            self.segment_ranges.append(
+                _span(seg_start, self.base_offset + seg_end, self.ranges)
+            )
             self.current_segment = ""
             self.current_segment_quoted = False
             self.current_segment_has_content = False
@@ -208,9 +217,10 @@ class KeyParser:
                     self.segments.append("")
                     self.quoted_segments.append(False)
                     self.segment_ranges.append(
-                        Range(
+                        _span(
                             self.base_offset + self.pos,
                             self.base_offset + self.pos,
+                            self.ranges,
                         )
                     )
 
@@ -224,10 +234,10 @@ class KeyParser:
 
 
 def _parse_transformer_arguments(
-    args_str: str, base_offset: int
+    args_str: str, base_offset: int, ranges: bool = True
 ) -> Tuple[List[Any], List[Range]]:
     args: List[Any] = []
-    ranges: List[Range] = []
+    arg_ranges: List[Range] = []
     i = 0
     while i < len(args_str):
         # Skip leading whitespace BEFORE capturing the argument start.
@@ -261,7 +271,9 @@ def _parse_transformer_arguments(
                 )
             arg_end = i
             args.append(val)
-            ranges.append(Range(base_offset + arg_start, base_offset + arg_end))
+            arg_ranges.append(
+                _span(base_offset + arg_start, base_offset + arg_end, ranges)
+            )
         else:
             val = ""
             while i < len(args_str) and args_str[i] not in (",", " "):
@@ -275,20 +287,25 @@ def _parse_transformer_arguments(
                     args.append(float(val))
                 except ValueError:
                     args.append(val)
-            ranges.append(Range(base_offset + arg_start, base_offset + arg_end))
+            arg_ranges.append(
+                _span(base_offset + arg_start, base_offset + arg_end, ranges)
+            )
         while i < len(args_str) and args_str[i] in (" ", ","):
             i += 1
-    return args, ranges
+    return args, arg_ranges
 
 
-def _parse_transformer_spec(spec: str, base_offset: int) -> KeyTransformer:
+def _parse_transformer_spec(
+    spec: str, base_offset: int, ranges: bool = True
+) -> KeyTransformer:
+    spec_range = _span(base_offset, base_offset + len(spec), ranges)
     paren_index = spec.find("(")
     if paren_index == -1:
         return KeyTransformer(
             name=spec,
             arguments=[],
-            range=Range(base_offset, base_offset + len(spec)),
-            name_range=Range(base_offset, base_offset + len(spec)),
+            range=spec_range,
+            name_range=spec_range,
             argument_ranges=[],
         )
     name = spec[:paren_index]
@@ -297,41 +314,43 @@ def _parse_transformer_spec(spec: str, base_offset: int) -> KeyTransformer:
         partial_args_str = spec[paren_index + 1 :]
         if partial_args_str:
             arg_values, arg_ranges = _parse_transformer_arguments(
-                partial_args_str, base_offset + paren_index + 1
+                partial_args_str, base_offset + paren_index + 1, ranges
             )
             return KeyTransformer(
                 name=name,
                 arguments=arg_values,
-                range=Range(base_offset, base_offset + len(spec)),
-                name_range=Range(base_offset, base_offset + paren_index),
+                range=spec_range,
+                name_range=_span(base_offset, base_offset + paren_index, ranges),
                 argument_ranges=arg_ranges,
             )
         return KeyTransformer(
             name=name,
             arguments=[],
-            range=Range(base_offset, base_offset + len(spec)),
-            name_range=Range(base_offset, base_offset + paren_index),
+            range=spec_range,
+            name_range=_span(base_offset, base_offset + paren_index, ranges),
             argument_ranges=[],
         )
     args_str = spec[paren_index + 1 : close_index]
     arg_values, arg_ranges = _parse_transformer_arguments(
-        args_str, base_offset + paren_index + 1
+        args_str, base_offset + paren_index + 1, ranges
     )
     return KeyTransformer(
         name=name,
         arguments=arg_values,
-        range=Range(base_offset, base_offset + len(spec)),
-        name_range=Range(base_offset, base_offset + paren_index),
+        range=spec_range,
+        name_range=_span(base_offset, base_offset + paren_index, ranges),
         argument_ranges=arg_ranges,
     )
 
 
-def parse_key(key_string: str, base_offset: int = 0) -> Key:
+def parse_key(key_string: str, base_offset: int = 0, ranges: bool = True) -> Key:
+    """Parse a key with its transformer pipeline. With ``ranges=False``
+    every source range of the result is ``NO_RANGE``."""
     parts = key_string.split("|")
     base_key_string = parts[0]
     transformer_specs = parts[1:] if len(parts) > 1 else []
 
-    parser = KeyParser()
+    parser = KeyParser(ranges)
     key = parser.parse(base_key_string, base_offset)
 
     if transformer_specs:
@@ -339,7 +358,7 @@ def parse_key(key_string: str, base_offset: int = 0) -> Key:
         # First transformer spec starts after base key + '|' char.
         running_offset = base_offset + len(base_key_string) + 1
         for spec in transformer_specs:
-            parsed = _parse_transformer_spec(spec, running_offset)
+            parsed = _parse_transformer_spec(spec, running_offset, ranges)
             if not parsed.name:
                 raise KeyParseError(
                     "empty transformer name in key",
@@ -350,7 +369,7 @@ def parse_key(key_string: str, base_offset: int = 0) -> Key:
         key.transformers = transformers
         key.raw = key_string
         # Key.range covers entire pipeline including transformers.
-        key.range = Range(base_offset, base_offset + len(key_string))
+        key.range = _span(base_offset, base_offset + len(key_string), ranges)
 
     return key
 
@@ -0,0 +1,123 @@
+"""Bounded, thread-safe cache of parsed queries.
+
+Services that see the same query text over and over (dashboards,
+saved searches) can parse through a :class:`ParseCache` instead of
+:func:`~flyql.parse`. Entries are keyed by the text and the parse mode
+and hold :mod:`frozen <flyql.core.frozen>` trees, so every caller gets
+the same AST and none can change it for the others:
+
+    from flyql.core import default_parse_cache
+
+    result = default_parse_cache().parse("status >= 500 and service = 'api'")
+
+:func:`~flyql.bind_params` binds a copy of a frozen tree and returns it.
+Queries that fail to parse are not cached; the error is raised on every
+call. Entries are evicted least-recently-used beyond ``max_entries``;
+:meth:`ParseCache.invalidate` drops them explicitly. All methods may be
+called from any thread; parsing happens outside the lock, so two threads
+missing on the same text may both parse it (the first insert wins).
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from flyql.core.exceptions import FlyqlError
+from flyql.core.frozen import freeze
+from flyql.core.parser import PARSE_MODE_FULL, PARSE_MODES, ParseResult, parse
+from flyql.core.tree import Node
+
+DEFAULT_MAX_ENTRIES = 1024
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class ParseCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+
+
+class ParseCache:
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """Construct a cache holding at most ``max_entries`` trees.
+
+        :raises FlyqlError: for a non-positive bound.
+        """
+        if max_entries < 1:
+            raise FlyqlError("max_entries must be positive")
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # (text, mode) -> frozen root; order is recency.
+        self._entries: "OrderedDict[Tuple[str, str], Optional[Node]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def parse(self, text: str, mode: str = PARSE_MODE_FULL) -> ParseResult:
+        """Parse ``text`` as :func:`~flyql.parse` would, or return the
+        cached tree.
+
+        :raises ParserError: when ``text`` does not parse.
+        """
+        entry = (text, mode)
+        with self._lock:
+            if entry in self._entries:
+                self._entries.move_to_end(entry)
+                self._hits += 1
+                return ParseResult(self._entries[entry])
+            self._misses += 1
+        root = parse(text, mode=mode).root
+        if root is not None:
+            freeze(root)
+        with self._lock:
+            if entry in self._entries:
+                return ParseResult(self._entries[entry])
+            self._entries[entry] = root
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return ParseResult(root)
+
+    def invalidate(self, text: Optional[str] = None) -> int:
+        """Drop the entries of ``text`` (in every mode), or all entries
+        without it; counters are kept. Returns how many were dropped."""
+        with self._lock:
+            if text is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                return dropped
+            dropped = 0
+            for mode in PARSE_MODES:
+                if self._entries.pop((text, mode), _MISSING) is not _MISSING:
+                    dropped += 1
+            return dropped
+
+    def stats(self) -> ParseCacheStats:
+        with self._lock:
+            return ParseCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+            )
+
+    def __reduce__(self) -> Tuple[object, ...]:
+        return (ParseCache, (self.max_entries,))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, text: object) -> bool:
+        return any((text, mode) in self._entries for mode in PARSE_MODES)
+
+
+_DEFAULT_CACHE = ParseCache()
+
+
+def default_parse_cache() -> ParseCache:
+    """The process-wide parse cache."""
+    return _DEFAULT_CACHE
@@ -1,3 +1,4 @@
+import re
 from typing import Dict, List, Optional, Union, Any
 
 from flyql.core.tree import Node
@@ -12,7 +13,7 @@ from flyql.core.char import Char
 from flyql.literal import LiteralKind
 from flyql.core.state import State
 from flyql.core.exceptions import FlyqlError, KeyParseError
-from flyql.core.range import Range
+from flyql.core.range import NO_RANGE, Range
 from flyql.core.constants import (
     VALID_BOOL_OPERATORS,
     VALID_KEY_VALUE_OPERATORS,
@@ -73,6 +74,50 @@ from flyql.core.key import parse_key, Key
 
 _BOOL_OP_PRECEDENCE = {"and": 2, "or": 1}
 
+# Parse modes. A lean parse records no typed_chars and gives every AST
+# range (node, expression, key, operator, value, transformer) as NO_RANGE;
+# error ranges stay exact. For callers that only translate or evaluate
+# the AST and never map it back to the query text.
+PARSE_MODE_FULL = "full"
+PARSE_MODE_LEAN = "lean"
+PARSE_MODES = (PARSE_MODE_FULL, PARSE_MODE_LEAN)
+
+# Runs of characters that a state only appends to its buffer. parse()
+# consumes such a run in one step instead of dispatching every character;
+# the character ending a run (quote, delimiter, newline, ...) goes through
+# the state handler as usual. Runs never contain a newline.
+_QUOTED_RUN = {
+    "'": re.compile(r"[^'\n]+"),
+    '"': re.compile(r'[^"\n]+'),
+}
+_VALUE_RUN = re.compile(r"[^\"' ()=\n]+")
+_IN_LIST_VALUE_RUN = re.compile(r"[^\"' ()=\n,\]]+")
+# Char.is_key() without "|", which switches the key into transformer mode.
+_KEY_RUN = re.compile(r"[\w.:/@-]+")
+_RUNS = {
+    State.VALUE: _VALUE_RUN,
+    State.SINGLE_QUOTED_VALUE: _QUOTED_RUN["'"],
+    State.DOUBLE_QUOTED_VALUE: _QUOTED_RUN['"'],
+    State.IN_LIST_VALUE: _IN_LIST_VALUE_RUN,
+    State.IN_LIST_SINGLE_QUOTED_VALUE: _QUOTED_RUN["'"],
+    State.IN_LIST_DOUBLE_QUOTED_VALUE: _QUOTED_RUN['"'],
+    State.SINGLE_QUOTED_KEY: _QUOTED_RUN["'"],
+    State.DOUBLE_QUOTED_KEY: _QUOTED_RUN['"'],
+}
+_RUN_STATES = (State.KEY, *_RUNS)
+
+# Trivial queries: `key op value` terms joined by `and`/`or`, with plain
+# dotted keys, comparison operators and numeric or quoted values (no
+# escapes). parse() builds their AST from these matches directly and
+# runs the state machine on anything else.
+_TRIVIAL_TERM = (
+    r"(?!not )(?P<key>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z0-9_]+)*) *"
+    r"(?P<op>!=|!~|>=|<=|=|~|>|<) *"
+    r"(?P<value>'[^'\\\n]*'|\"[^\"\\\n]*\"|-?[0-9]+(?:\.[0-9]+)?)"
+)
+_TRIVIAL_FIRST = re.compile(_TRIVIAL_TERM)
+_TRIVIAL_NEXT = re.compile(r" +(?P<bool_op>and|or) +" + _TRIVIAL_TERM)
+
 
 def _precedence(op: str) -> int:
     """Precedence of a boolean operator. Unknown/empty -> 0 so wrappers
@@ -121,6 +166,7 @@ class Parser:
         self.errno: int = 0
         self.root: Union[Node, None] = None
         self.typed_chars: List[tuple[Char, CharType]] = []
+        self.lean: bool = False
         self._pipe_seen_in_key: bool = False
         self._transformer_paren_depth: int = 0
         self._transformer_quote: Optional[str] = None
@@ -281,7 +327,7 @@ class Parser:
         self.in_list_values_types.append(explicit_type)
         if self._in_list_value_start >= 0:
             self._in_list_value_ranges.append(
-                Range(self._in_list_value_start, self._in_list_value_end)
+                self._span(self._in_list_value_start, self._in_list_value_end)
             )
         self.in_list_current_value = ""
         self.in_list_current_value_is_string = None
@@ -333,9 +379,86 @@ class Parser:
         self.bool_op_stack.append(self.bool_operator)
 
     def store_typed_char(self, char_type: CharType) -> None:
-        if self.char is not None:
+        if self.char is not None and not self.lean:
             self.typed_chars.append((self.char, char_type))
 
+    def _span(self, start: int, end: int) -> Range:
+        """Source range of an AST element (NO_RANGE in lean mode)."""
+        return NO_RANGE if self.lean else Range(start, end)
+
+    def _consume_run(self, text: str, index: int) -> int:
+        """Consume the run of buffer-only characters at ``text[index]``.
+
+        Has the same effect as feeding the run to the state handler one
+        character at a time. Returns the run length (0 when there is none).
+        """
+        state = self.state
+        if state == State.KEY:
+            if self._transformer_quote:
+                pattern = _QUOTED_RUN[self._transformer_quote]
+            else:
+                pattern = _KEY_RUN
+        else:
+            pattern = _RUNS[state]
+        match = pattern.match(text, index)
+        if match is None:
+            return 0
+        run = match.group()
+        start, line, line_pos = self.pos, self.line, self.line_pos
+        end = start + len(run)
+
+        if state in (
+            State.VALUE,
+            State.SINGLE_QUOTED_VALUE,
+            State.DOUBLE_QUOTED_VALUE,
+        ):
+            char_type = CharType.VALUE
+            if self._value_start == -1:
+                self._value_start = start
+            self._value_end = end
+            self.value += run
+        elif state in (
+            State.IN_LIST_VALUE,
+            State.IN_LIST_SINGLE_QUOTED_VALUE,
+            State.IN_LIST_DOUBLE_QUOTED_VALUE,
+        ):
+            char_type = CharType.VALUE
+            if self._in_list_value_start == -1:
+                self._in_list_value_start = start
+            self._in_list_value_end = end
+            self.in_list_current_value += run
+        else:
+            if state != State.KEY:
+                char_type = CharType.KEY
+            elif self._transformer_quote:
+                char_type = CharType.ARGUMENT_STRING
+            elif self._transformer_paren_depth > 0:
+                char_type = CharType.ARGUMENT_NUMBER
+            elif self._pipe_seen_in_key:
+                char_type = CharType.TRANSFORMER
+            else:
+                char_type = CharType.KEY
+            if self._key_start == -1:
+                self._key_start = start
+                if self._expr_start == -1:
+                    self._expr_start = start
+            self._key_end = end
+            self.key += run
+
+        if self.lean:
+            last = len(run) - 1
+            self.char = Char(run[last], start + last, line, line_pos + last)
+        else:
+            chars = [
+                Char(c, start + offset, line, line_pos + offset)
+                for offset, c in enumerate(run)
+            ]
+            self.typed_chars.extend((char, char_type) for char in chars)
+            self.char = chars[-1]
+        self.pos = end
+        self.line_pos += len(run)
+        return len(run)
+
     def new_node(
         self,
         bool_operator: str,
@@ -365,19 +488,19 @@ class Parser:
     def _build_expr_ranges(self, end: int) -> tuple[Range, Range, Optional[Range]]:
         """Build (expr_range, key_range, operator_range) for the current
         accumulated expression state."""
-        key_range = Range(self._key_start, self._key_end)
+        key_range = self._span(self._key_start, self._key_end)
         operator_range = (
-            Range(self._operator_start, self._operator_end)
+            self._span(self._operator_start, self._operator_end)
             if self._operator_start >= 0
             else None
         )
         start = self._expr_start if self._expr_start >= 0 else self._key_start
-        expr_range = Range(start, end)
+        expr_range = self._span(start, end)
         return expr_range, key_range, operator_range
 
     def _parse_key_with_range(self, key_range: Range) -> Key:
         try:
-            parsed = parse_key(self.key, key_range.start)
+            parsed = parse_key(self.key, self._key_start, ranges=not self.lean)
         except KeyParseError as e:
             self.set_error_state(e.message, ERR_KEY_PARSE_FAILED, range=e.range)
             # Return an empty Key sentinel; extend_tree won't be called
@@ -401,7 +524,7 @@ class Parser:
             expr_end = self._key_end
         expr_range, key_range, operator_range = self._build_expr_ranges(expr_end)
         value_range = (
-            Range(self._value_start, self._value_end)
+            self._span(self._value_start, self._value_end)
             if self._value_start >= 0
             else None
         )
@@ -504,7 +627,7 @@ class Parser:
         if self._bool_op_start_stack and self._bool_op_end_stack:
             s = self._bool_op_start_stack.pop()
             e = self._bool_op_end_stack.pop()
-            return Range(s, e)
+            return self._span(s, e)
         return None
 
     def _fold_with_precedence(self, current: Node, op: str, atom: Node) -> Node:
@@ -520,7 +643,7 @@ class Parser:
                 expression=None,
                 left=current,
                 right=atom,
-                range=Range(current.range.start, atom.range.end),
+                range=self._span(current.range.start, atom.range.end),
                 bool_operator_range=bool_op_r,
             )
         assert current.right is not None
@@ -530,10 +653,10 @@ class Parser:
             expression=None,
             left=current.right,
             right=atom,
-            range=Range(current.right.range.start, atom.range.end),
+            range=self._span(current.right.range.start, atom.range.end),
             bool_operator_range=bool_op_r,
         )
-        current.range = Range(current.range.start, atom.range.end)
+        current.range = self._span(current.range.start, atom.range.end)
         return current
 
     def extend_tree(self, expression: Union[Expression, None] = None) -> None:
@@ -562,7 +685,7 @@ class Parser:
                 bool_op_r = self._pop_bool_op_range()
                 if bool_op_r is not None:
                     self.current_node.bool_operator_range = bool_op_r
-                self.current_node.range = Range(
+                self.current_node.range = self._span(
                     self.current_node.range.start,
                     max(self.current_node.range.end, expression.range.end),
                 )
@@ -578,7 +701,7 @@ class Parser:
                 self.current_node.set_left(node)
                 self.current_node.set_bool_operator(self.bool_operator)
                 # Expand the parent wrapper range to cover the new leaf.
-                self.current_node.range = Range(
+                self.current_node.range = self._span(
                     min(self.current_node.range.start, expression.range.start),
                     max(self.current_node.range.end, expression.range.end),
                 )
@@ -596,7 +719,7 @@ class Parser:
             bool_op_r = self._pop_bool_op_range()
             if bool_op_r is not None:
                 self.current_node.bool_operator_range = bool_op_r
-            self.current_node.range = Range(
+            self.current_node.range = self._span(
                 min(self.current_node.range.start, expression.range.start),
                 max(self.current_node.range.end, expression.range.end),
             )
@@ -635,9 +758,9 @@ class Parser:
                     node.bool_operator_range = bool_op_r
             # Set group range: span from '(' to current char pos+1 (the ')').
             if group_start is not None and self.char is not None:
-                node.range = Range(group_start, self.char.pos + 1)
+                node.range = self._span(group_start, self.char.pos + 1)
             elif self.current_node is not None:
-                node.range = Range(
+                node.range = self._span(
                     node.range.start if node.range else self.current_node.range.start,
                     self.current_node.range.end,
                 )
@@ -665,7 +788,7 @@ class Parser:
                     expression=None,
                     left=node.right,
                     right=self.current_node,
-                    range=Range(node.range.start, right_end),
+                    range=self._span(node.range.start, right_end),
                     bool_operator_range=bool_op_r,
                 )
                 self.set_current_node(new_root)
@@ -674,9 +797,86 @@ class Parser:
                     node, bool_operator, self.current_node
                 )
                 if self.char is not None:
-                    new_root.range = Range(new_root.range.start, self.char.pos + 1)
+                    new_root.range = self._span(new_root.range.start, self.char.pos + 1)
                 self.set_current_node(new_root)
 
+    def _parse_trivial(self, text: str, mode: str) -> Optional[Node]:
+        """The AST of ``text`` if it is a trivial query (see
+        ``_TRIVIAL_TERM``), else None.
+
+        The tree, ranges included, is the one parse() builds for the same
+        text; typed_chars and the other parser state are not filled in.
+        """
+        if mode not in PARSE_MODES:
+            return None
+        match = _TRIVIAL_FIRST.match(text)
+        if match is None:
+            return None
+        matches = [match]
+        end = match.end()
+        while end < len(text):
+            match = _TRIVIAL_NEXT.match(text, end)
+            if match is None:
+                return None
+            matches.append(match)
+            end = match.end()
+
+        self.lean = mode == PARSE_MODE_LEAN
+        root: Optional[Node] = None
+        for match in matches:
+            value = match["value"]
+            is_string = value[0] in "'\""
+            key_start, value_end = match.start("key"), match.end("value")
+            # A plain dotted key, split as parse_key() would split it.
+            segments = match["key"].split(".")
+            segment_ranges = []
+            offset = key_start
+            for segment in segments:
+                segment_ranges.append(self._span(offset, offset + len(segment)))
+                offset += len(segment) + 1
+            key = Key(
+                segments,
+                match["key"],
+                [False] * len(segments),
+                range=self._span(*match.span("key")),
+                segment_ranges=segment_ranges,
+            )
+            expression = Expression(
+                key=key,
+                operator=match["op"],
+                value=value[1:-1] if is_string else value,
+                value_is_string=is_string,
+                range=self._span(key_start, value_end),
+                operator_range=self._span(*match.span("op")),
+                value_range=self._span(*match.span("value")),
+            )
+            leaf = self.new_node(
+                bool_operator="",
+                expression=expression,
+                left=None,
+                right=None,
+                range=expression.range,
+            )
+            if root is None:
+                root = self.new_node(
+                    bool_operator=self.bool_operator,
+                    expression=None,
+                    left=leaf,
+                    right=None,
+                    range=self._span(0, value_end),
+                )
+                continue
+            self._bool_op_start_stack.append(match.start("bool_op"))
+            self._bool_op_end_stack.append(match.end("bool_op"))
+            if root.right is None:
+                root.set_right(leaf)
+                root.set_bool_operator(match["bool_op"])
+                root.bool_operator_range = self._pop_bool_op_range()
+                root.range = self._span(0, value_end)
+            else:
+                root = self._fold_with_precedence(root, match["bool_op"], leaf)
+        return root
+
     def _apply_negation_to_tree(self, node: Node, negated: bool) -> None:
         if not negated:
             return
@@ -725,7 +925,7 @@ class Parser:
                 expression=None,
                 left=None,
                 right=None,
-                range=Range(start_pos, start_pos),
+                range=self._span(start_pos, start_pos),
             )
         )
         if self.char.is_group_open():
@@ -1168,7 +1368,7 @@ class Parser:
         )
         expr_range, key_range, operator_range = self._build_expr_ranges(expr_end)
         value_range = (
-            Range(self._value_start, self._value_end)
+            self._span(self._value_start, self._value_end)
             if self._value_start >= 0
             else None
         )
@@ -1805,7 +2005,7 @@ class Parser:
         self.in_list_values_types.append(LiteralKind.PARAMETER)
         if self._in_list_value_start >= 0:
             self._in_list_value_ranges.append(
-                Range(self._in_list_value_start, self._in_list_value_end)
+                self._span(self._in_list_value_start, self._in_list_value_end)
             )
         self.in_list_current_value = ""
         self.in_list_current_value_is_string = None
@@ -2070,11 +2270,11 @@ class Parser:
             return
 
         assert self.char is not None
-        key_range = Range(self._key_start, self._key_end)
+        key_range = self._span(self._key_start, self._key_end)
         key = self._parse_key_with_range(key_range)
-        expr_range = Range(self._expr_start, self.char.pos + 1)
-        operator_range = Range(self._operator_start, self._operator_end)
-        value_range = Range(self._value_start, self.char.pos + 1)
+        expr_range = self._span(self._expr_start, self.char.pos + 1)
+        operator_range = self._span(self._operator_start, self._operator_end)
+        value_range = self._span(self._value_start, self.char.pos + 1)
 
         expr = Expression(
             key=key,
@@ -2304,6 +2504,7 @@ class Parser:
         raise_error: bool = True,
         ignore_last_char: bool = False,
         capabilities: Optional[Dict[str, Any]] = None,
+        mode: str = PARSE_MODE_FULL,
     ) -> None:
         """
         Parse the given text.
@@ -2313,14 +2514,28 @@ class Parser:
             raise_error: If True, raise ParserError on error. If False, set error state and return.
             ignore_last_char: If True, skip final state validation (inStateLastChar)
             capabilities: Reserved for future parser feature flags. Currently a no-op stub.
+            mode: "full" (default) or "lean" — skip typed_chars and AST source ranges.
         """
         del capabilities
+        if mode not in PARSE_MODES:
+            raise FlyqlError(
+                f"invalid parse mode: {mode!r} — expected one of {PARSE_MODES}"
+            )
+        self.lean = mode == PARSE_MODE_LEAN
         self._depth = 0
         self.set_text(text)
-        for c in text:
+        index = 0
+        length = len(text)
+        while index < length:
             if self.state == State.ERROR:
                 break
-            self.set_char(Char(c, self.pos, self.line, self.line_pos))
+            if self.state in _RUN_STATES:
+                run = self._consume_run(text, index)
+                if run:
+                    index += run
+                    continue
+            self.set_char(Char(text[index], self.pos, self.line, self.line_pos))
+            index += 1
             if self.char and self.char.is_newline():
                 self.line += 1
                 self.line_pos = 0
@@ -2440,6 +2655,7 @@ def parse(
     raise_error: bool = True,
     ignore_last_char: bool = False,
     capabilities: Optional[Dict[str, Any]] = None,
+    mode: str = PARSE_MODE_FULL,
 ) -> ParseResult:
     """
     Parse the given text and return a ParseResult with the AST root node.
@@ -2449,8 +2665,15 @@ def parse(
         raise_error: If True, raise ParserError on error. If False, set error state and return.
         ignore_last_char: If True, skip final state validation
         capabilities: Reserved for future parser feature flags. Currently a no-op stub.
+        mode: "full" (default) or "lean" — a lean parse records no typed_chars
+            and leaves every AST range as NO_RANGE, for callers that never map
+            the AST back to the text.
     """
     del capabilities
     parser = Parser()
-    parser.parse(text, raise_error, ignore_last_char)
+    if not ignore_last_char:
+        root = parser._parse_trivial(text, mode)  # pylint: disable=protected-access
+        if root is not None:
+            return ParseResult(root=root)
+    parser.parse(text, raise_error, ignore_last_char, mode=mode)
     return ParseResult(root=parser.root)
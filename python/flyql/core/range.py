@@ -20,3 +20,8 @@ class Range:
     def __post_init__(self) -> None:
         if self.start < 0 or self.end < self.start:
             raise ValueError(f"invalid range: start={self.start}, end={self.end}")
+
+
+# Range of AST elements without a source position: nodes built directly
+# through the SDK and every element of a lean parse.
+NO_RANGE = Range(0, 0)
@@ -1,4 +1,4 @@
-from typing import Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 from flyql.core.exceptions import FlyqlError
 from flyql.core.expression import Expression
@@ -41,3 +41,86 @@ class Node:
 
     def set_expression(self, expression: Expression) -> None:
         self.expression = expression
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        # Pickle an AND/OR chain as a list of its links, so the pickle
+        # depth follows group nesting, not chain length.
+        if self.expression is None and self.left is not None and self.right is not None:
+            bottom, links = chain_spine(self)
+            if len(links) > 1:
+                return (
+                    _rebuild_chain,
+                    (
+                        bottom,
+                        [(type(link), dict(vars(link), left=None)) for link in links],
+                    ),
+                )
+        return super().__reduce_ex__(protocol)
+
+
+def _rebuild_chain(bottom: Node, links: List[Tuple[type, Dict[str, Any]]]) -> Node:
+    node = bottom
+    for cls, state in links:
+        link: Any = object.__new__(cls)
+        state["left"] = node
+        vars(link).update(state)
+        node = link
+    return node
+
+
+def _links_chain(node: Node, op: str) -> bool:
+    return (
+        node.expression is None
+        and not node.negated
+        and node.bool_operator == op
+        and node.left is not None
+        and node.right is not None
+    )
+
+
+def chain_spine(node: Node) -> Tuple[Node, List[Node]]:
+    """Split the AND/OR chain headed by ``node`` (which has both children)
+    along its left spine.
+
+    The parser builds ``a or b or c`` left-deep, as ``((a or b) or c)``.
+    Returns the bottom-left operand and the chain's nodes from the deepest
+    up to ``node``; the operands, in source order, are the bottom one and
+    each node's ``right``. A left child is part of the chain when it is a
+    non-negated node with both children and ``node``'s operator. Walkers
+    that loop over the links recurse only into operands, so their depth
+    follows group nesting instead of chain length.
+    """
+    links = [node]
+    current = node.left
+    assert current is not None
+    while _links_chain(current, node.bool_operator):
+        links.append(current)
+        current = current.left
+        assert current is not None
+    links.reverse()
+    return current, links
+
+
+def spine_operands(node: Node) -> List[Node]:
+    """The operands of the chain headed by ``node``, in source order (see
+    :func:`chain_spine`)."""
+    bottom, links = chain_spine(node)
+    operands = [bottom]
+    for link in links:
+        assert link.right is not None
+        operands.append(link.right)
+    return operands
+
+
+def iter_nodes(root: Node) -> Iterator[Node]:
+    """Every node under ``root`` (``root`` included) in the order a
+    recursive pre-order walk visits them — left before right — without
+    recursing."""
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        if node.right is not None:
+            stack.append(node.right)
+        if node.left is not None:
+            stack.append(node.left)
@@ -30,7 +30,7 @@ from typing import Any, List, Literal, Optional, Tuple
 from flyql.core.column import ColumnSchema
 from flyql.core.expression import Expression
 from flyql.core.range import Range
-from flyql.core.tree import Node
+from flyql.core.tree import Node, iter_nodes
 from flyql.flyql_type import Type, type_permits_unknown_children
 from flyql.literal import LiteralKind
 from flyql.transformers.base import Transformer as TransformerDef
@@ -157,13 +157,10 @@ def _walk(
     schema: ColumnSchema,
     registry: TransformerRegistry,
 ) -> List[Diagnostic]:
-    if node.expression is not None:
-        return _diagnose_expression(node.expression, schema, registry)
     diags: List[Diagnostic] = []
-    if node.left is not None:
-        diags.extend(_walk(node.left, schema, registry))
-    if node.right is not None:
-        diags.extend(_walk(node.right, schema, registry))
+    for current in iter_nodes(node):
+        if current.expression is not None:
+            diags.extend(_diagnose_expression(current.expression, schema, registry))
     return diags
 
 
@@ -15,7 +15,7 @@ from flyql.core.constants import (
     VALID_KEY_VALUE_OPERATORS,
     VALID_BOOL_OPERATORS,
 )
-from flyql.core.tree import Node
+from flyql.core.tree import Node, spine_operands
 
 from flyql.generators._paren import wrap_child
 from flyql.generators.starrocks.column import Column
@@ -1045,6 +1045,63 @@ def _find_single_leaf_expression(node: Optional[Node]) -> Optional[Expression]:
     return None
 
 
+def _walk_chain(
+    root: Node,
+    columns: Mapping[str, Column],
+    registry: Optional[TransformerRegistry],
+    opts: GeneratorOptions,
+) -> Tuple[str, str]:
+    """``_walk_where`` for an AND/OR chain: joins the chain's operands
+    (see ``chain_spine``) exactly as the pairwise recursion over its
+    left-deep tree would, without recursing down the chain. Once the text
+    joined so far carries the chain's own operator it needs no parens, so
+    each further operand is appended in constant time.
+    """
+    parent_op = root.bool_operator
+    indent_unit = opts.indent_unit()
+    parts: List[str] = []
+    effective_op = ""
+    for operand in spine_operands(root):
+        right_text, right_op = _walk_where(
+            root=operand,
+            columns=columns,
+            registry=registry,
+            default_timezone=opts.default_timezone,
+            options=opts,
+        )
+        if not right_text:
+            continue
+        if not parts:
+            parts.append(right_text)
+            effective_op = right_op
+            continue
+        validate_bool_operator(parent_op)
+        sql_op = BOOL_OP_TO_SQL[parent_op]
+        right_sql = wrap_child(
+            right_text, right_op, parent_op, format=opts.format, indent_unit=indent_unit
+        )
+        if effective_op == parent_op:
+            separator = "\n" if opts.format else " "
+        else:
+            left_sql = wrap_child(
+                "".join(parts),
+                effective_op,
+                parent_op,
+                format=opts.format,
+                indent_unit=indent_unit,
+            )
+            parts = [left_sql]
+            if opts.format and (
+                "\n" in left_sql or "\n" in right_sql or effective_op or right_op
+            ):
+                separator = "\n"
+            else:
+                separator = " "
+        parts.append(f"{separator}{sql_op} {right_sql}")
+        effective_op = parent_op
+    return "".join(parts), effective_op
+
+
 def _walk_where(
     root: Node,
     columns: Mapping[str, Column],
@@ -1063,10 +1120,6 @@ def _walk_where(
         if options is not None
         else GeneratorOptions(default_timezone=default_timezone)
     )
-    left_text = ""
-    left_op = ""
-    right_text = ""
-    right_op = ""
     text = ""
     effective_op = ""
     is_negated = getattr(root, "negated", False)
@@ -1098,17 +1151,18 @@ def _walk_where(
                 "",
             )
 
-    if root.left is not None:
-        left_text, left_op = _walk_where(
+    if root.left is not None and root.right is not None:
+        text, effective_op = _walk_chain(root, columns, registry, opts)
+    elif root.left is not None:
+        text, effective_op = _walk_where(
             root=root.left,
             columns=columns,
             registry=registry,
             default_timezone=opts.default_timezone,
             options=opts,
         )
-
-    if root.right is not None:
-        right_text, right_op = _walk_where(
+    elif root.right is not None:
+        text, effective_op = _walk_where(
             root=root.right,
             columns=columns,
             registry=registry,
@@ -1116,29 +1170,6 @@ def _walk_where(
             options=opts,
         )
 
-    if left_text and right_text:
-        validate_bool_operator(root.bool_operator)
-        parent_op = root.bool_operator
-        indent_unit = opts.indent_unit()
-        left_sql = wrap_child(
-            left_text, left_op, parent_op, format=opts.format, indent_unit=indent_unit
-        )
-        right_sql = wrap_child(
-            right_text, right_op, parent_op, format=opts.format, indent_unit=indent_unit
-        )
-        sql_op = BOOL_OP_TO_SQL[parent_op]
-        if opts.format and (
-            "\n" in left_sql or "\n" in right_sql or left_op or right_op
-        ):
-            text = f"{left_sql}\n{sql_op} {right_sql}"
-        else:
-            text = f"{left_sql} {sql_op} {right_sql}"
-        effective_op = parent_op
-    elif left_text:
-        text, effective_op = left_text, left_op
-    elif right_text:
-        text, effective_op = right_text, right_op
-
     if is_negated and text:
         if opts.format and "\n" in text:
             indent_unit = opts.indent_unit()
@@ -3,7 +3,7 @@ from typing import List, Optional
 from flyql.core.exceptions import FlyqlError
 from flyql.core.key import KeyTransformer
 from flyql.flyql_type import Type
-from flyql.transformers.registry import TransformerRegistry, default_registry
+from flyql.transformers.registry import TransformerRegistry, shared_default_registry
 
 
 def apply_transformer_sql(
@@ -14,29 +14,9 @@ def apply_transformer_sql(
 ) -> str:
     if not transformers:
         return column_ref
-
     if registry is None:
-        registry = default_registry()
-
-    result = column_ref
-    for t in transformers:
-        transformer = registry.get(t.name)
-        if transformer is None:
-            raise FlyqlError(f"unknown transformer: {t.name}")
-        schema = transformer.arg_schema
-        required_count = sum(1 for s in schema if s.required)
-        max_count = len(schema)
-        got = len(t.arguments)
-        if got < required_count or got > max_count:
-            if required_count == max_count:
-                raise FlyqlError(
-                    f"{t.name} expects {required_count} arguments, got {got}"
-                )
-            raise FlyqlError(
-                f"{t.name} expects {required_count}..{max_count} arguments, got {got}"
-            )
-        result = transformer.sql(dialect, result, t.arguments)
-    return result
+        registry = shared_default_registry()
+    return registry.chain(transformers).sql(dialect, column_ref)
 
 
 def get_transformer_output_type(
@@ -46,7 +26,7 @@ def get_transformer_output_type(
     if not transformers:
         return None
     if registry is None:
-        registry = default_registry()
+        registry = shared_default_registry()
     last = registry.get(transformers[-1].name)
     return last.output_type if last else None
 
@@ -60,7 +40,7 @@ def validate_transformer_chain(
         return
 
     if registry is None:
-        registry = default_registry()
+        registry = shared_default_registry()
 
     current_type = base_type
     for i, t in enumerate(transformers):
@@ -0,0 +1,315 @@
+"""Filter newline-delimited JSON with a FlyQL query.
+
+    python -m flyql.grep "status >= 500 and service = 'api'" app.log
+    zcat app.log.gz | python -m flyql.grep --count "level = 'error'"
+    python -m flyql.grep --schema columns.json --limit 10 "ts > ago(1h)" a.log b.log
+
+Matching lines are written to stdout unchanged, so the output is NDJSON
+again. Lines that are not a JSON object never match. The query is parsed
+and compiled once, each line decodes only the fields the query references
+(see :func:`flyql.matcher.batch.filter_lines`), and ``now()``/``ago()``/
+``today()``/``startOf()`` are resolved once for the whole run.
+
+``--jobs N`` splits each regular file into byte ranges (each line belongs
+to the range holding its first byte) and matches them in a pool of N
+processes; output order is preserved, but each range's matches are
+buffered until the range is done. stdin is always read by the main
+process.
+
+Exit status is 0 when a line matched, 1 when none did and 2 on errors,
+as for grep.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from flyql.core.column import ColumnSchema
+from flyql.core.exceptions import FlyqlError
+from flyql.matcher import batch
+
+_BUFFER_SIZE = 1 << 20
+# Files smaller than this per worker are not worth splitting further.
+_MIN_SHARD_BYTES = 1 << 20
+
+_Handle = Union[IO[bytes], mmap.mmap]
+
+
+@dataclass(frozen=True)
+class _Options:
+    query: str
+    schema: Optional[Dict[str, Any]]
+    default_timezone: str
+    now: datetime
+    limit: Optional[int]
+    count: bool
+
+
+@dataclass(frozen=True)
+class _Shard:
+    path: str
+    start: int
+    end: int
+    use_mmap: bool
+
+
+def _lines(
+    handle: _Handle, start: int = 0, end: Optional[int] = None
+) -> Iterator[bytes]:
+    """Lines whose first byte lies in ``[start, end)``."""
+    pos = start
+    if start > 0:
+        # Skip the tail of the line that began in the previous range.
+        handle.seek(start - 1)
+        pos += len(handle.readline()) - 1
+    while end is None or pos < end:
+        line = handle.readline()
+        if not line:
+            return
+        pos += len(line)
+        yield line
+
+
+def _matches(lines: Iterable[bytes], options: _Options) -> Iterator[bytes]:
+    columns = (
+        ColumnSchema.from_plain_object(options.schema)
+        if options.schema is not None
+        else None
+    )
+    return batch.filter_lines(
+        options.query,
+        lines,
+        columns=columns,
+        default_timezone=options.default_timezone,
+        now=options.now,
+    )
+
+
+def _open(path: str, use_mmap: bool) -> _Handle:
+    handle = open(  # pylint: disable=consider-using-with
+        path, "rb", buffering=_BUFFER_SIZE
+    )
+    if not use_mmap or os.fstat(handle.fileno()).st_size == 0:
+        return handle
+    # The mapping stays valid after the file is closed.
+    with handle:
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _scan_shard(shard: _Shard, options: _Options) -> Tuple[int, List[bytes]]:
+    """Worker entry point: number of matches in one byte range, and the
+    matching lines unless counting."""
+    handle = _open(shard.path, shard.use_mmap)
+    try:
+        matched = 0
+        found: List[bytes] = []
+        for line in _matches(_lines(handle, shard.start, shard.end), options):
+            matched += 1
+            if not options.count:
+                found.append(line)
+            if options.limit is not None and matched >= options.limit:
+                break
+        return matched, found
+    finally:
+        handle.close()
+
+
+def _shards(path: str, jobs: int, use_mmap: bool) -> List[_Shard]:
+    size = os.path.getsize(path)
+    count = max(1, min(jobs, size // _MIN_SHARD_BYTES))
+    bounds = [size * i // count for i in range(count + 1)]
+    return [_Shard(path, bounds[i], bounds[i + 1], use_mmap) for i in range(count)]
+
+
+class _Output:
+    def __init__(self, stream: IO[bytes], options: _Options) -> None:
+        self._stream = stream
+        self._options = options
+        self.matched = 0
+
+    def done(self) -> bool:
+        limit = self._options.limit
+        return limit is not None and self.matched >= limit
+
+    def emit(self, line: bytes) -> None:
+        self.matched += 1
+        if self._options.count:
+            return
+        self._stream.write(line)
+        if not line.endswith(b"\n"):
+            self._stream.write(b"\n")
+
+    def add_counted(self, matched: int) -> None:
+        limit = self._options.limit
+        self.matched += matched if limit is None else min(matched, limit - self.matched)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m flyql.grep",
+        description="Print the NDJSON lines that match a FlyQL query.",
+    )
+    parser.add_argument("query", help="FlyQL query")
+    parser.add_argument(
+        "files", nargs="*", help="NDJSON files; '-' or none reads stdin"
+    )
+    parser.add_argument(
+        "-s",
+        "--schema",
+        help="JSON file with a column schema (ColumnSchema.from_plain_object)",
+    )
+    parser.add_argument(
+        "--tz",
+        default="UTC",
+        help="default timezone for naive timestamps (default: UTC)",
+    )
+    parser.add_argument(
+        "-c", "--count", action="store_true", help="print the number of matches"
+    )
+    parser.add_argument(
+        "-m", "--limit", type=int, help="stop after LIMIT matching lines"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes for byte-range sharding of files (default: 1)",
+    )
+    parser.add_argument(
+        "--mmap", action="store_true", help="memory-map files instead of reading"
+    )
+    return parser
+
+
+def _scan_serial(
+    paths: Sequence[str], options: _Options, use_mmap: bool, output: _Output
+) -> bool:
+    """Scan ``paths`` in this process; returns False if a file failed."""
+    ok = True
+    for path in paths:
+        if output.done():
+            break
+        try:
+            handle: _Handle = sys.stdin.buffer if path == "-" else _open(path, use_mmap)
+        except OSError as exc:
+            print(f"flyql.grep: {path}: {exc.strerror}", file=sys.stderr)
+            ok = False
+            continue
+        try:
+            for line in _matches(_lines(handle), options):
+                output.emit(line)
+                if output.done():
+                    break
+        finally:
+            if path != "-":
+                handle.close()
+    return ok
+
+
+def _scan_parallel(
+    paths: Sequence[str], options: _Options, jobs: int, use_mmap: bool, output: _Output
+) -> bool:
+    ok = True
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending: List[Union[Future, str]] = []
+        for path in paths:
+            if path == "-":
+                pending.append(path)
+                continue
+            try:
+                shards = _shards(path, jobs, use_mmap)
+            except OSError as exc:
+                print(f"flyql.grep: {path}: {exc.strerror}", file=sys.stderr)
+                ok = False
+                continue
+            pending.extend(pool.submit(_scan_shard, shard, options) for shard in shards)
+        for item in pending:
+            if output.done():
+                break
+            if isinstance(item, str):
+                ok = _scan_serial([item], options, use_mmap, output) and ok
+                continue
+            try:
+                matched, found = item.result()
+            except OSError as exc:
+                print(f"flyql.grep: {exc.filename}: {exc.strerror}", file=sys.stderr)
+                ok = False
+                continue
+            if options.count:
+                output.add_counted(matched)
+                continue
+            for line in found:
+                output.emit(line)
+                if output.done():
+                    break
+        pool.shutdown(cancel_futures=True)
+    return ok
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.limit is not None and args.limit < 0:
+        parser.error("--limit must not be negative")
+    schema: Optional[Dict[str, Any]] = None
+    try:
+        if args.schema is not None:
+            with open(args.schema, encoding="utf-8") as handle:
+                schema = json.load(handle)
+        options = _Options(
+            query=args.query,
+            schema=schema,
+            default_timezone=args.tz,
+            now=datetime.now(timezone.utc),
+            limit=args.limit,
+            count=args.count,
+        )
+        # Report query and schema errors once, before any input is read.
+        _matches((), options)
+    except (FlyqlError, OSError, ValueError) as exc:
+        parser.exit(2, f"{parser.prog}: error: {exc}\n")
+
+    paths = args.files or ["-"]
+    output = _Output(sys.stdout.buffer, options)
+    try:
+        if args.limit == 0:
+            ok = True
+        elif args.jobs > 1:
+            ok = _scan_parallel(paths, options, args.jobs, args.mmap, output)
+        else:
+            ok = _scan_serial(paths, options, args.mmap, output)
+        if args.count:
+            sys.stdout.buffer.write(f"{output.matched}\n".encode())
+        sys.stdout.buffer.flush()
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); stop quietly, as grep does.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1 if output.matched == 0 else 0
+    if not ok:
+        return 2
+    return 0 if output.matched else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,25 @@
+from flyql.matcher.aio import afilter
+from flyql.matcher.columnar import ColumnarQuery, compile_columnar
+from flyql.matcher.compiler import CompiledQuery, compile
 from flyql.matcher.evaluator import Evaluator
 from flyql.matcher.matcher import match
+from flyql.matcher.profile import Profile
+from flyql.matcher.query_set import QuerySet
 from flyql.matcher.record import Record
+from flyql.matcher.regex_cache import RegexCache, default_regex_cache
 
 __all__ = [
+    "ColumnarQuery",
+    "CompiledQuery",
     "Evaluator",
+    "Profile",
+    "QuerySet",
     "Record",
+    "RegexCache",
+    "afilter",
+    "compile",
+    "compile_columnar",
+    "default_regex_cache",
     "match",
 ]
 
@@ -17,7 +32,7 @@ except ImportError:
 
     warnings.warn(
         "flyql.matcher imported without [re2] extra — "
-        "regex (~) and LIKE operators will raise ERR_RE2_MISSING. "
+        "regex (~) and complex LIKE patterns will raise ERR_RE2_MISSING. "
         "Install with `pip install flyql[re2]`.",
         ImportWarning,
         stacklevel=2,
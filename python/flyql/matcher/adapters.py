@@ -0,0 +1,243 @@
+"""Record adapters: match objects and row tuples without copying to dicts.
+
+:class:`~flyql.matcher.Record` reads a record through the ``Mapping``
+interface only (``get`` and ``in``), so any mapping is matched as is. An
+adapter turns other record shapes into a zero-copy ``Mapping`` view:
+
+- :class:`AttributeView` — objects, dataclasses, protobuf messages:
+  fields are the data attributes — dataclass fields, ``__slots__``,
+  protobuf fields and the instance ``__dict__``. Methods, properties,
+  other callables and names starting with ``_`` are missing. Nested
+  objects are viewed the same way, so ``user.address.city`` walks
+  attributes.
+- :class:`TupleView` — tuples and DB cursor rows, through a field → index
+  map built once by :func:`tuple_adapter`.
+
+:func:`adapter_for` picks the adapter for a type once and caches it:
+mappings pass through, namedtuples get a :class:`TupleView` over their
+``_fields``, other tuples and lists need an explicit
+:func:`tuple_adapter`, strings, bytes, numbers and None are rejected,
+everything else gets an :class:`AttributeView`.
+The batch helpers, :func:`~flyql.matcher.match` and
+:class:`~flyql.matcher.QuerySet` adapt records this way unless given an
+``adapter=``:
+
+    rows = cursor.fetchall()
+    names = [column[0] for column in cursor.description]
+    batch.filter("status >= 500", rows, adapter=tuple_adapter(names))
+
+Nested mapping and sequence values (protobuf map and repeated fields,
+``MappingProxyType``, tuples) are walked like dicts and lists.
+"""
+
+import dataclasses
+import enum
+from datetime import date, time, timedelta
+from decimal import Decimal
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Mapping,
+    Sequence,
+    Union,
+)
+
+from flyql.core.column import ColumnSchema
+from flyql.core.exceptions import FlyqlError
+
+Adapter = Callable[[Any], Mapping[str, Any]]
+
+_MISSING = object()
+
+# Values returned as they are by AttributeView; other objects with
+# attributes are viewed as nested records.
+_LEAF_TYPES = (
+    str,
+    bytes,
+    int,
+    float,
+    complex,
+    date,
+    time,
+    timedelta,
+    Decimal,
+    enum.Enum,
+    list,
+    tuple,
+    set,
+    frozenset,
+    dict,
+)
+
+
+# Values that are never records: matching them as an empty record would
+# hide a mistake such as passing an undecoded JSON line.
+_SCALAR_TYPES = (str, bytes, bytearray, int, float, complex, Decimal, type(None))
+
+
+def _is_structured(value: Any) -> bool:
+    if value is None or isinstance(value, (_LEAF_TYPES, type)):
+        return False
+    if isinstance(value, (Mapping, Sequence)):
+        return False
+    return (
+        dataclasses.is_dataclass(value)
+        or hasattr(value, "__dict__")
+        or hasattr(value, "DESCRIPTOR")
+    )
+
+
+def _declared_fields(cls: type) -> List[str]:
+    """Data fields declared by ``cls``: dataclass fields, protobuf fields
+    and ``__slots__``, in declaration order."""
+    names: List[str] = []
+    if dataclasses.is_dataclass(cls):
+        names.extend(f.name for f in dataclasses.fields(cls))
+    descriptor = getattr(cls, "DESCRIPTOR", None)
+    names.extend(getattr(descriptor, "fields_by_name", ()))
+    for base in reversed(cls.__mro__):
+        slots = base.__dict__.get("__slots__", ())
+        names.extend([slots] if isinstance(slots, str) else slots)
+    return list(dict.fromkeys(name for name in names if not name.startswith("_")))
+
+
+_DECLARED: Dict[type, FrozenSet[str]] = {}
+
+
+def _declared(cls: type) -> FrozenSet[str]:
+    fields = _DECLARED.get(cls)
+    if fields is None:
+        fields = _DECLARED[cls] = frozenset(_declared_fields(cls))
+    return fields
+
+
+class AttributeView(Mapping[str, Any]):
+    """An object's public data attributes seen as a record mapping."""
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: Any) -> None:
+        self.obj = obj
+
+    def get(self, key: str, default: Any = None) -> Any:
+        obj = self.obj
+        if key in _declared(type(obj)):
+            value = getattr(obj, key, _MISSING)
+        elif key.startswith("_"):
+            return default
+        else:
+            value = getattr(obj, "__dict__", {}).get(key, _MISSING)
+        if value is _MISSING or callable(value):
+            return default
+        return AttributeView(value) if _is_structured(value) else value
+
+    def __getitem__(self, name: str) -> Any:
+        value = self.get(name, _MISSING)
+        if value is _MISSING:
+            raise KeyError(name)
+        return value
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.get(name, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        names = _declared_fields(type(self.obj))
+        names.extend(getattr(self.obj, "__dict__", ()))
+        return (name for name in dict.fromkeys(names) if name in self)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class TupleView(Mapping[str, Any]):
+    """A row tuple seen as a record mapping through a shared name → index map."""
+
+    __slots__ = ("row", "_index")
+
+    def __init__(self, row: Sequence[Any], index: Mapping[str, int]) -> None:
+        self.row = row
+        self._index = index
+
+    def get(self, key: str, default: Any = None) -> Any:
+        i = self._index.get(key)
+        if i is None or i >= len(self.row):
+            return default
+        return self.row[i]
+
+    def __getitem__(self, name: str) -> Any:
+        value = self.get(name, _MISSING)
+        if value is _MISSING:
+            raise KeyError(name)
+        return value
+
+    def __contains__(self, name: object) -> bool:
+        i = self._index.get(name) if isinstance(name, str) else None
+        return i is not None and i < len(self.row)
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name in self._index if name in self)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+def tuple_adapter(
+    fields: Union[Sequence[str], Mapping[str, int], ColumnSchema],
+) -> Adapter:
+    """Adapter for rows whose values are in the order of ``fields``: field
+    names, a name → index map, or a :class:`ColumnSchema` (declaration
+    order)."""
+    if isinstance(fields, ColumnSchema):
+        fields = list(fields.columns)
+    if isinstance(fields, Mapping):
+        index = dict(fields)
+    else:
+        index = {name: i for i, name in enumerate(fields)}
+
+    def view(row: Sequence[Any]) -> Mapping[str, Any]:
+        return TupleView(row, index)
+
+    return view
+
+
+def _identity(value: Mapping[str, Any]) -> Mapping[str, Any]:
+    return value
+
+
+_ADAPTERS: Dict[type, Adapter] = {dict: _identity}
+
+
+def adapter_for(cls: type) -> Adapter:
+    """The adapter used for records of type ``cls`` (cached per type)."""
+    adapter = _ADAPTERS.get(cls)
+    if adapter is not None:
+        return adapter
+    if issubclass(cls, Mapping):
+        adapter = _identity
+    elif issubclass(cls, tuple) and hasattr(cls, "_fields"):
+        adapter = tuple_adapter(getattr(cls, "_fields"))
+    elif issubclass(cls, (tuple, list)):
+        raise FlyqlError(
+            f"cannot match {cls.__name__} records without field names; "
+            "pass adapter=tuple_adapter(fields)"
+        )
+    elif issubclass(cls, _SCALAR_TYPES):
+        raise FlyqlError(
+            f"cannot match {cls.__name__} values as records; "
+            "decode them into mappings or objects first"
+        )
+    else:
+        adapter = AttributeView
+    _ADAPTERS[cls] = adapter
+    return adapter
+
+
+def adapt(record: Any) -> Mapping[str, Any]:
+    """``record`` as a mapping, via :func:`adapter_for` its type."""
+    if isinstance(record, dict):
+        return record
+    return adapter_for(type(record))(record)
@@ -0,0 +1,152 @@
+"""asyncio matching: filter records from an async source.
+
+    from flyql.matcher import afilter
+
+    async for event in afilter("level = 'error'", websocket_events()):
+        ...
+
+The query is compiled once, as for :func:`flyql.matcher.batch.filter`,
+and records are matched as they arrive. Matching is plain CPU work, so
+after every ``batch_size`` records the generator yields to the event
+loop even when the source never suspends; other tasks are not starved by
+a fast source.
+
+With ``executor=`` records are grouped into micro-batches instead and each
+batch of at least ``offload_threshold`` records is matched in the executor
+(smaller ones inline). A batch is dispatched when it holds ``batch_size``
+records, when ``max_delay`` seconds have passed since its first record
+arrived, or when the source ends, so a slow source still sees its
+matches promptly. A :class:`~concurrent.futures.ProcessPoolExecutor`
+works too: compiled queries pickle, and records then must as well.
+
+Cancelling the consuming task, or leaving the ``async for`` early, stops
+reading the source; a batch already running in an executor is left to
+finish there and its result is dropped.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    List,
+    Optional,
+)
+
+from flyql.core.column import ColumnSchema
+from flyql.core.exceptions import FlyqlError
+from flyql.matcher.adapters import Adapter
+from flyql.matcher.batch import QueryLike, RecordLike, _pinned, _tester
+from flyql.matcher.compiler import CompiledQuery
+from flyql.transformers.registry import TransformerRegistry
+
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_MAX_DELAY = 0.05
+DEFAULT_OFFLOAD_THRESHOLD = 64
+
+
+def _match_indexes(
+    query: CompiledQuery, adapter: Optional[Adapter], records: List[RecordLike]
+) -> List[int]:
+    """Indexes of the matching ``records``; runs in the executor."""
+    test = _tester(query, adapter)
+    return [index for index, item in enumerate(records) if test(item)]
+
+
+def afilter(
+    query: QueryLike,
+    source: AsyncIterable[RecordLike],
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    executor: Optional[Executor] = None,
+    offload_threshold: int = DEFAULT_OFFLOAD_THRESHOLD,
+    max_delay: float = DEFAULT_MAX_DELAY,
+    columns: Optional[ColumnSchema] = None,
+    registry: Optional[TransformerRegistry] = None,
+    default_timezone: str = "UTC",
+    now: Optional[datetime] = None,
+    adapter: Optional[Adapter] = None,
+) -> AsyncIterator[RecordLike]:
+    """Asynchronously yield the items of ``source`` that match ``query``.
+
+    ``columns``/``registry``/``default_timezone``/``now``/``adapter`` are
+    as for :func:`flyql.matcher.batch.filter`; query errors are raised here,
+    before the source is read.
+    """
+    if batch_size < 1:
+        raise FlyqlError("batch_size must be positive")
+    if max_delay < 0:
+        raise FlyqlError("max_delay must not be negative")
+    compiled = _pinned(query, columns, registry, default_timezone, now)
+    if executor is None:
+        return _inline(_tester(compiled, adapter), source, batch_size)
+    return _offloaded(
+        compiled, adapter, source, batch_size, executor, offload_threshold, max_delay
+    )
+
+
+async def _inline(
+    test: Callable[[RecordLike], bool],
+    source: AsyncIterable[RecordLike],
+    batch_size: int,
+) -> AsyncIterator[RecordLike]:
+    budget = batch_size
+    async for item in source:
+        if test(item):
+            yield item
+        budget -= 1
+        if budget == 0:
+            budget = batch_size
+            await asyncio.sleep(0)
+
+
+async def _offloaded(  # pylint: disable=too-many-arguments
+    query: CompiledQuery,
+    adapter: Optional[Adapter],
+    source: AsyncIterable[RecordLike],
+    batch_size: int,
+    executor: Executor,
+    offload_threshold: int,
+    max_delay: float,
+) -> AsyncIterator[RecordLike]:
+    loop = asyncio.get_running_loop()
+    records = aiter(source)
+    batch: List[RecordLike] = []
+    deadline = 0.0
+    # The pending read survives a max_delay timeout, so no item is lost.
+    pending: "Optional[asyncio.Future[Any]]" = None
+    try:
+        while True:
+            if pending is None:
+                read: Awaitable[Any] = anext(records)
+                pending = asyncio.ensure_future(read)
+            timeout = max(0.0, deadline - loop.time()) if batch else None
+            done, _ = await asyncio.wait((pending,), timeout=timeout)
+            exhausted = False
+            if done:
+                try:
+                    batch.append(pending.result())
+                except StopAsyncIteration:
+                    exhausted = True
+                pending = None
+                if len(batch) == 1 and not exhausted:
+                    deadline = loop.time() + max_delay
+            if batch and (exhausted or not done or len(batch) >= batch_size):
+                if len(batch) >= offload_threshold:
+                    matched = await loop.run_in_executor(
+                        executor, _match_indexes, query, adapter, batch
+                    )
+                else:
+                    matched = _match_indexes(query, adapter, batch)
+                for index in matched:
+                    yield batch[index]
+                batch = []
+            if exhausted:
+                return
+    finally:
+        if pending is not None:
+            pending.cancel()
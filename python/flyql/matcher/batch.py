@@ -0,0 +1,234 @@
+"""Batch matching: run one query over many records.
+
+Each helper parses and compiles the query once (see
+:func:`flyql.matcher.compile`) and then scans ``records``, which may mix
+:class:`Record` objects, plain mappings and other objects. Mappings are
+matched through a single reused wrapper, so no per-record ``Record`` is
+allocated and nothing is copied; objects, dataclasses and namedtuples
+are read through a zero-copy view (see :mod:`flyql.matcher.adapters`),
+and plain row tuples need ``adapter=tuple_adapter(fields)``:
+
+    from flyql.matcher import batch
+
+    errors = batch.filter("status >= 500", rows)        # lazy
+    total = batch.count("status >= 500", rows)
+    seen = batch.any("status >= 500", rows)             # stops early
+    sample = batch.first_n("status >= 500", rows, 10)   # stops early
+
+``query`` is a query string, a parsed AST root or a :class:`CompiledQuery`.
+Query errors (syntax, unbound parameters, invalid regex) are raised when
+the helper is called, before any record is read.
+
+:func:`filter_lines` scans JSON lines (NDJSON) instead, decoding only
+the top-level fields the query references:
+
+    for line in batch.filter_lines("status >= 500", open("app.log", "rb")):
+        ...
+
+``now()``/``ago()``/``today()``/``startOf()`` are resolved once per call,
+at the time the helper is called (or at ``now=``), so every record of a
+batch is compared against the same thresholds. A query compiled with an
+explicit ``now=`` keeps its own clock.
+"""
+
+import builtins
+import itertools
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from flyql.core.column import ColumnSchema
+from flyql.core.exceptions import FlyqlError
+from flyql.core.parser import parse
+from flyql.core.tree import Node
+from flyql.matcher.adapters import Adapter, adapt
+from flyql.matcher.compiler import CompiledQuery, compile
+from flyql.matcher.record import Record, json_projector
+from flyql.references import referenced_paths
+from flyql.transformers.registry import TransformerRegistry
+
+QueryLike = Union[str, Node, CompiledQuery]
+# A Record, a mapping, or any object a record adapter accepts.
+RecordLike = Any
+Line = TypeVar("Line", str, bytes)
+
+
+def _root(query: QueryLike) -> Node:
+    if isinstance(query, CompiledQuery):
+        return query.root
+    if isinstance(query, str):
+        root = parse(query).root
+        if root is None:
+            raise FlyqlError("empty query has no AST root")
+        return root
+    return query
+
+
+def _pinned(
+    query: QueryLike,
+    columns: Optional[ColumnSchema],
+    registry: Optional[TransformerRegistry],
+    default_timezone: str,
+    now: Optional[datetime],
+) -> CompiledQuery:
+    """``query`` compiled with the clock pinned (see module doc)."""
+    if now is None:
+        now = datetime.now(timezone.utc)
+    if isinstance(query, CompiledQuery):
+        return query if query.now is not None else query.at(now)
+    return compile(
+        _root(query),
+        columns=columns,
+        registry=registry,
+        default_timezone=default_timezone,
+        now=now,
+    )
+
+
+def _tester(
+    compiled: CompiledQuery, adapter: Optional[Adapter] = None
+) -> Callable[[RecordLike], bool]:
+    """Match items through one reused wrapper; see module doc."""
+    wrapper = Record({})
+
+    if adapter is not None:
+
+        def test_adapted(item: RecordLike) -> bool:
+            if isinstance(item, Record):
+                return compiled(item)
+            wrapper.rebind(adapter(item))
+            return compiled(wrapper)
+
+        return test_adapted
+
+    def test(item: RecordLike) -> bool:
+        if isinstance(item, dict):
+            wrapper.rebind(item)
+        elif isinstance(item, Record):
+            return compiled(item)
+        else:
+            wrapper.rebind(adapt(item))
+        return compiled(wrapper)
+
+    return test
+
+
+def _predicate(  # pylint: disable=too-many-arguments
+    query: QueryLike,
+    columns: Optional[ColumnSchema],
+    registry: Optional[TransformerRegistry],
+    default_timezone: str,
+    now: Optional[datetime],
+    adapter: Optional[Adapter] = None,
+) -> Callable[[RecordLike], bool]:
+    compiled = _pinned(query, columns, registry, default_timezone, now)
+    return _tester(compiled, adapter)
+
+
+def filter(  # pylint: disable=redefined-builtin
+    query: QueryLike,
+    records: Iterable[RecordLike],
+    *,
+    columns: Optional[ColumnSchema] = None,
+    registry: Optional[TransformerRegistry] = None,
+    default_timezone: str = "UTC",
+    now: Optional[datetime] = None,
+    adapter: Optional[Adapter] = None,
+) -> Iterator[RecordLike]:
+    """Lazily yield the items of ``records`` that match ``query``.
+
+    ``columns``/``registry``/``default_timezone`` are passed to
+    :func:`compile` and ignored when ``query`` is already compiled;
+    ``now`` pins the clock (see module doc); ``adapter`` maps each item
+    that is not a :class:`Record` to a mapping (see module doc).
+    """
+    test = _predicate(query, columns, registry, default_timezone, now, adapter)
+    return (item for item in records if test(item))
+
+
+def count(
+    query: QueryLike,
+    records: Iterable[RecordLike],
+    *,
+    columns: Optional[ColumnSchema] = None,
+    registry: Optional[TransformerRegistry] = None,
+    default_timezone: str = "UTC",
+    now: Optional[datetime] = None,
+    adapter: Optional[Adapter] = None,
+) -> int:
+    """Number of items of ``records`` that match ``query``."""
+    test = _predicate(query, columns, registry, default_timezone, now, adapter)
+    return sum(1 for item in records if test(item))
+
+
+def any(  # pylint: disable=redefined-builtin
+    query: QueryLike,
+    records: Iterable[RecordLike],
+    *,
+    columns: Optional[ColumnSchema] = None,
+    registry: Optional[TransformerRegistry] = None,
+    default_timezone: str = "UTC",
+    now: Optional[datetime] = None,
+    adapter: Optional[Adapter] = None,
+) -> bool:
+    """Whether any item matches; stops at the first match."""
+    test = _predicate(query, columns, registry, default_timezone, now, adapter)
+    return builtins.any(test(item) for item in records)
+
+
+def first_n(
+    query: QueryLike,
+    records: Iterable[RecordLike],
+    n: int,
+    *,
+    columns: Optional[ColumnSchema] = None,
+    registry: Optional[TransformerRegistry] = None,
+    default_timezone: str = "UTC",
+    now: Optional[datetime] = None,
+    adapter: Optional[Adapter] = None,
+) -> List[RecordLike]:
+    """Up to ``n`` matching items, in order; stops after the ``n``-th."""
+    if n < 0:
+        raise FlyqlError("n must not be negative")
+    matches = filter(
+        query,
+        records,
+        columns=columns,
+        registry=registry,
+        default_timezone=default_timezone,
+        now=now,
+        adapter=adapter,
+    )
+    return list(itertools.islice(matches, n))
+
+
+def filter_lines(
+    query: QueryLike,
+    lines: Iterable[Line],
+    *,
+    columns: Optional[ColumnSchema] = None,
+    registry: Optional[TransformerRegistry] = None,
+    default_timezone: str = "UTC",
+    now: Optional[datetime] = None,
+) -> Iterator[Line]:
+    """Lazily yield the JSON lines of ``lines`` whose object matches ``query``.
+
+    Each line is decoded by :func:`~flyql.matcher.record.json_projector`
+    restricted to the top-level fields the query references. Lines that
+    are not a JSON object never match. Lines are yielded unchanged.
+    """
+    root = _root(query)
+    if not isinstance(query, CompiledQuery):
+        query = root
+    test = _predicate(query, columns, registry, default_timezone, now)
+    decode = json_projector({path[0] for path in referenced_paths(root)})
+    return (line for line in lines if (data := decode(line)) is not None and test(data))
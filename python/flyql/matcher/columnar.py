@@ -0,0 +1,534 @@
+"""Columnar matcher backend: evaluate a query over a block of columns.
+
+Instead of one record at a time, :class:`ColumnarQuery` evaluates each
+leaf over a whole column and combines the per-leaf masks with AND/OR/NOT:
+
+    from flyql import parse
+    from flyql.matcher import compile_columnar
+
+    query = compile_columnar(parse("status >= 500 and service in ['api']").root)
+    block = {"status": [200, 503, 500], "service": ["api", "api", "db"]}
+    query.mask(block)  # [False, True, False]
+
+A block maps column names to equal-length sequences: lists, tuples,
+``array.array`` or NumPy arrays. Missing columns read as ``None``.
+
+The result is a list of bools, or a NumPy ``bool`` array when NumPy is
+installed and any column in the block is an ``ndarray``. Leaves over
+numeric and bool NumPy columns (comparisons, ``in``, truthy) run as NumPy
+operations when the literal compares exactly in the column's dtype
+(integral literals on integer columns, literals a float64 holds exactly
+on float columns); ``len`` over NumPy string columns runs as
+``numpy.char.str_len``. Every other leaf with a record-independent
+right-hand side runs as one pass over the column that applies the
+transformers and the test together. ``upper``/``lower`` stay in that pass:
+``numpy.char.upper`` keeps the input width, so a case mapping that
+lengthens a string (``'ß'`` to ``'SS'``) would be truncated. Leaves that
+read another field of the same row (COLUMN-typed operands) are evaluated
+per row. Results are identical to :class:`Evaluator` row by row.
+
+An AND whose left side matched no row (or an OR whose left side matched
+every row) skips its right side for the whole block. Without NumPy the
+right side is evaluated only on the rows the left side left undecided.
+"""
+
+# Leaves are compiled by the row compiler, so results stay identical; like
+# compiler.py this is a friend module of evaluator.py and compiler.py.
+# pylint: disable=protected-access
+
+import importlib
+import math
+from operator import itemgetter
+from types import MappingProxyType
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
+
+from flyql.core.column import ColumnSchema
+from flyql.core.constants import BoolOperator, Operator
+from flyql.core.exceptions import FlyqlError
+from flyql.core.expression import Expression
+from flyql.core.tree import Node, spine_operands
+from flyql.literal import LiteralKind
+from flyql.matcher.compiler import _Compiler, _private_tree, _reads_clock
+from flyql.matcher.evaluator import Evaluator
+from flyql.matcher.key import Key
+from flyql.matcher.record import Record
+from flyql.transformers.builtins import LenTransformer
+from flyql.transformers.registry import TransformerRegistry
+
+try:
+    np: Any = importlib.import_module("numpy")
+    _HAVE_NUMPY = True
+except ImportError:
+    np = None
+    _HAVE_NUMPY = False
+
+Block = Mapping[str, Sequence[Any]]
+Mask = Any  # List[bool], or numpy.ndarray of bool
+_BlockFn = Callable[["_Block"], Mask]
+
+_NUMERIC_KINDS = (LiteralKind.INTEGER, LiteralKind.FLOAT, LiteralKind.BIGINT)
+
+# Marks a literal that has no exact equivalent in a column's dtype.
+_INEXACT = object()
+
+
+class _RowView(Mapping[str, Any]):
+    """One row of a block, seen as a record mapping."""
+
+    __slots__ = ("_block", "_index")
+
+    def __init__(self, block: "_Block", index: int) -> None:
+        self._block = block
+        self._index = index
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._block.data:
+            raise KeyError(name)
+        return self._block.column(name)[self._index]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._block.data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._block.data)
+
+    def __len__(self) -> int:
+        return len(self._block.data)
+
+
+class _Block:
+    __slots__ = ("data", "rows", "length", "use_numpy", "_lists", "_records")
+
+    def __init__(self, data: Block, rows: Optional[List[int]] = None) -> None:
+        self.data = data
+        # Indices into ``data`` of a subset block's rows; None for all rows.
+        self.rows = rows
+        if rows is not None:
+            self.length = len(rows)
+            self.use_numpy = False
+        else:
+            lengths = {len(column) for column in data.values()}
+            if len(lengths) > 1:
+                raise FlyqlError("columnar block columns must have equal length")
+            self.length = lengths.pop() if lengths else 0
+            self.use_numpy = _HAVE_NUMPY and any(
+                isinstance(column, np.ndarray) for column in data.values()
+            )
+        self._lists: Dict[str, Sequence[Any]] = {}
+        self._records: Optional[List[Record]] = None
+
+    def subset(self, indices: List[int]) -> "_Block":
+        """The block of the rows at ``indices`` (list mode only)."""
+        rows = self.rows
+        return _Block(
+            self.data, indices if rows is None else [rows[i] for i in indices]
+        )
+
+    def raw(self, name: str) -> Optional[Sequence[Any]]:
+        return self.data.get(name)
+
+    def column(self, name: str) -> Sequence[Any]:
+        """Column as Python values (NumPy scalars converted)."""
+        values = self._lists.get(name)
+        if values is None:
+            raw = self.data.get(name)
+            if raw is None:
+                values = [None] * self.length
+            elif self.rows is not None:
+                values = _take(raw, self.rows)
+            elif _HAVE_NUMPY and isinstance(raw, np.ndarray):
+                values = raw.tolist()
+            else:
+                values = raw
+            self._lists[name] = values
+        return values
+
+    def records(self) -> List[Record]:
+        if self._records is None:
+            self._records = [Record(_RowView(self, i)) for i in range(self.length)]
+        return self._records
+
+    def to_mask(self, values: List[bool]) -> Mask:
+        return np.asarray(values, dtype=bool) if self.use_numpy else values
+
+
+def _take(column: Sequence[Any], rows: List[int]) -> Sequence[Any]:
+    if len(rows) == 1:
+        return [column[rows[0]]]
+    values: Sequence[Any] = itemgetter(*rows)(column)
+    return values
+
+
+class ColumnarQuery:
+    """A query compiled for columnar blocks; see the module docstring.
+
+    Like :class:`CompiledQuery` it holds no per-call state, so one
+    instance may be shared across threads. Unless compiled with ``now=``,
+    ``now()``/``ago()``/``today()``/``startOf()`` are resolved once per
+    :meth:`mask` call, so all rows of a block share the same thresholds;
+    only the leaves that call them are built again for each block.
+    As for :class:`CompiledQuery`, ``root`` is frozen (a frozen copy of
+    the tree given to :func:`compile_columnar` unless it already was).
+    """
+
+    __slots__ = ("root", "now", "uses_clock", "_fn", "_options", "_compiler")
+
+    def __init__(
+        self,
+        root: Node,
+        fn: _BlockFn,
+        *,
+        now: Optional[datetime] = None,
+        uses_clock: bool = False,
+        options: Optional[Mapping[str, Any]] = None,
+        compiler: Optional["_ColumnarCompiler"] = None,
+    ) -> None:
+        self.root = root
+        self.now = now
+        self.uses_clock = uses_clock
+        self._fn = fn
+        self._options = MappingProxyType(dict(options or {}))
+        self._compiler = compiler
+
+    def mask(self, block: Block) -> Mask:
+        """Per-row match result for ``block``."""
+        fn = self._fn
+        if self.uses_clock and self.now is None:
+            fn = self._pinned_fn(datetime.now(timezone.utc))
+        return fn(_Block(block))
+
+    def _pinned_fn(self, now: datetime) -> _BlockFn:
+        if self._compiler is None:
+            return compile_columnar(self.root, now=now, **self._options)._fn
+        return self._compiler.pinned(now).node(self.root)
+
+
+def compile_columnar(
+    root: Node,
+    *,
+    columns: Optional[ColumnSchema] = None,
+    registry: Optional[TransformerRegistry] = None,
+    default_timezone: str = "UTC",
+    now: Optional[datetime] = None,
+) -> ColumnarQuery:
+    """Compile ``root`` for :meth:`ColumnarQuery.mask`.
+
+    Options and compile-time errors are the same as for :func:`compile`.
+    """
+    options: Dict[str, Any] = {
+        "columns": columns,
+        "registry": registry,
+        "default_timezone": default_timezone,
+    }
+    root = _private_tree(root)
+    evaluator = Evaluator(now=now, **options)
+    compiler = _Compiler(evaluator, columns)
+    columnar = _ColumnarCompiler(compiler)
+    fn = columnar.node(root)
+    return ColumnarQuery(
+        root,
+        fn,
+        now=evaluator._now,
+        uses_clock=compiler.uses_clock,
+        options=options,
+        compiler=columnar,
+    )
+
+
+class _ColumnarCompiler:
+    def __init__(
+        self, compiler: _Compiler, leaves: Optional[Dict[int, _BlockFn]] = None
+    ) -> None:
+        self._compiler = compiler
+        # Leaf functions that do not read the clock, by id(expression).
+        self._leaves: Dict[int, _BlockFn] = {} if leaves is None else leaves
+
+    def pinned(self, now: datetime) -> "_ColumnarCompiler":
+        """A compiler pinned to ``now`` that reuses the leaves compiled
+        so far that do not read the clock."""
+        compiler = self._compiler
+        pinned = _Compiler(
+            compiler._ev._pinned_copy(now), compiler._columns, leaves=compiler.leaves
+        )
+        return _ColumnarCompiler(pinned, self._leaves)
+
+    def node(self, node: Node) -> _BlockFn:
+        fn: _BlockFn
+        if node.expression is not None:
+            fn = self.leaf(node.expression)
+        elif node.left is not None and node.right is not None:
+            fns = [self.node(operand) for operand in spine_operands(node)]
+            fn = _combine(node.bool_operator, fns)
+        elif node.left is not None:
+            fn = self.node(node.left)
+        elif node.right is not None:
+            fn = self.node(node.right)
+        else:
+            raise ValueError("it should never happen")
+        if getattr(node, "negated", False):
+            return _negate(fn)
+        return fn
+
+    def leaf(self, expression: Expression) -> _BlockFn:
+        fn = self._leaves.get(id(expression))
+        if fn is None:
+            fn = self._leaf(expression)
+            if not _reads_clock(expression):
+                self._leaves[id(expression)] = fn
+        return fn
+
+    def _leaf(self, expression: Expression) -> _BlockFn:
+        compiler = self._compiler
+        test = compiler.value_test(expression)
+        if test is None:
+            predicate = compiler.expression(expression)
+            return lambda block: block.to_mask(
+                [predicate(record) for record in block.records()]
+            )
+        plan = compiler._ev._plan_for_expression(expression)
+        key, transform = plan.key, plan.transform
+        vectorized = None
+        if not key.steps:
+            if transform is None:
+                vectorized = _numpy_leaf(expression, compiler)
+            elif _is_builtin_len(expression, compiler):
+                inner = _numpy_leaf(expression, compiler)
+                vectorized = _numpy_str_len(inner) if inner is not None else None
+        value_test = test
+
+        def leaf(block: _Block) -> Mask:
+            if vectorized is not None and block.use_numpy:
+                mask = vectorized(block.raw(key.value))
+                if mask is not None:
+                    return mask
+            values = _column_values(block, key)
+            if transform is None:
+                return block.to_mask([value_test(value) for value in values])
+            return block.to_mask([value_test(transform(value)) for value in values])
+
+        return leaf
+
+
+def _column_values(block: _Block, key: Key) -> Sequence[Any]:
+    column = block.column(key.value)
+    if not key.steps:
+        return column
+    cell: Dict[str, Any] = {}
+    wrapper = Record(cell)
+    values = []
+    for value in column:
+        cell[key.value] = value
+        values.append(wrapper.get_value(key))
+    return values
+
+
+def _combine(bool_operator: str, fns: Sequence[_BlockFn]) -> _BlockFn:
+    """Join a chain's operand masks left to right, as nested pairs would:
+    once the running mask decides the block the remaining operands are
+    skipped, and in list mode each operand only sees the rows still
+    undecided."""
+    first, rest = fns[0], fns[1:]
+    if bool_operator == BoolOperator.AND.value:
+
+        def and_(block: _Block) -> Mask:
+            mask = first(block)
+            for fn in rest:
+                if block.use_numpy:
+                    if not mask.any():
+                        return mask
+                    mask = mask & fn(block)
+                else:
+                    mask = _refine(block, mask, fn, True)
+            return mask
+
+        return and_
+    if bool_operator == BoolOperator.OR.value:
+
+        def or_(block: _Block) -> Mask:
+            mask = first(block)
+            for fn in rest:
+                if block.use_numpy:
+                    if mask.all():
+                        return mask
+                    mask = mask | fn(block)
+                else:
+                    mask = _refine(block, mask, fn, False)
+            return mask
+
+        return or_
+    raise FlyqlError(f"Unknown boolean operator: {bool_operator}")
+
+
+def _refine(
+    block: _Block, mask: List[bool], fn: _BlockFn, undecided: bool
+) -> List[bool]:
+    """``mask`` with the rows whose value is ``undecided`` (True under AND,
+    False under OR) replaced by ``fn`` evaluated on just those rows."""
+    indices = [i for i, value in enumerate(mask) if bool(value) is undecided]
+    if not indices:
+        return mask
+    if len(indices) == block.length:
+        return list(fn(block))
+    mask = list(mask)
+    for i, value in zip(indices, fn(block.subset(indices))):
+        mask[i] = value
+    return mask
+
+
+def _negate(fn: _BlockFn) -> _BlockFn:
+    def negated(block: _Block) -> Mask:
+        mask = fn(block)
+        if block.use_numpy:
+            return ~mask
+        return [not value for value in mask]
+
+    return negated
+
+
+_NumpyLeaf = Callable[[Any], Optional[Mask]]
+
+_NUMPY_COMPARE: Dict[str, Callable[[Any, Any], Any]] = {
+    Operator.EQUALS.value: lambda a, b: a == b,
+    Operator.NOT_EQUALS.value: lambda a, b: a != b,
+    Operator.GREATER_THAN.value: lambda a, b: a > b,
+    Operator.LOWER_THAN.value: lambda a, b: a < b,
+    Operator.GREATER_OR_EQUALS_THAN.value: lambda a, b: a >= b,
+    Operator.LOWER_OR_EQUALS_THAN.value: lambda a, b: a <= b,
+}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _exact_operand(value: Any, arr: Any) -> Any:
+    """``value`` as an operand that NumPy compares exactly against the
+    elements of ``arr`` (an integer or float64 array), or _INEXACT.
+
+    Integer columns take integral literals within the dtype's range
+    (integral floats as ints); float columns take floats and the ints a
+    float64 holds exactly. Anything else would be rounded by NumPy where
+    :class:`Evaluator` compares Python numbers exactly.
+    """
+    if arr.dtype.kind in "iu":
+        if isinstance(value, float):
+            if not value.is_integer():
+                return _INEXACT
+            value = int(value)
+        info = np.iinfo(arr.dtype)
+        return value if info.min <= value <= info.max else _INEXACT
+    if isinstance(value, int):
+        try:
+            as_float = float(value)
+        except OverflowError:
+            return _INEXACT
+        return as_float if as_float == value else _INEXACT
+    return value
+
+
+def _numpy_leaf(expression: Expression, compiler: _Compiler) -> Optional[_NumpyLeaf]:
+    """NumPy version of a leaf over numeric/bool arrays, if it has one.
+
+    The returned function yields None for columns it cannot handle
+    exactly (wrong dtype, missing column, inexact literal); the caller
+    then falls back.
+    """
+    if not _HAVE_NUMPY:
+        return None
+    column = (
+        compiler._ev._resolve_column_for_expression(  # pylint: disable=protected-access
+            expression
+        )
+    )
+    if column is not None:
+        # Schema columns may carry temporal coercion; keep the exact path.
+        return None
+    operator = expression.operator
+    if operator == Operator.TRUTHY.value:
+        return _numpy_guard("iufb", lambda arr: arr.astype(bool))
+    if operator in (Operator.IN.value, Operator.NOT_IN.value):
+        if not expression.values:
+            return None
+        # Only numbers can equal the elements of a numeric array; NaN never does.
+        items = [
+            v
+            for v in expression.values
+            if _is_number(v) and not (isinstance(v, float) and math.isnan(v))
+        ]
+        negated = operator == Operator.NOT_IN.value
+
+        def isin(arr: Any) -> Any:
+            # An item with no exact operand equals no element: drop it.
+            operands = [_exact_operand(item, arr) for item in items]
+            found = np.isin(
+                arr,
+                np.array([o for o in operands if o is not _INEXACT], dtype=arr.dtype),
+            )
+            return ~found if negated else found
+
+        return _numpy_guard("iuf", isin)
+    compare = _NUMPY_COMPARE.get(operator)
+    literal = expression.value
+    if compare is None:
+        return None
+    if expression.value_type in _NUMERIC_KINDS and _is_number(literal):
+
+        def compare_exact(arr: Any) -> Any:
+            operand = _exact_operand(literal, arr)
+            return None if operand is _INEXACT else compare(arr, operand)
+
+        return _numpy_guard("iuf", compare_exact)
+    if expression.value_type == LiteralKind.BOOLEAN and operator in (
+        Operator.EQUALS.value,
+        Operator.NOT_EQUALS.value,
+    ):
+        return _numpy_guard("b", lambda arr: compare(arr, bool(literal)))
+    return None
+
+
+def _numpy_guard(kinds: str, op: Callable[[Any], Any]) -> _NumpyLeaf:
+    def run(raw: Any) -> Optional[Mask]:
+        if not (
+            isinstance(raw, np.ndarray) and raw.ndim == 1 and raw.dtype.kind in kinds
+        ):
+            return None
+        if raw.dtype.kind == "f":
+            if raw.dtype.itemsize > 8:
+                return None
+            # Widening float16/float32 to float64 is exact.
+            raw = raw.astype(np.float64, copy=False)
+        mask = op(raw)
+        return None if mask is None else np.asarray(mask, dtype=bool)
+
+    return run
+
+
+def _is_builtin_len(expression: Expression, compiler: _Compiler) -> bool:
+    transformers = expression.key.transformers
+    return (
+        len(transformers) == 1
+        and transformers[0].name == "len"
+        and not transformers[0].arguments
+        and isinstance(compiler._ev._registry.get("len"), LenTransformer)
+    )
+
+
+def _numpy_str_len(inner: _NumpyLeaf) -> _NumpyLeaf:
+    """``inner`` applied to the lengths of a NumPy string array."""
+
+    def run(raw: Any) -> Optional[Mask]:
+        if isinstance(raw, np.ndarray) and raw.ndim == 1 and raw.dtype.kind == "U":
+            return inner(np.char.str_len(raw))
+        return None
+
+    return run
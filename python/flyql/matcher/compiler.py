@@ -0,0 +1,718 @@
+"""Compile a FlyQL AST into a reusable matcher predicate.
+
+:meth:`Evaluator.evaluate` re-interprets the ``Node``/``Expression`` tree
+for every record. :func:`compile` walks the tree once and returns a
+:class:`CompiledQuery` — a closure tree in which the operator, literal
+coercion, transformer chain and key accessor of every leaf are resolved
+up front, so calling it on a record does only the per-record work:
+
+    from flyql import parse
+    from flyql.matcher import Record, compile
+
+    pred = compile(parse("status=200 and msg~'^GET'").root)
+    hits = [r for r in rows if pred(Record(r))]
+
+Results are identical to :class:`Evaluator`. Errors that do not depend
+on the record (unbound parameters, unknown transformers, invalid regex
+literals, a missing ``[re2]`` extra) are raised by :func:`compile`
+instead of on the first evaluated record.
+"""
+
+# The compiler shares the Evaluator's coercion and caching helpers so both
+# paths stay result-identical; it is a friend module of evaluator.py.
+# pylint: disable=protected-access
+
+from datetime import date, datetime, timezone
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from flyql.core.column import Column, ColumnSchema
+from flyql.core.constants import BoolOperator, Operator
+from flyql.core.exceptions import FlyqlError
+from flyql.core.expression import Expression, FunctionCall, Parameter
+from flyql.core.frozen import freeze, is_frozen, thaw
+from flyql.core.tree import Node, spine_operands
+from flyql.flyql_type import Type
+from flyql.literal import LiteralKind
+from flyql.matcher.evaluator import (
+    _SIMPLE_TESTS,
+    _TEMPORAL_ELIGIBLE_KINDS,
+    Evaluator,
+    _ExpressionPlan,
+    is_truthy,
+)
+from flyql.matcher.key import Key
+from flyql.matcher.ordering import REORDER_COST, OperandChain, check_reorder_mode
+from flyql.matcher.record import Record
+from flyql.matcher.regex_cache import RegexCache
+from flyql.matcher.value_set import StrictValueSet
+from flyql.transformers.registry import TransformerRegistry
+
+Predicate = Callable[[Record], bool]
+Fetch = Callable[[Record], Any]
+Test = Callable[[Any, Any], bool]
+ValueTest = Callable[[Any], bool]
+
+_IN_OPERATORS = (Operator.IN.value, Operator.NOT_IN.value)
+_EMPTY_RECORD = Record({})
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+class CompiledQuery:
+    """A FlyQL query compiled into a predicate over :class:`Record`.
+
+    Instances are callable: ``query(record)`` returns ``True`` when the
+    record matches. Build them with :func:`compile`.
+
+    ``nested_fields`` names the top-level fields the query reaches into
+    with a path (``Payload`` for ``Payload.user=1``); pass it as
+    ``Record(data, decode_fields=query.nested_fields)`` to pre-decode
+    just those JSON-string fields.
+
+    @threadsafe: yes — a CompiledQuery is immutable and one instance may
+    be shared by any number of threads. Per-call state lives on the
+    stack; every per-query precomputation (key accessors, coerced
+    literals, hashed IN lists, LIKE matchers, regexes, timezones) is done
+    by :func:`compile`. The only caches still filled while matching are
+    keyed by record-derived patterns (COLUMN-typed regex/LIKE operands):
+    the regex cache is locked and the others are written idempotently.
+
+    ``uses_clock`` tells whether the query calls ``now()``/``ago()``/
+    ``today()``/``startOf()``. Unless compiled with ``now=``, those read
+    the clock per call; :meth:`at` returns a copy with the clock pinned,
+    whose thresholds are plain integers. The copy reuses the compiled
+    leaves that do not read the clock; only the temporal ones are built
+    again.
+
+    A CompiledQuery pickles as its AST, pinned clock and compile options
+    and is compiled again when unpickled, e.g. in a worker process.
+    ``root`` is a frozen tree (see :mod:`flyql.core.frozen`): the tree
+    passed to :func:`compile` itself, when already frozen, or a frozen
+    copy of it, so changing the caller's tree afterwards (e.g. with
+    :func:`~flyql.bind_params`) cannot make copies and pickles disagree.
+    """
+
+    __slots__ = (
+        "root",
+        "nested_fields",
+        "now",
+        "uses_clock",
+        "_predicate",
+        "_evaluator",
+        "_options",
+        "_leaves",
+    )
+
+    root: Node
+    nested_fields: FrozenSet[str]
+    now: Optional[datetime]
+    uses_clock: bool
+    _predicate: Predicate
+    _evaluator: Evaluator
+    _options: Mapping[str, Any]
+    _leaves: Dict[int, Predicate]
+
+    def __init__(
+        self,
+        root: Node,
+        predicate: Predicate,
+        evaluator: Evaluator,
+        nested_fields: FrozenSet[str] = frozenset(),
+        *,
+        now: Optional[datetime] = None,
+        uses_clock: bool = False,
+        options: Optional[Mapping[str, Any]] = None,
+        leaves: Optional[Dict[int, Predicate]] = None,
+    ) -> None:
+        object.__setattr__(self, "root", root)
+        object.__setattr__(self, "nested_fields", nested_fields)
+        object.__setattr__(self, "now", now)
+        object.__setattr__(self, "uses_clock", uses_clock)
+        object.__setattr__(self, "_predicate", predicate)
+        object.__setattr__(self, "_evaluator", evaluator)
+        object.__setattr__(self, "_options", MappingProxyType(dict(options or {})))
+        # Compiled leaves that do not read the clock, by id(expression);
+        # shared with every copy made by at().
+        object.__setattr__(self, "_leaves", {} if leaves is None else leaves)
+
+    def at(self, now: Optional[datetime] = None) -> "CompiledQuery":
+        """This query with the clock pinned to ``now`` (default: the
+        current time), e.g. once per batch. Returns ``self`` when the
+        query uses no temporal function."""
+        if not self.uses_clock:
+            return self
+        if now is None:
+            now = datetime.now(timezone.utc)
+        evaluator = self._evaluator._pinned_copy(now)
+        compiler = _Compiler(
+            evaluator,
+            self._options.get("columns"),
+            reorder=self._options.get("reorder"),
+            leaves=self._leaves,
+        )
+        return CompiledQuery(
+            self.root,
+            compiler.node(self.root),
+            evaluator,
+            self.nested_fields,
+            now=evaluator._now,
+            uses_clock=True,
+            options=self._options,
+            leaves=self._leaves,
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"CompiledQuery is immutable; cannot set {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"CompiledQuery is immutable; cannot delete {name!r}")
+
+    def __call__(self, record: Record) -> bool:
+        return self._predicate(record)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # The predicate closures do not pickle; recompile on load instead.
+        return (_recompile, (self.root, self.now, dict(self._options)))
+
+
+def _recompile(
+    root: Node, now: Optional[datetime], options: Dict[str, Any]
+) -> CompiledQuery:
+    return compile(root, now=now, **options)
+
+
+def compile(  # pylint: disable=redefined-builtin
+    root: Node,
+    *,
+    columns: Optional[ColumnSchema] = None,
+    registry: Optional[TransformerRegistry] = None,
+    default_timezone: str = "UTC",
+    reorder: Optional[str] = None,
+    regex_cache: Optional[RegexCache] = None,
+    now: Optional[datetime] = None,
+) -> CompiledQuery:
+    """Compile ``root`` into a :class:`CompiledQuery`.
+
+    :param columns: Optional :class:`ColumnSchema` enabling schema-driven
+        temporal coercion, exactly as for :class:`Evaluator`.
+    :param registry: Transformer registry; defaults to the built-ins.
+    :param default_timezone: Fallback timezone for temporal coercion.
+    :param reorder: ``"cost"`` compiles each AND/OR chain cheapest operand
+        first (see :mod:`flyql.matcher.ordering`). Runtime selectivity
+        ordering is only offered by :class:`Evaluator`, since a compiled
+        query keeps no per-call state.
+    :param regex_cache: Compiled-pattern cache, as for :class:`Evaluator`.
+    :param now: Pin ``now()``/``ago()``/``today()``/``startOf()`` to this
+        instant (naive = UTC): thresholds are computed here, once.
+    :raises FlyqlError: for record-independent errors (see module doc).
+    """
+    check_reorder_mode(reorder)
+    if reorder is not None and reorder != REORDER_COST:
+        raise FlyqlError(f"compile() supports reorder={REORDER_COST!r} only")
+    options: Dict[str, Any] = {
+        "columns": columns,
+        "registry": registry,
+        "default_timezone": default_timezone,
+        "reorder": reorder,
+        "regex_cache": regex_cache,
+    }
+    root = _private_tree(root)
+    evaluator = Evaluator(now=now, **options)
+    compiler = _Compiler(evaluator, columns, reorder=reorder)
+    predicate = compiler.node(root)
+    return CompiledQuery(
+        root,
+        predicate,
+        evaluator,
+        frozenset(compiler.nested_fields),
+        now=evaluator._now,
+        uses_clock=compiler.uses_clock,
+        options=options,
+        leaves=compiler.leaves,
+    )
+
+
+def _private_tree(root: Node) -> Node:
+    """``root`` if it is frozen, else a frozen copy of it.
+
+    Compiled queries keep and recompile from this tree; a frozen one can
+    no longer change under them.
+    """
+    return root if is_frozen(root) else freeze(thaw(root))
+
+
+def _reads_clock(expression: Expression) -> bool:
+    """Whether ``expression`` calls now()/ago()/today()/startOf()."""
+    return any(
+        isinstance(literal, FunctionCall)
+        for literal in (expression.value, *(expression.values or []))
+    )
+
+
+def _check_bound(expression: Expression) -> None:
+    if expression.value_type == LiteralKind.PARAMETER:
+        if isinstance(expression.value, Parameter):
+            raise FlyqlError(
+                f"unbound parameter '${expression.value.name}' — call bind_params() before evaluating"
+            )
+        raise FlyqlError("unbound parameter — call bind_params() before evaluating")
+    if expression.values is not None:
+        for v in expression.values:
+            if isinstance(v, Parameter):
+                raise FlyqlError(
+                    f"unbound parameter '${v.name}' in IN list — call bind_params() before evaluating"
+                )
+    if isinstance(expression.value, FunctionCall) and expression.value.parameter_args:
+        raise FlyqlError(
+            f"unbound parameter(s) in function {expression.value.name}() — call bind_params() before evaluating"
+        )
+
+
+# operator -> (is_like, case_insensitive, negated)
+_PATTERN_OPERATORS = {
+    Operator.REGEX.value: (False, False, False),
+    Operator.NOT_REGEX.value: (False, False, True),
+    Operator.LIKE.value: (True, False, False),
+    Operator.NOT_LIKE.value: (True, False, True),
+    Operator.ILIKE.value: (True, True, False),
+    Operator.NOT_ILIKE.value: (True, True, True),
+}
+
+
+class _Compiler:
+    def __init__(
+        self,
+        evaluator: Evaluator,
+        columns: Optional[ColumnSchema],
+        reorder: Optional[str] = None,
+        leaves: Optional[Dict[int, Predicate]] = None,
+    ) -> None:
+        self._ev = evaluator
+        self._columns = columns
+        self._reorder = reorder
+        self._pinned = evaluator._now is not None
+        self.nested_fields: Set[str] = set()
+        self.uses_clock = False
+        # Leaves that do not read the clock, by id(expression); reused
+        # as they are when the query is pinned to another instant.
+        self.leaves: Dict[int, Predicate] = {} if leaves is None else leaves
+
+    def node(self, node: Node) -> Predicate:
+        pred: Predicate
+        if node.expression is not None:
+            pred = self.expression(node.expression)
+        elif (
+            self._reorder is not None
+            and node.left is not None
+            and node.right is not None
+        ):
+            pred = self._chain(node)
+        elif node.left is not None and node.right is not None:
+            preds = [self.node(operand) for operand in spine_operands(node)]
+            pred = self._combine(node.bool_operator, *preds)
+        elif node.left is not None:
+            pred = self.node(node.left)
+        elif node.right is not None:
+            pred = self.node(node.right)
+        else:
+            raise ValueError("it should never happen")
+
+        if getattr(node, "negated", False):
+            inner = pred
+            return lambda record: not inner(record)
+        return pred
+
+    @staticmethod
+    def _combine(bool_operator: str, *preds: Predicate) -> Predicate:
+        """Join a chain's operand predicates; longer chains loop over them
+        instead of nesting closures, so calling one never recurses deeper
+        than a pair would."""
+        if bool_operator == BoolOperator.AND.value:
+            if len(preds) == 2:
+                left, right = preds
+                return lambda record: left(record) and right(record)
+
+            def every(record: Record) -> bool:
+                for pred in preds:
+                    if not pred(record):
+                        return False
+                return True
+
+            return every
+        if bool_operator == BoolOperator.OR.value:
+            if len(preds) == 2:
+                left, right = preds
+                return lambda record: left(record) or right(record)
+
+            def some(record: Record) -> bool:
+                for pred in preds:
+                    if pred(record):
+                        return True
+                return False
+
+            return some
+        raise FlyqlError(f"Unknown boolean operator: {bool_operator}")
+
+    def _chain(self, node: Node) -> Predicate:
+        if node.bool_operator not in (BoolOperator.AND.value, BoolOperator.OR.value):
+            raise FlyqlError(f"Unknown boolean operator: {node.bool_operator}")
+        chain = OperandChain(node, self._columns)
+        preds = tuple(self.node(operand) for operand in chain.operands)
+        if chain.is_and:
+            return lambda record: all(pred(record) for pred in preds)
+        return lambda record: any(pred(record) for pred in preds)
+
+    def _fetch(self, expression: Expression) -> Fetch:
+        plan = self._ev._plan_for_expression(expression)
+        key, transform = plan.key, plan.transform
+        if transform is None:
+            return lambda record: record.get_value(key)
+        return lambda record: transform(record.get_value(key))
+
+    def expression(self, expression: Expression) -> Predicate:
+        pred = self.leaves.get(id(expression))
+        if pred is None:
+            pred = self._expression(expression)
+            if not _reads_clock(expression):
+                self.leaves[id(expression)] = pred
+        return pred
+
+    def _expression(self, expression: Expression) -> Predicate:
+        _check_bound(expression)
+        plan = self._ev._plan_for_expression(expression)
+        for key in (plan.key, plan.rhs_key, *plan.in_keys):
+            if key is not None and key.steps:
+                self.nested_fields.add(key.value)
+        self._warm_timezones(expression, plan.column)
+        fetch = self._fetch(expression)
+        if expression.operator == Operator.TRUTHY.value:
+            return lambda record: is_truthy(fetch(record))
+        if expression.operator in _IN_OPERATORS:
+            return self._in(expression, plan, fetch)
+        return self._compare(expression, plan, fetch)
+
+    def value_test(self, expression: Expression) -> Optional[ValueTest]:
+        """Compile a leaf into a test over its fetched, transformed value.
+
+        Returns None when the leaf also reads other record fields (a
+        COLUMN-typed RHS or IN-list item). Used by the columnar backend.
+        """
+        _check_bound(expression)
+        plan = self._ev._plan_for_expression(expression)
+        if plan.rhs_key is not None:
+            return None
+        if expression.operator in _IN_OPERATORS and not plan.in_static:
+            return None
+        self._warm_timezones(expression, plan.column)
+        # With an identity fetch the record predicates below are value tests.
+        if expression.operator == Operator.TRUTHY.value:
+            return is_truthy
+        if expression.operator in _IN_OPERATORS:
+            return self._in(expression, plan, _identity)
+        return self._compare(expression, plan, _identity)
+
+    def _warm_timezones(self, expression: Expression, col: Optional[Column]) -> None:
+        # Resolve every timezone the expression can touch now, so matching
+        # only reads the evaluator's tz cache.
+        if col is not None and col.type in (Type.Date, Type.DateTime):
+            self._ev._resolve_tz(col.tz, "")
+        for literal in (expression.value, *(expression.values or [])):
+            if isinstance(literal, FunctionCall):
+                self.uses_clock = True
+                self._ev._resolve_tz("", literal.timezone)
+
+    def _test(self, expression: Expression) -> Test:
+        operator = expression.operator
+        simple = _SIMPLE_TESTS.get(operator)
+        if simple is not None:
+            return simple
+        ev = self._ev
+        if operator == Operator.HAS.value:
+            return ev._eval_has
+        if operator == Operator.NOT_HAS.value:
+            return lambda value, expr_value: (
+                value is not None and not ev._eval_has(value, expr_value)
+            )
+        pattern_op = _PATTERN_OPERATORS.get(operator)
+        if pattern_op is None:
+            raise FlyqlError(f"Unknown expression operator: {operator}")
+        is_like, insensitive, negated = pattern_op
+
+        def matcher_for(expr_value: Any) -> Callable[[str], bool]:
+            if is_like:
+                return ev._get_like(str(expr_value), insensitive)
+            regex = ev._get_regex(str(expr_value))
+            return lambda value: bool(regex.search(value))
+
+        # Pre-compile the literal pattern; anything else (COLUMN refs,
+        # temporal-coerced literals) goes through the evaluator caches.
+        literal = expression.value
+        static_matcher: Optional[Callable[[str], bool]] = None
+        if expression.value_type != LiteralKind.COLUMN:
+            static_matcher = matcher_for(literal)
+
+        def pattern_match(value: Any, expr_value: Any) -> bool:
+            if static_matcher is not None and expr_value is literal:
+                return static_matcher(str(value))
+            return matcher_for(expr_value)(str(value))
+
+        if not negated:
+            return pattern_match
+        return lambda value, expr_value: value is not None and not pattern_match(
+            value, expr_value
+        )
+
+    def _compare(
+        self, expression: Expression, plan: _ExpressionPlan, fetch: Fetch
+    ) -> Predicate:
+        ev = self._ev
+        test = self._test(expression)
+        value_type = expression.value_type
+        literal = expression.value
+        col = plan.column
+        rhs_key = plan.rhs_key
+
+        def rhs(record: Record) -> Any:
+            if rhs_key is not None and rhs_key.value in record.data:
+                return record.get_value(rhs_key)
+            return literal
+
+        eligible = value_type in _TEMPORAL_ELIGIBLE_KINDS
+        is_function = value_type == LiteralKind.FUNCTION and isinstance(
+            literal, FunctionCall
+        )
+
+        if col is not None:
+            is_date_col = col.type == Type.Date
+            is_datetime_col = col.type == Type.DateTime
+            if (is_date_col or is_datetime_col) and eligible:
+                return self._static_temporal(
+                    fetch, test, col, literal, value_type, is_date_col
+                )
+            if is_date_col:
+                # Non-eligible RHS on a Date column: still warn, no coercion.
+                def warn_then_test(record: Record) -> bool:
+                    value = fetch(record)
+                    ev._maybe_warn_date_migration(col, value)
+                    return test(value, rhs(record))
+
+                return warn_then_test
+            if is_function:
+                return self._function_threshold(fetch, test, literal)
+            if rhs_key is None:
+                return lambda record: test(fetch(record), literal)
+            return lambda record: test(fetch(record), rhs(record))
+
+        # Schemaless: native datetime/date record values switch on temporal
+        # coercion per record (Python-only auto-infer, Decision 14).
+        if not eligible:
+            if rhs_key is None:
+                return lambda record: test(fetch(record), literal)
+            return lambda record: test(fetch(record), rhs(record))
+
+        if is_function and self._pinned:
+            return self._pinned_schemaless_function(fetch, test, literal)
+
+        if is_function:
+            fc: FunctionCall = literal
+
+            def schemaless_function(record: Record) -> bool:
+                value = fetch(record)
+                rec: Optional[int]
+                rhs: Optional[int]
+                if isinstance(value, datetime):
+                    rec = ev._resolve_record_value_as_ms(value, None)
+                    rhs = ev._coerce_literal_to_ms(fc, value_type, None)
+                elif isinstance(value, date):
+                    rec = ev._resolve_record_value_as_date(value, None)
+                    rhs = ev._coerce_literal_to_date(fc, value_type, None)
+                else:
+                    rhs = ev._evaluate_function_call(fc)
+                    rec = ev._resolve_record_value_as_ms(value, None)
+                if rec is None or rhs is None:
+                    return False
+                return test(rec, rhs)
+
+            return schemaless_function
+
+        literal_ms = ev._coerce_literal_to_ms(literal, value_type, None)
+        literal_date = ev._coerce_literal_to_date(literal, value_type, None)
+
+        def schemaless(record: Record) -> bool:
+            value = fetch(record)
+            if isinstance(value, datetime):
+                if literal_ms is None:
+                    return False
+                rec = ev._resolve_record_value_as_ms(value, None)
+                return rec is not None and test(rec, literal_ms)
+            if isinstance(value, date):
+                if literal_date is None:
+                    return False
+                rec = ev._resolve_record_value_as_date(value, None)
+                return rec is not None and test(rec, literal_date)
+            return test(value, literal)
+
+        return schemaless
+
+    def _pinned_schemaless_function(
+        self, fetch: Fetch, test: Test, fc: FunctionCall
+    ) -> Predicate:
+        ev = self._ev
+        fc_ms = ev._coerce_literal_to_ms(fc, LiteralKind.FUNCTION, None)
+        fc_date = ev._coerce_literal_to_date(fc, LiteralKind.FUNCTION, None)
+
+        def schemaless_function(record: Record) -> bool:
+            value = fetch(record)
+            if isinstance(value, datetime):
+                rec = ev._resolve_record_value_as_ms(value, None)
+                rhs = fc_ms
+            elif isinstance(value, date):
+                rec = ev._resolve_record_value_as_date(value, None)
+                rhs = fc_date
+            else:
+                rec = ev._resolve_record_value_as_ms(value, None)
+                rhs = fc_ms
+            if rec is None or rhs is None:
+                return False
+            return test(rec, rhs)
+
+        return schemaless_function
+
+    def _static_temporal(
+        self,
+        fetch: Fetch,
+        test: Test,
+        col: Column,
+        literal: Any,
+        value_type: Optional[LiteralKind],
+        is_date_col: bool,
+    ) -> Predicate:
+        ev = self._ev
+        if is_date_col:
+            coerce_record = ev._resolve_record_value_as_date
+            coerce_literal = ev._coerce_literal_to_date
+        else:
+            coerce_record = ev._resolve_record_value_as_ms
+            coerce_literal = ev._coerce_literal_to_ms
+
+        if value_type == LiteralKind.FUNCTION and not self._pinned:
+
+            def temporal_function(record: Record) -> bool:
+                value = fetch(record)
+                if is_date_col:
+                    ev._maybe_warn_date_migration(col, value)
+                rec = coerce_record(value, col)
+                rhs = coerce_literal(literal, value_type, col)
+                if rec is None or rhs is None:
+                    return False
+                return test(rec, rhs)
+
+            return temporal_function
+
+        rhs = coerce_literal(literal, value_type, col)
+
+        def temporal(record: Record) -> bool:
+            value = fetch(record)
+            if is_date_col:
+                ev._maybe_warn_date_migration(col, value)
+            if rhs is None:
+                return False
+            rec = coerce_record(value, col)
+            if rec is None:
+                return False
+            return test(rec, rhs)
+
+        return temporal
+
+    def _function_threshold(
+        self, fetch: Fetch, test: Test, fc: FunctionCall
+    ) -> Predicate:
+        ev = self._ev
+        if self._pinned:
+            pinned_ms = ev._evaluate_function_call(fc)
+
+            def pinned_threshold(record: Record) -> bool:
+                record_ms = ev._resolve_record_value_as_ms(fetch(record), None)
+                if record_ms is None:
+                    return False
+                return test(record_ms, pinned_ms)
+
+            return pinned_threshold
+
+        def threshold(record: Record) -> bool:
+            value = fetch(record)
+            threshold_ms = ev._evaluate_function_call(fc)
+            record_ms = ev._resolve_record_value_as_ms(value, None)
+            if record_ms is None:
+                return False
+            return test(record_ms, threshold_ms)
+
+        return threshold
+
+    def _in(
+        self, expression: Expression, plan: _ExpressionPlan, fetch: Fetch
+    ) -> Predicate:
+        ev = self._ev
+        col = plan.column
+        negated = expression.operator == Operator.NOT_IN.value
+        if not expression.values:
+            return (lambda record: True) if negated else (lambda record: False)
+
+        def members(record: Record, is_date: bool, is_datetime: bool) -> StrictValueSet:
+            return StrictValueSet(
+                ev._resolve_in_values(
+                    expression, record, col, is_date, is_datetime, plan
+                )
+            )
+
+        static_date = col is not None and col.type == Type.Date
+        static_datetime = col is not None and col.type == Type.DateTime
+
+        if plan.in_static:
+            if col is None:
+                variants = [(False, False), (True, False), (False, True)]
+            else:
+                variants = [(static_date, static_datetime)]
+            static = {(d, dt): members(_EMPTY_RECORD, d, dt) for d, dt in variants}
+
+            def static_members(
+                record: Record, is_date: bool, is_datetime: bool
+            ) -> StrictValueSet:
+                return static[(is_date, is_datetime)]
+
+            members = static_members
+
+        def membership(record: Record) -> bool:
+            value = fetch(record)
+            is_date, is_datetime = static_date, static_datetime
+            if col is None:
+                if isinstance(value, datetime):
+                    is_datetime = True
+                elif isinstance(value, date):
+                    is_date = True
+            elif is_date:
+                ev._maybe_warn_date_migration(col, value)
+            if negated and value is None:
+                return False
+            value_set = members(record, is_date, is_datetime)
+            if is_date or is_datetime:
+                value = ev._coerce_value_for_temporal(value, col, is_date)
+                if value is None:
+                    return False
+            found = value in value_set
+            return not found if negated else found
+
+        return membership
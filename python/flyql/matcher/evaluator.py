@@ -1,23 +1,32 @@
 """Matcher evaluator with lazy optional re2 dependency.
 
-Regex (``~`` / ``!~``) and LIKE-family operators require the ``google-re2``
-package, which is shipped as the optional ``[re2]`` extra:
+Regex (``~`` / ``!~``) operators require the ``google-re2`` package,
+which is shipped as the optional ``[re2]`` extra:
 
     pip install flyql[re2]
 
 Without the extra, non-regex evaluations (equality, comparison, ``in``,
-``has``, ...) work unchanged; invoking a regex or LIKE operator raises
-``FlyqlError(ERR_RE2_MISSING)``. RE2-safety (no catastrophic backtracking,
-no backreferences/lookahead) is documented in ``SECURITY.md``; there is
-no silent fallback to ``re`` by design.
+``has``, ...) work unchanged; invoking a regex operator raises
+``FlyqlError(ERR_RE2_MISSING)``. LIKE/ILIKE patterns with a fast path
+(see :mod:`flyql.matcher.like`) need no regex engine; the remaining
+shapes, and ILIKE against non-ASCII values, raise the same error.
+RE2-safety (no catastrophic backtracking, no backreferences/lookahead)
+is documented in ``SECURITY.md``; there is no silent fallback to ``re``
+by design.
 
 Pattern for future optional deps: import with a try/except at module top,
 bind both the module and a boolean flag, then guard once at each
 public entry point that uses the dependency (not per call).
 
 @threadsafe: no — construct one Evaluator per request/worker. All caches
-(``self.cache``, ``self._tz_cache``, ``self._expr_column_cache``,
-``self._migration_warned``) are mutable maps/sets with no locking.
+(``self._tz_cache``, ``self._expr_plan_cache``, ``self._chain_cache``,
+``self._migration_warned``) are mutable maps/sets with no locking. The
+temporal coercion memos (``self._iso_ms_memo``, ``self._date_memo``) are
+bounded and only use atomic dict operations. The LIKE matcher cache
+(``self._like_cache``) is a locked LRU bounded by ``_LIKE_CACHE_SIZE``.
+The regex cache (``self.cache``) is a locked
+:class:`~flyql.matcher.regex_cache.RegexCache`, shared process-wide by
+default.
 
 Warning/log channel (Python): invalid timezones and Date→DateTime
 migration warnings are emitted on BOTH ``warnings.warn(UserWarning)`` and
@@ -26,12 +35,17 @@ migration warnings are emitted on BOTH ``warnings.warn(UserWarning)`` and
 Consumers that need cross-language scraping should check all three.
 """
 
+import copy
 import logging
 import re
+import threading
+import time
 import warnings
 import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 # Detects a string carrying a time-of-day component after a T or space
@@ -52,14 +66,23 @@ from flyql.core.constants import BoolOperator, Operator
 from flyql.core.column import Column, ColumnSchema
 from flyql.core.exceptions import FlyqlError
 from flyql.core.expression import Duration, Expression, FunctionCall, Parameter
-from flyql.core.tree import Node
+from flyql.core.tree import Node, chain_spine
 from flyql.errors_generated import ERR_RE2_MISSING, MATCHER_MESSAGES
 from flyql.flyql_type import Type
 from flyql.literal import LiteralKind
 
 from flyql.matcher.key import Key
+from flyql.matcher.like import LikeMatcher
+from flyql.matcher.profile import Profile
+from flyql.matcher.ordering import (
+    REORDER_SELECTIVITY,
+    OperandChain,
+    check_reorder_mode,
+)
 from flyql.matcher.record import Record
-from flyql.transformers.registry import TransformerRegistry, default_registry
+from flyql.matcher.regex_cache import RegexCache, default_regex_cache
+from flyql.matcher.value_set import StrictValueSet, strict_equal
+from flyql.transformers.registry import TransformerRegistry, shared_default_registry
 
 _DURATION_UNIT_MS: Dict[str, int] = {
     "s": 1_000,
@@ -101,12 +124,89 @@ def _sum_durations(durations: List[Duration]) -> int:
     return total
 
 
+def _as_utc(value: datetime) -> datetime:
+    """Aware UTC datetime; naive values are taken as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _function_key(fc: FunctionCall) -> Tuple[Any, ...]:
+    return (
+        fc.name,
+        fc.unit,
+        fc.timezone,
+        tuple((d.value, d.unit) for d in fc.duration_args),
+    )
+
+
 def _pack_date(year: int, month: int, day: int) -> int:
     """Pack Y/M/D into a single int (``Y*10000 + M*100 + D``) whose integer
     ordering mirrors calendar ordering (Decision 27)."""
     return year * 10000 + month * 100 + day
 
 
+# Upper bound on each temporal coercion memo (see Evaluator.__init__).
+# A full memo is cleared rather than LRU-evicted: lookups stay a plain
+# dict get, and dict get/set/clear are atomic under the GIL, so compiled
+# queries shared across threads need no lock on the hot path.
+_TEMPORAL_MEMO_SIZE = 4096
+# Upper bound on the LIKE matchers an Evaluator keeps (least recently
+# used evicted first).
+_LIKE_CACHE_SIZE = 1024
+_MISSING = object()
+_CHAIN_OPERATORS = (BoolOperator.AND.value, BoolOperator.OR.value)
+
+
+def _memo_put(memo: Dict[Any, Optional[int]], key: Any, value: Optional[int]) -> None:
+    if len(memo) >= _TEMPORAL_MEMO_SIZE:
+        memo.clear()
+    memo[key] = value
+
+
+def _parse_fixed_iso(s: str) -> Optional[datetime]:
+    """Parse the fixed-width ``YYYY-MM-DDTHH:MM:SS[.fff][Z]`` shape.
+
+    A space may replace the ``T``. Returns the same datetime as
+    ``fromisoformat`` would, or None for any other shape (including
+    out-of-range fields) so the caller falls back to the general parser.
+    """
+    n = len(s)
+    zulu = n in (20, 24) and s[-1] == "Z"
+    body = n - 1 if zulu else n
+    if body not in (19, 23) or not s.isascii():
+        return None
+    if (
+        s[4] != "-"
+        or s[7] != "-"
+        or (s[10] != "T" and s[10] != " ")
+        or s[13] != ":"
+        or s[16] != ":"
+    ):
+        return None
+    fields = s[0:4] + s[5:7] + s[8:10] + s[11:13] + s[14:16] + s[17:19]
+    millis = 0
+    if body == 23:
+        if s[19] != "." or not s[20:23].isdigit():
+            return None
+        millis = int(s[20:23])
+    if not fields.isdigit():
+        return None
+    try:
+        return datetime(
+            int(s[0:4]),
+            int(s[5:7]),
+            int(s[8:10]),
+            int(s[11:13]),
+            int(s[14:16]),
+            int(s[17:19]),
+            millis * 1000,
+            tzinfo=timezone.utc if zulu else None,
+        )
+    except ValueError:
+        return None
+
+
 def _resolve_record_value_as_ms(value: Any) -> Optional[int]:
     """Schema-free legacy helper retained for external callers.
 
@@ -138,6 +238,64 @@ def _resolve_record_value_as_ms(value: Any) -> Optional[int]:
 
 REGEX_OPERATORS = {Operator.REGEX.value, Operator.NOT_REGEX.value}
 
+
+def _equals(value: Any, expr_value: Any) -> bool:
+    if isinstance(expr_value, bool) or expr_value is None:
+        return value is expr_value
+    if isinstance(value, bool) != isinstance(expr_value, bool):
+        return False
+    return bool(value == expr_value)
+
+
+def _not_equals(value: Any, expr_value: Any) -> bool:
+    if isinstance(expr_value, bool) or expr_value is None:
+        return value is not expr_value
+    if value is None:
+        return False
+    if isinstance(value, bool) != isinstance(expr_value, bool):
+        return True
+    return bool(value != expr_value)
+
+
+def _greater(value: Any, expr_value: Any) -> bool:
+    try:
+        return bool(value > expr_value)
+    except TypeError:
+        return False
+
+
+def _lower(value: Any, expr_value: Any) -> bool:
+    try:
+        return bool(value < expr_value)
+    except TypeError:
+        return False
+
+
+def _greater_or_equals(value: Any, expr_value: Any) -> bool:
+    try:
+        return bool(value >= expr_value)
+    except TypeError:
+        return False
+
+
+def _lower_or_equals(value: Any, expr_value: Any) -> bool:
+    try:
+        return bool(value <= expr_value)
+    except TypeError:
+        return False
+
+
+# Operators that test only (record value, literal); the compiled path
+# returns these functions as its leaf tests.
+_SIMPLE_TESTS = {
+    Operator.EQUALS.value: _equals,
+    Operator.NOT_EQUALS.value: _not_equals,
+    Operator.GREATER_THAN.value: _greater,
+    Operator.LOWER_THAN.value: _lower,
+    Operator.GREATER_OR_EQUALS_THAN.value: _greater_or_equals,
+    Operator.LOWER_OR_EQUALS_THAN.value: _lower_or_equals,
+}
+
 _REGEX_META = frozenset(r".[{()*+?^$|\\")
 
 
@@ -170,6 +328,71 @@ def _like_to_regex(pattern: str) -> str:
     return "^" + "".join(parts) + "$"
 
 
+def _column_ref_key(value: Any) -> Optional[Key]:
+    """Accessor for a COLUMN-typed literal, or None when it cannot be parsed."""
+    if not isinstance(value, str):
+        return None
+    try:
+        return Key(value)
+    except Exception:
+        return None
+
+
+class _ExpressionPlan:
+    """Record-independent state of one Expression, built once per Evaluator:
+    the resolved schema column, the key accessor and compiled transformer
+    chain of the LHS, and the key accessors for a COLUMN-typed RHS and
+    each COLUMN-typed IN-list item.
+
+    ``in_sets`` memoizes the hashed IN list per temporal variant
+    ``(is_date, is_datetime)`` when no item depends on the record or the
+    clock (``in_static``)."""
+
+    __slots__ = (
+        "column",
+        "key",
+        "transform",
+        "rhs_key",
+        "in_keys",
+        "in_static",
+        "in_sets",
+    )
+
+    def __init__(
+        self,
+        expression: Expression,
+        column: Optional[Column],
+        registry: TransformerRegistry,
+    ) -> None:
+        self.column = column
+        self.key = Key.from_segments(expression.key.segments)
+        # The key's transformer chain fused into one callable, or None.
+        self.transform: Optional[Callable[[Any], Any]] = (
+            registry.chain(expression.key.transformers).apply
+            if expression.key.transformers
+            else None
+        )
+        self.rhs_key: Optional[Key] = None
+        if expression.value_type == LiteralKind.COLUMN:
+            self.rhs_key = _column_ref_key(expression.value)
+        self.in_keys: List[Optional[Key]] = []
+        if expression.values and expression.values_types:
+            types = expression.values_types
+            self.in_keys = [
+                (
+                    _column_ref_key(v)
+                    if i < len(types) and types[i] == LiteralKind.COLUMN
+                    else None
+                )
+                for i, v in enumerate(expression.values)
+            ]
+        self.in_static = not any(
+            vt in (LiteralKind.COLUMN, LiteralKind.FUNCTION)
+            for vt in expression.values_types or []
+        )
+        self.in_sets: Dict[Tuple[bool, bool], StrictValueSet] = {}
+
+
 def is_falsy(value: Any) -> bool:
     """Check if a value is falsy (Python-style)."""
     if value is None:
@@ -198,6 +421,10 @@ class Evaluator:
         registry: Optional[TransformerRegistry] = None,
         default_timezone: str = "UTC",
         columns: Optional[ColumnSchema] = None,
+        reorder: Optional[str] = None,
+        regex_cache: Optional[RegexCache] = None,
+        now: Optional[datetime] = None,
+        profile: Optional[Profile] = None,
     ) -> None:
         """Construct an Evaluator.
 
@@ -207,27 +434,72 @@ class Evaluator:
             absent, the matcher falls back to schema-free behaviour
             (numerics assumed ms, ISO strings auto-parsed, native
             temporal types handled by runtime introspection).
+        :param reorder: Optional AND/OR operand ordering. ``"cost"``
+            evaluates the operands of each same-operator chain cheapest
+            first (equality < IN < LIKE < regex < JSON-string path);
+            ``"selectivity"`` starts from cost order and periodically
+            re-sorts by how often each operand decides the result.
+            Results are identical to source order; only the amount of
+            work skipped by short-circuiting changes.
+        :param regex_cache: Compiled-pattern cache; defaults to the
+            process-wide :func:`default_regex_cache`. Pass a dedicated
+            :class:`RegexCache` for other bounds or RE2 options.
+        :param now: Pin the clock seen by ``now()``/``ago()``/``today()``/
+            ``startOf()`` (naive = UTC); each threshold is then computed
+            once. By default the clock is read per evaluation; see
+            :meth:`snapshot` to pin it for one batch only.
+        :param profile: Collect per-node evaluation counts and time into
+            this :class:`~flyql.matcher.profile.Profile`. Without one,
+            :meth:`evaluate` carries no instrumentation at all.
 
         @threadsafe: no — construct one Evaluator per request/worker.
-        ``self.cache`` (regex), ``self._tz_cache`` (ZoneInfo),
-        ``self._expr_column_cache``, ``self._migration_warned``, and
-        ``self._invalid_tz_warned`` are all unprotected mutable state.
+        ``self.cache`` (the :class:`RegexCache`) is the exception: it is
+        locked and may be shared. ``self._tz_cache`` (ZoneInfo),
+        ``self._expr_plan_cache``, ``self._migration_warned``, and
+        ``self._invalid_tz_warned`` are all unprotected mutable state;
+        the bounded temporal memos (``self._iso_ms_memo``,
+        ``self._date_memo``) only use atomic dict operations, and the
+        bounded ``self._like_cache`` is locked.
         """
-        self.cache: Dict[str, Any] = {}
-        self._registry = registry or default_registry()
+        self.cache = default_regex_cache() if regex_cache is None else regex_cache
+        # LIKE patterns can come from records (COLUMN-typed RHS), so the
+        # matchers are kept in an LRU of _LIKE_CACHE_SIZE entries.
+        self._like_lock = threading.Lock()
+        self._like_cache: "OrderedDict[Tuple[str, bool], LikeMatcher]" = OrderedDict()
+        self._registry = registry or shared_default_registry()
         self._default_timezone = default_timezone
         self._columns = columns
         self._tz_cache: Dict[str, ZoneInfo] = {}
-        # Per Decision 26: cache column resolution by Expression identity.
+        # Per Decision 26: cache per-Expression state (column resolution,
+        # key accessors) by Expression identity.
         # WeakValueDictionary-over-id won't work (id reuses after GC) and
         # Expression isn't hashable, so we key by id(expr) but register a
         # weakref finalizer that evicts the cache entry when the Expression
         # is collected — guarantees no stale-address hits (P1 fix).
-        self._expr_column_cache: Dict[int, Optional[Column]] = {}
-        self._expr_column_finalizers: Dict[int, Any] = {}
+        self._expr_plan_cache: Dict[int, _ExpressionPlan] = {}
+        self._expr_plan_finalizers: Dict[int, Any] = {}
         # Dedup migration warnings by match_name (fully-qualified) per F45/F59.
         self._migration_warned: set[str] = set()
         self._invalid_tz_warned: set[str] = set()
+        check_reorder_mode(reorder)
+        self._reorder = reorder
+        # Operand chains for reorder mode, keyed by id(node) with the same
+        # weakref-finalizer eviction as the plan cache above.
+        self._chain_cache: Dict[int, OperandChain] = {}
+        self._chain_finalizers: Dict[int, Any] = {}
+        self._now: Optional[datetime] = _as_utc(now) if now is not None else None
+        self._function_ms: Dict[Tuple[Any, ...], int] = {}
+        # Bounded memos for string → ms (keyed by (string, column tz)) and
+        # string/numeric → packed date (keyed by (value, column tz, unit)).
+        # Log batches repeat the same timestamps heavily; see
+        # _TEMPORAL_MEMO_SIZE for the eviction policy.
+        self._iso_ms_memo: Dict[Tuple[str, str], Optional[int]] = {}
+        self._date_memo: Dict[Tuple[Any, str, str], Optional[int]] = {}
+        self.profile = profile
+        if profile is not None:
+            # Recursive calls go through the instance attribute, so every
+            # node is timed; the class method stays uninstrumented.
+            self.evaluate = self._evaluate_profiled  # type: ignore[method-assign]
 
     def _resolve_tz(self, col_tz: str = "", fc_tz: str = "") -> ZoneInfo:
         """Resolve a tz name via the fallback order from Decision 25.
@@ -262,22 +534,28 @@ class Evaluator:
     def _resolve_column_for_expression(
         self, expression: Expression
     ) -> Optional[Column]:
-        """Resolve and cache the column schema entry for an Expression.
+        """Resolve and cache the column schema entry for an Expression."""
+        return self._plan_for_expression(expression).column
+
+    def _plan_for_expression(self, expression: Expression) -> "_ExpressionPlan":
+        """Build and cache the record-independent state of an Expression.
 
         Keyed by ``id(expression)`` with a weakref finalizer that evicts
         the entry when the Expression is collected, so a later Expression
         allocated at the same address cannot return a stale hit.
         """
         key = id(expression)
-        if key in self._expr_column_cache:
-            return self._expr_column_cache[key]
+        plan = self._expr_plan_cache.get(key)
+        if plan is not None:
+            return plan
         col: Optional[Column] = None
         if self._columns is not None and expression.key.segments:
             col = self._columns.resolve(list(expression.key.segments))
-        self._expr_column_cache[key] = col
+        plan = _ExpressionPlan(expression, col, self._registry)
+        self._expr_plan_cache[key] = plan
         try:
-            self._expr_column_finalizers[key] = weakref.finalize(
-                expression, self._evict_expr_column_cache, key
+            self._expr_plan_finalizers[key] = weakref.finalize(
+                expression, self._evict_expr_plan_cache, key
             )
         except TypeError:
             # Expression doesn't support weak refs — skip caching-with-finalizer;
@@ -285,15 +563,78 @@ class Evaluator:
             # OK because the Expression is retained by a strong ref elsewhere
             # (same-id risk only applies when the original is GC'd).
             pass
-        return col
-
-    def _evict_expr_column_cache(self, key: int) -> None:
-        self._expr_column_cache.pop(key, None)
-        self._expr_column_finalizers.pop(key, None)
+        return plan
+
+    def _evict_expr_plan_cache(self, key: int) -> None:
+        self._expr_plan_cache.pop(key, None)
+        self._expr_plan_finalizers.pop(key, None)
+
+    def _chain_for_node(self, node: Node) -> OperandChain:
+        key = id(node)
+        chain = self._chain_cache.get(key)
+        if chain is not None:
+            return chain
+        chain = OperandChain(
+            node, self._columns, adaptive=self._reorder == REORDER_SELECTIVITY
+        )
+        self._chain_cache[key] = chain
+        try:
+            self._chain_finalizers[key] = weakref.finalize(
+                node, self._evict_chain_cache, key
+            )
+        except TypeError:
+            pass
+        return chain
+
+    def _evict_chain_cache(self, key: int) -> None:
+        self._chain_cache.pop(key, None)
+        self._chain_finalizers.pop(key, None)
+
+    def _pinned_copy(self, now: datetime) -> "Evaluator":
+        """A copy with the clock pinned to ``now`` that shares every cache
+        but the function thresholds; compiled queries use it to re-pin
+        without re-planning their leaves."""
+        # pylint: disable=protected-access
+        pinned = copy.copy(self)
+        pinned._now = _as_utc(now)
+        pinned._function_ms = {}
+        if pinned.profile is not None:
+            pinned.evaluate = pinned._evaluate_profiled  # type: ignore[method-assign]
+        return pinned
+
+    @contextmanager
+    def snapshot(self, now: Optional[datetime] = None) -> Iterator[None]:
+        """Pin ``now()``/``ago()``/``today()``/``startOf()`` for a batch.
+
+        Inside the block every record is compared against the same
+        thresholds, each computed once. ``now`` defaults to the current
+        time; naive datetimes are taken as UTC.
+        """
+        previous = (self._now, self._function_ms)
+        self._now = _as_utc(now) if now is not None else datetime.now(timezone.utc)
+        self._function_ms = {}
+        try:
+            yield
+        finally:
+            self._now, self._function_ms = previous
 
     def _evaluate_function_call(self, fc: FunctionCall) -> int:
-        """Resolve a FunctionCall to milliseconds since epoch."""
-        now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+        """Resolve a FunctionCall to milliseconds since epoch.
+
+        With a pinned clock (``now=`` or :meth:`snapshot`) the result is
+        computed once per distinct call and reused.
+        """
+        if self._now is None:
+            return self._function_call_ms(fc, datetime.now(timezone.utc))
+        key = _function_key(fc)
+        ms = self._function_ms.get(key)
+        if ms is None:
+            ms = self._function_call_ms(fc, self._now)
+            self._function_ms[key] = ms
+        return ms
+
+    def _function_call_ms(self, fc: FunctionCall, now: datetime) -> int:
+        now_ms = int(now.timestamp() * 1000)
 
         if fc.name == "now":
             return now_ms
@@ -304,7 +645,7 @@ class Evaluator:
         tz = self._resolve_tz("", fc.timezone)
 
         if fc.name == "today":
-            midnight = datetime.now(tz).replace(
+            midnight = now.astimezone(tz).replace(
                 hour=0,
                 minute=0,
                 second=0,
@@ -313,7 +654,7 @@ class Evaluator:
             return int(midnight.timestamp() * 1000)
 
         if fc.name == "startOf":
-            now_local = datetime.now(tz)
+            now_local = now.astimezone(tz)
             if fc.unit == "day":
                 start = now_local.replace(
                     hour=0,
@@ -351,6 +692,7 @@ class Evaluator:
         Decision 19: DST fall-back resolves to fold=0 (earlier); DST
         spring-forward (nonexistent wall-clock) returns None.
         Python 3.10 ``fromisoformat`` lacks Z support — shim via replace.
+        Results (including None) are memoized per (string, column tz).
         """
         if not s:
             return None
@@ -358,23 +700,22 @@ class Evaluator:
         has_delim = any(ch in s for ch in "-:T/")
         if not has_delim and not s.lstrip("-").isdigit():
             return None
-        s_fix = s.replace("Z", "+00:00", 1) if s.endswith("Z") else s
-        dt: Optional[datetime] = None
-        try:
-            dt = datetime.fromisoformat(s_fix)
-        except ValueError:
-            if " " in s_fix:
-                try:
-                    dt = datetime.fromisoformat(s_fix.replace(" ", "T", 1))
-                except ValueError:
-                    dt = None
+        key = (s, column.tz if column else "")
+        cached = self._iso_ms_memo.get(key, _MISSING)
+        if cached is not _MISSING:
+            return cached  # type: ignore[return-value]
+        ms = self._parse_iso_string_uncached(s, column)
+        _memo_put(self._iso_ms_memo, key, ms)
+        return ms
+
+    def _parse_iso_string_uncached(
+        self, s: str, column: Optional[Column]
+    ) -> Optional[int]:
+        dt = _parse_fixed_iso(s)
         if dt is None:
-            # Try date-only form
-            try:
-                d = date.fromisoformat(s)
-                dt = datetime(d.year, d.month, d.day)
-            except ValueError:
-                return None
+            dt = self._parse_iso_general(s)
+        if dt is None:
+            return None
         if dt.tzinfo is None:
             tz = self._resolve_tz(column.tz if column else "", "")
             aware = dt.replace(tzinfo=tz, fold=0)
@@ -397,6 +738,24 @@ class Evaluator:
         except (OSError, OverflowError, ValueError):
             return None
 
+    @staticmethod
+    def _parse_iso_general(s: str) -> Optional[datetime]:
+        s_fix = s.replace("Z", "+00:00", 1) if s.endswith("Z") else s
+        try:
+            return datetime.fromisoformat(s_fix)
+        except ValueError:
+            if " " in s_fix:
+                try:
+                    return datetime.fromisoformat(s_fix.replace(" ", "T", 1))
+                except ValueError:
+                    pass
+        # Try date-only form
+        try:
+            d = date.fromisoformat(s)
+        except ValueError:
+            return None
+        return datetime(d.year, d.month, d.day)
+
     def _resolve_record_value_as_ms(
         self, value: Any, column: Optional[Column] = None
     ) -> Optional[int]:
@@ -462,16 +821,25 @@ class Evaluator:
             return _pack_date(value.year, value.month, value.day)
         if isinstance(value, date):
             return _pack_date(value.year, value.month, value.day)
-        if isinstance(value, (int, float)):
-            ms = self._resolve_record_value_as_ms(value, column)
-            if ms is None:
-                return None
-            tz = self._resolve_tz(column.tz if column else "", "")
+        if isinstance(value, (int, float, str)):
+            key = (value, column.tz if column else "", column.unit if column else "")
+            cached = self._date_memo.get(key, _MISSING)
+            if cached is not _MISSING:
+                return cached  # type: ignore[return-value]
+            packed = self._scalar_as_date(value, column)
+            _memo_put(self._date_memo, key, packed)
+            return packed
+        to_py = getattr(value, "to_pydatetime", None)
+        if callable(to_py):
             try:
-                dt = datetime.fromtimestamp(ms / 1000, tz)
-            except (OSError, OverflowError, ValueError):
+                return self._resolve_record_value_as_date(to_py(), column)
+            except Exception:
                 return None
-            return _pack_date(dt.year, dt.month, dt.day)
+        return None
+
+    def _scalar_as_date(
+        self, value: Union[int, float, str], column: Optional[Column]
+    ) -> Optional[int]:
         if isinstance(value, str):
             # Try date-only form first (YYYY-MM-DD) so a pure date literal
             # round-trips exactly without going through a tz conversion.
@@ -482,21 +850,16 @@ class Evaluator:
                 except ValueError:
                     pass
             ms = self._parse_iso_string_to_ms(value, column)
-            if ms is None:
-                return None
-            tz = self._resolve_tz(column.tz if column else "", "")
-            try:
-                dt = datetime.fromtimestamp(ms / 1000, tz)
-            except (OSError, OverflowError, ValueError):
-                return None
-            return _pack_date(dt.year, dt.month, dt.day)
-        to_py = getattr(value, "to_pydatetime", None)
-        if callable(to_py):
-            try:
-                return self._resolve_record_value_as_date(to_py(), column)
-            except Exception:
-                return None
-        return None
+        else:
+            ms = self._resolve_record_value_as_ms(value, column)
+        if ms is None:
+            return None
+        tz = self._resolve_tz(column.tz if column else "", "")
+        try:
+            dt = datetime.fromtimestamp(ms / 1000, tz)
+        except (OSError, OverflowError, ValueError):
+            return None
+        return _pack_date(dt.year, dt.month, dt.day)
 
     def _coerce_literal_to_ms(
         self,
@@ -561,7 +924,7 @@ class Evaluator:
         warnings.warn(msg, UserWarning, stacklevel=3)
         logging.getLogger("flyql").warning(msg)
 
-    def evaluate(
+    def evaluate(  # pylint: disable=method-hidden
         self,
         root: Node,
         record: Record,
@@ -570,33 +933,65 @@ class Evaluator:
 
         if root.expression:
             result = self._eval_expression(root.expression, record)
+        elif root.left is not None and root.right is not None:
+            if root.bool_operator not in _CHAIN_OPERATORS:
+                raise FlyqlError(f"Unknown boolean operator: {root.bool_operator}")
+            if self._reorder is not None:
+                result = self._evaluate_chain(root, record)
+            else:
+                result = self._evaluate_spine(root, record)
+        elif root.left is not None:
+            result = self.evaluate(root.left, record)
+        elif root.right is not None:
+            result = self.evaluate(root.right, record)
         else:
-            left: Optional[bool] = None
-            right: Optional[bool] = None
+            raise ValueError("it should never happen")
 
-            if root.left is not None:
-                left = self.evaluate(root.left, record)
+        if getattr(root, "negated", False):
+            result = not result
 
-            if root.right is not None:
-                right = self.evaluate(root.right, record)
+        return result
 
-            if left is not None and right is not None:
-                if root.bool_operator == BoolOperator.AND.value:
-                    result = left and right
-                elif root.bool_operator == BoolOperator.OR.value:
-                    result = left or right
-                else:
-                    raise FlyqlError(f"Unknown boolean operator: {root.bool_operator}")
-            elif left is not None:
-                result = left
-            elif right is not None:
-                result = right
-            else:
-                raise ValueError("it should never happen")
+    def _evaluate_profiled(self, root: Node, record: Record) -> bool:
+        assert self.profile is not None
+        start = time.perf_counter_ns()
+        result = Evaluator.evaluate(self, root, record)
+        self.profile.observe(root, result, time.perf_counter_ns() - start)
+        return result
 
-        if getattr(root, "negated", False):
-            result = not result
+    def _evaluate_spine(self, root: Node, record: Record) -> bool:
+        """Evaluate an AND/OR chain left to right by looping over its left
+        spine (see :func:`~flyql.core.tree.chain_spine`), so a chain of any
+        length costs no recursion. With a profile, the chain's inner nodes
+        are observed as if they had been evaluated recursively."""
+        is_and = root.bool_operator == BoolOperator.AND.value
+        bottom, links = chain_spine(root)
+        profile = self.profile
+        start = time.perf_counter_ns() if profile is not None else 0
+        result = self.evaluate(bottom, record)
+        for link in links:
+            if result is is_and:
+                assert link.right is not None
+                result = self.evaluate(link.right, record)
+            elif profile is None:
+                break
+            if profile is not None and link is not root:
+                profile.observe(link, result, time.perf_counter_ns() - start)
+        return result
 
+    def _evaluate_chain(self, root: Node, record: Record) -> bool:
+        """Evaluate a flattened AND/OR chain in its (re)ordered form,
+        stopping at the first operand that decides the result."""
+        chain = self._chain_for_node(root)
+        result = chain.is_and
+        for i, operand in enumerate(chain.operands):
+            value = self.evaluate(operand, record)
+            decided = value is not chain.is_and
+            chain.observe(i, decided)
+            if decided:
+                result = value
+                break
+        chain.tick()
         return result
 
     def _get_regex(
@@ -605,15 +1000,25 @@ class Evaluator:
     ) -> Any:
         if not _HAVE_RE2:
             raise FlyqlError(MATCHER_MESSAGES[ERR_RE2_MISSING])
-        regex = self.cache.get(value)
-        if regex is None:
-            try:
-                regex = re2.compile(value)
-            except Exception as err:
-                raise FlyqlError(f"invalid regex given: {value} -> {err}") from err
-            else:
-                self.cache[value] = regex
-        return regex
+        return self.cache.compile(value)
+
+    def _like_regex(self, pattern: str, insensitive: bool) -> Any:
+        source = _like_to_regex(pattern)
+        return self._get_regex("(?i)" + source if insensitive else source)
+
+    def _get_like(self, pattern: str, insensitive: bool) -> LikeMatcher:
+        key = (pattern, insensitive)
+        with self._like_lock:
+            like = self._like_cache.get(key)
+            if like is not None:
+                self._like_cache.move_to_end(key)
+                return like
+        like = LikeMatcher(pattern, insensitive, self._like_regex)
+        with self._like_lock:
+            self._like_cache[key] = like
+            if len(self._like_cache) > _LIKE_CACHE_SIZE:
+                self._like_cache.popitem(last=False)
+        return like
 
     def _eval_expression(
         self,
@@ -642,15 +1047,11 @@ class Evaluator:
                 f"unbound parameter(s) in function {expression.value.name}() — call bind_params() before evaluating"
             )
 
-        key = Key(expression.key.raw)
-        value = record.get_value(key)
+        plan = self._plan_for_expression(expression)
+        value = record.get_value(plan.key)
 
-        if expression.key.transformers:
-            for t_dict in expression.key.transformers:
-                transformer = self._registry.get(t_dict.name)
-                if transformer is None:
-                    raise FlyqlError(f"unknown transformer: {t_dict.name}")
-                value = transformer.apply(value, t_dict.arguments)
+        if plan.transform is not None:
+            value = plan.transform(value)
 
         # Handle truthy operator (standalone key check)
         if expression.operator == Operator.TRUTHY.value:
@@ -658,16 +1059,12 @@ class Evaluator:
 
         # Resolve COLUMN-typed RHS values from the record
         expr_value = expression.value
-        if expression.value_type == LiteralKind.COLUMN and isinstance(expr_value, str):
-            try:
-                rhs_key = Key(expr_value)
-            except Exception:
-                rhs_key = None
-            if rhs_key is not None and rhs_key.value in record.data:
-                expr_value = record.get_value(rhs_key)
+        rhs_key = plan.rhs_key
+        if rhs_key is not None and rhs_key.value in record.data:
+            expr_value = record.get_value(rhs_key)
 
         # Determine temporal context (schema-driven + Python-only schemaless fallback)
-        col = self._resolve_column_for_expression(expression)
+        col = plan.column
         is_date_col = col is not None and col.type == Type.Date
         is_datetime_col = col is not None and col.type == Type.DateTime
         if col is None:
@@ -725,21 +1122,10 @@ class Evaluator:
         if expression.operator in REGEX_OPERATORS:
             regex = self._get_regex(str(expr_value))
 
-        if expression.operator == Operator.EQUALS.value:
-            if isinstance(expr_value, bool) or expr_value is None:
-                return value is expr_value
-            if isinstance(value, bool) != isinstance(expr_value, bool):
-                return False
-            return bool(value == expr_value)
-        elif expression.operator == Operator.NOT_EQUALS.value:
-            if isinstance(expr_value, bool) or expr_value is None:
-                return value is not expr_value
-            if value is None:
-                return False
-            if isinstance(value, bool) != isinstance(expr_value, bool):
-                return True
-            return bool(value != expr_value)
-        elif expression.operator == Operator.REGEX.value:
+        simple = _SIMPLE_TESTS.get(expression.operator)
+        if simple is not None:
+            return simple(value, expr_value)
+        if expression.operator == Operator.REGEX.value:
             if regex is None:
                 return False
             return bool(regex.search(str(value)))
@@ -750,69 +1136,41 @@ class Evaluator:
                 return True
             return not bool(regex.search(str(value)))
         elif expression.operator == Operator.LIKE.value:
-            like_regex = _like_to_regex(str(expr_value))
-            regex = self._get_regex(like_regex)
-            return bool(regex.search(str(value)))
+            return self._get_like(str(expr_value), False)(str(value))
         elif expression.operator == Operator.NOT_LIKE.value:
             if value is None:
                 return False
-            like_regex = _like_to_regex(str(expr_value))
-            regex = self._get_regex(like_regex)
-            return not bool(regex.search(str(value)))
+            return not self._get_like(str(expr_value), False)(str(value))
         elif expression.operator == Operator.ILIKE.value:
-            like_regex = "(?i)" + _like_to_regex(str(expr_value))
-            regex = self._get_regex(like_regex)
-            return bool(regex.search(str(value)))
+            return self._get_like(str(expr_value), True)(str(value))
         elif expression.operator == Operator.NOT_ILIKE.value:
             if value is None:
                 return False
-            like_regex = "(?i)" + _like_to_regex(str(expr_value))
-            regex = self._get_regex(like_regex)
-            return not bool(regex.search(str(value)))
-        elif expression.operator == Operator.GREATER_THAN.value:
-            try:
-                return bool(value > expr_value)
-            except TypeError:
-                return False
-        elif expression.operator == Operator.LOWER_THAN.value:
-            try:
-                return bool(value < expr_value)
-            except TypeError:
-                return False
-        elif expression.operator == Operator.GREATER_OR_EQUALS_THAN.value:
-            try:
-                return bool(value >= expr_value)
-            except TypeError:
-                return False
-        elif expression.operator == Operator.LOWER_OR_EQUALS_THAN.value:
-            try:
-                return bool(value <= expr_value)
-            except TypeError:
-                return False
+            return not self._get_like(str(expr_value), True)(str(value))
         elif expression.operator == Operator.IN.value:
             if not expression.values:
                 return False
-            resolved_values = self._resolve_in_values(
-                expression, record, col, is_date_col, is_datetime_col
+            value_set = self._in_value_set(
+                expression, record, col, is_date_col, is_datetime_col, plan
             )
             if temporal:
                 value = self._coerce_value_for_temporal(value, col, is_date_col)
                 if value is None:
                     return False
-            return self._value_in_list(value, resolved_values)
+            return value in value_set
         elif expression.operator == Operator.NOT_IN.value:
             if not expression.values:
                 return True
             if value is None:
                 return False
-            resolved_values = self._resolve_in_values(
-                expression, record, col, is_date_col, is_datetime_col
+            value_set = self._in_value_set(
+                expression, record, col, is_date_col, is_datetime_col, plan
             )
             if temporal:
                 value = self._coerce_value_for_temporal(value, col, is_date_col)
                 if value is None:
                     return False
-            return not self._value_in_list(value, resolved_values)
+            return value not in value_set
         elif expression.operator == Operator.HAS.value:
             return self._eval_has(value, expr_value)
         elif expression.operator == Operator.NOT_HAS.value:
@@ -831,11 +1189,29 @@ class Evaluator:
 
     @staticmethod
     def _strict_equal(a: Any, b: Any) -> bool:
-        if isinstance(a, bool) != isinstance(b, bool):
-            return False
-        if a is None or b is None:
-            return a is b
-        return bool(a == b)
+        return strict_equal(a, b)
+
+    def _in_value_set(
+        self,
+        expression: Expression,
+        record: Record,
+        column: Optional[Column],
+        is_date_col: bool,
+        is_datetime_col: bool,
+        plan: "_ExpressionPlan",
+    ) -> StrictValueSet:
+        """Hashed IN list; built once per variant for static lists."""
+        variant = (is_date_col, is_datetime_col)
+        value_set = plan.in_sets.get(variant)
+        if value_set is None:
+            value_set = StrictValueSet(
+                self._resolve_in_values(
+                    expression, record, column, is_date_col, is_datetime_col, plan
+                )
+            )
+            if plan.in_static:
+                plan.in_sets[variant] = value_set
+        return value_set
 
     def _resolve_in_values(
         self,
@@ -844,19 +1220,20 @@ class Evaluator:
         column: Optional[Column] = None,
         is_date_col: bool = False,
         is_datetime_col: bool = False,
+        plan: Optional["_ExpressionPlan"] = None,
     ) -> List[Any]:
         if not expression.values_types or not expression.values:
             return expression.values or []
+        if plan is None:
+            plan = self._plan_for_expression(expression)
+        in_keys = plan.in_keys
         resolved: List[Any] = []
         for i, v in enumerate(expression.values):
             vt = (
                 expression.values_types[i] if i < len(expression.values_types) else None
             )
             if vt == LiteralKind.COLUMN and isinstance(v, str):
-                try:
-                    rhs_key = Key(v)
-                except Exception:
-                    rhs_key = None
+                rhs_key = in_keys[i]
                 if rhs_key is not None and rhs_key.value in record.data:
                     resolved.append(record.get_value(rhs_key))
                 else:
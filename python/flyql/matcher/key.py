@@ -1,8 +1,31 @@
-from typing import List
+from typing import List, Optional, Sequence, Tuple
 from flyql.core.key import parse_key
 
+# One path step: the segment name (dict lookup) and its integer form
+# (list index), or None when the segment is not an integer.
+Step = Tuple[str, Optional[int]]
+
+
+def path_steps(path: Sequence[str]) -> Tuple[Step, ...]:
+    """Precompute the dict-key / list-index form of each path segment."""
+    steps: List[Step] = []
+    for segment in path:
+        try:
+            index: Optional[int] = int(segment)
+        except (ValueError, TypeError):
+            index = None
+        steps.append((segment, index))
+    return tuple(steps)
+
 
 class Key:
+    """Record accessor for a (possibly nested) key.
+
+    ``steps`` holds the path below ``value`` in pre-split form so that
+    :meth:`Record.get_value` does no parsing or int conversion per record.
+    Build once per expression and reuse across records.
+    """
+
     def __init__(
         self,
         value: str,
@@ -12,3 +35,13 @@ class Key:
         self.path: List[str] = (
             parsed_key.segments[1:] if len(parsed_key.segments) > 1 else []
         )
+        self.steps = path_steps(self.path)
+
+    @classmethod
+    def from_segments(cls, segments: Sequence[str]) -> "Key":
+        """Build a Key from already-parsed segments, skipping ``parse_key``."""
+        key = cls.__new__(cls)
+        key.value = segments[0] if segments else ""
+        key.path = list(segments[1:])
+        key.steps = path_steps(key.path)
+        return key
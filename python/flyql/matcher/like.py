@@ -0,0 +1,178 @@
+"""SQL LIKE / ILIKE matching without regex for the common pattern shapes.
+
+A pattern is parsed once into :class:`LikeMatcher`. Shapes built from
+literals and ``%`` (``'abc'``, ``'abc%'``, ``'%abc'``, ``'%abc%'``,
+``'a%b%c'``) and ``_``-only patterns (``'a_c'``) are lowered to
+``str`` operations — ``==``, ``startswith``, ``endswith``, ``find`` and
+length checks — and need no regex engine. Anything else (``_`` mixed
+with ``%``, literal newlines) falls back to the anchored RE2 pattern.
+
+Semantics are identical to the RE2 translation: ``%`` and ``_`` do not
+match a newline, just like ``.`` in ``^...$``. ILIKE folds ASCII values
+with :meth:`str.casefold`; non-ASCII values go through RE2's ``(?i)``
+so Unicode case folding stays identical to Go and JavaScript.
+"""
+
+from typing import Any, Callable, List, Optional, Sequence
+
+# Compiles (pattern, insensitive) into an object with ``.search``.
+RegexFactory = Callable[[str, bool], Any]
+
+# One parsed piece between ``%`` wildcards; None marks a ``_`` wildcard.
+_Piece = List[Optional[str]]
+
+
+def _parse(pattern: str) -> List[_Piece]:
+    pieces: List[_Piece] = [[]]
+    i = 0
+    n = len(pattern)
+    while i < n:
+        ch = pattern[i]
+        if ch == "\\" and i + 1 < n:
+            pieces[-1].append(pattern[i + 1])
+            i += 2
+            continue
+        if ch == "%":
+            pieces.append([])
+        elif ch == "_":
+            pieces[-1].append(None)
+        else:
+            pieces[-1].append(ch)
+        i += 1
+    if len(pieces) > 2:
+        # '%%' and friends: empty middle pieces change nothing.
+        pieces = [pieces[0], *[p for p in pieces[1:-1] if p], pieces[-1]]
+    return pieces
+
+
+def _exact(literal: str) -> Callable[[str], bool]:
+    return lambda value: value == literal
+
+
+def _prefix(literal: str) -> Callable[[str], bool]:
+    n = len(literal)
+    return lambda value: value.startswith(literal) and value.find("\n", n) < 0
+
+
+def _suffix(literal: str) -> Callable[[str], bool]:
+    n = len(literal)
+    return lambda value: (
+        value.endswith(literal) and value.find("\n", 0, len(value) - n) < 0
+    )
+
+
+def _contains(literal: str) -> Callable[[str], bool]:
+    # The literal holds no newline, so the gaps around it are newline-free
+    # exactly when the whole value is.
+    return lambda value: literal in value and "\n" not in value
+
+
+def _segments(literals: Sequence[str]) -> Callable[[str], bool]:
+    first, middle, last = literals[0], literals[1:-1], literals[-1]
+    min_len = sum(len(s) for s in literals)
+
+    def match(value: str) -> bool:
+        if (
+            len(value) < min_len
+            or not value.startswith(first)
+            or not value.endswith(last)
+        ):
+            return False
+        pos = len(first)
+        end = len(value) - len(last)
+        # Leftmost placement is optimal: a later one only widens the gap
+        # before the piece, and no piece contains a newline.
+        for piece in middle:
+            i = value.find(piece, pos, end)
+            if i < 0 or value.find("\n", pos, i) >= 0:
+                return False
+            pos = i + len(piece)
+        return value.find("\n", pos, end) < 0
+
+    return match
+
+
+def _positional(piece: _Piece) -> Callable[[str], bool]:
+    n = len(piece)
+    fixed = [(i, ch) for i, ch in enumerate(piece) if ch is not None]
+    wild = [i for i, ch in enumerate(piece) if ch is None]
+
+    def match(value: str) -> bool:
+        if len(value) != n:
+            return False
+        for i, ch in fixed:
+            if value[i] != ch:
+                return False
+        for i in wild:
+            if value[i] == "\n":
+                return False
+        return True
+
+    return match
+
+
+class LikeMatcher:
+    """A LIKE/ILIKE pattern compiled once; call it with the record string.
+
+    ``regex_factory`` is only used for patterns (or ILIKE values) that
+    have no fast path; complex patterns are compiled eagerly so invalid
+    patterns and a missing ``[re2]`` extra surface at construction.
+    """
+
+    __slots__ = ("pattern", "insensitive", "_match", "_fold", "_regex", "_factory")
+
+    def __init__(
+        self, pattern: str, insensitive: bool, regex_factory: RegexFactory
+    ) -> None:
+        self.pattern = pattern
+        self.insensitive = insensitive
+        self._factory = regex_factory
+        self._regex: Any = None
+        self._fold = insensitive
+        match = self._lower(_parse(pattern))
+        if match is None:
+            self._fold = False
+            match = self._search
+            self._get_regex()
+        self._match: Callable[[str], bool] = match
+
+    def _lower(self, pieces: List[_Piece]) -> Optional[Callable[[str], bool]]:
+        if self.insensitive and not self.pattern.isascii():
+            return None
+        texts: List[str] = []
+        for piece in pieces:
+            if None in piece:
+                if len(pieces) != 1 or "\n" in piece:
+                    return None
+                if self.insensitive:
+                    piece = [ch if ch is None else ch.casefold() for ch in piece]
+                return _positional(piece)
+            text = "".join(ch for ch in piece if ch is not None)
+            if "\n" in text:
+                return None
+            texts.append(text.casefold() if self.insensitive else text)
+        if len(texts) == 1:
+            return _exact(texts[0])
+        if len(texts) == 2:
+            if not texts[1]:
+                return _prefix(texts[0])
+            if not texts[0]:
+                return _suffix(texts[1])
+        if len(texts) == 3 and not texts[0] and not texts[2]:
+            return _contains(texts[1])
+        return _segments(texts)
+
+    def _get_regex(self) -> Any:
+        if self._regex is None:
+            self._regex = self._factory(self.pattern, self.insensitive)
+        return self._regex
+
+    def _search(self, value: str) -> bool:
+        return bool(self._get_regex().search(value))
+
+    def __call__(self, value: str) -> bool:
+        if self._fold:
+            if not value.isascii():
+                return self._search(value)
+            value = value.casefold()
+        return self._match(value)
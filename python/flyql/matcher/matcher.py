@@ -8,19 +8,28 @@ Parity notes:
     override in the helper).
   - Python (this): uses ``re2`` when ``[re2]`` extra is installed; raises
     ``FlyqlError(ERR_RE2_MISSING)`` if the extra is absent AND the query
-    uses ``~`` or ``LIKE``/``ILIKE``.
+    uses ``~`` or a ``LIKE``/``ILIKE`` pattern without a fast path (see
+    :mod:`flyql.matcher.like`).
 
 Cross-language portability: patterns that use backreferences or lookahead
 work in JavaScript but raise in Python and Go. Stick to a conservative
 subset (anchors, character classes, quantifiers) for portable queries.
 
-For repeated matches against many records, instantiate ``Evaluator``
-directly so its regex cache is reused.
+For repeated matches against many records, use the batch helpers in
+:mod:`flyql.matcher.batch` (``filter``/``count``/``any``/``first_n``),
+which parse and compile the query once per batch.
+
+``data`` is any mapping, used as is; objects, dataclasses and namedtuples
+are read through the record adapters of :mod:`flyql.matcher.adapters`,
+and row tuples need ``adapter=tuple_adapter(fields)``. A list or tuple
+of key/value pairs is copied to a dict, as before the adapters. Strings,
+bytes, numbers and None are not records and raise ``FlyqlError``.
 """
 
-from typing import Any, Mapping, Optional
+from typing import Any, Optional
 
 from flyql.core.parser import parse
+from flyql.matcher.adapters import Adapter, adapt
 from flyql.matcher.evaluator import Evaluator
 from flyql.matcher.record import Record
 from flyql.transformers.registry import TransformerRegistry
@@ -28,10 +37,11 @@ from flyql.transformers.registry import TransformerRegistry
 
 def match(
     query: str,
-    data: Mapping[str, Any],
+    data: Any,
     registry: Optional[TransformerRegistry] = None,
     *,
     default_timezone: str = "UTC",
+    adapter: Optional[Adapter] = None,
 ) -> bool:
     from flyql.core.exceptions import FlyqlError
 
@@ -39,4 +49,16 @@ def match(
     if result.root is None:
         raise FlyqlError("empty query has no AST root")
     evaluator = Evaluator(registry=registry, default_timezone=default_timezone)
-    return evaluator.evaluate(result.root, Record(dict(data)))
+    if adapter is not None:
+        mapping = adapter(data)
+    else:
+        try:
+            mapping = adapt(data)
+        except FlyqlError as error:
+            if not isinstance(data, (list, tuple)):
+                raise
+            try:
+                mapping = dict(data)
+            except (TypeError, ValueError):
+                raise error from None
+    return evaluator.evaluate(result.root, Record(mapping))
@@ -0,0 +1,177 @@
+"""Cost model and operand ordering for matcher boolean evaluation.
+
+AND/OR are commutative over the matcher's side-effect-free predicates,
+so the operands of a same-operator chain can be evaluated in any order
+without changing the result. Evaluating the cheapest (or most decisive)
+operand first lets short-circuiting skip the expensive ones.
+
+Static costs follow the rough per-record price of each operator:
+equality/comparison < IN/has < LIKE < regex, with surcharges for nested
+paths (JSON-string columns in particular), transformer chains, temporal
+coercion and record-resolved column references.
+"""
+
+from typing import Dict, List, Optional
+
+from flyql.core.column import ColumnSchema
+from flyql.core.constants import BoolOperator, Operator
+from flyql.core.exceptions import FlyqlError
+from flyql.core.expression import Expression
+from flyql.core.tree import Node, iter_nodes
+from flyql.flyql_type import Type
+from flyql.literal import LiteralKind
+
+REORDER_COST = "cost"
+REORDER_SELECTIVITY = "selectivity"
+REORDER_MODES = (REORDER_COST, REORDER_SELECTIVITY)
+
+_OPERATOR_COST: Dict[str, int] = {
+    Operator.TRUTHY.value: 1,
+    Operator.EQUALS.value: 1,
+    Operator.NOT_EQUALS.value: 1,
+    Operator.GREATER_THAN.value: 1,
+    Operator.LOWER_THAN.value: 1,
+    Operator.GREATER_OR_EQUALS_THAN.value: 1,
+    Operator.LOWER_OR_EQUALS_THAN.value: 1,
+    Operator.IN.value: 2,
+    Operator.NOT_IN.value: 2,
+    Operator.HAS.value: 2,
+    Operator.NOT_HAS.value: 2,
+    Operator.LIKE.value: 4,
+    Operator.NOT_LIKE.value: 4,
+    Operator.ILIKE.value: 4,
+    Operator.NOT_ILIKE.value: 4,
+    Operator.REGEX.value: 8,
+    Operator.NOT_REGEX.value: 8,
+}
+
+_NESTED_PATH_COST = 2
+_JSONSTRING_PATH_COST = 16
+_TRANSFORMER_COST = 2
+_TEMPORAL_COST = 4
+_COLUMN_REF_COST = 1
+
+
+def check_reorder_mode(reorder: Optional[str]) -> None:
+    if reorder is not None and reorder not in REORDER_MODES:
+        raise FlyqlError(
+            f"invalid reorder mode: {reorder!r} — expected one of {REORDER_MODES}"
+        )
+
+
+def expression_cost(
+    expression: Expression, columns: Optional[ColumnSchema] = None
+) -> int:
+    """Estimate the relative per-record cost of evaluating ``expression``."""
+    cost = _OPERATOR_COST.get(expression.operator, 1)
+    segments = expression.key.segments
+    if len(segments) > 1:
+        cost += _NESTED_PATH_COST
+        if columns is not None:
+            root_col = columns.get(segments[0])
+            if root_col is not None and root_col.type == Type.JSONString:
+                cost += _JSONSTRING_PATH_COST
+    cost += _TRANSFORMER_COST * len(expression.key.transformers)
+    if expression.value_type == LiteralKind.FUNCTION:
+        cost += _TEMPORAL_COST
+    elif columns is not None and segments:
+        col = columns.resolve(list(segments))
+        if col is not None and col.type in (Type.Date, Type.DateTime):
+            cost += _TEMPORAL_COST
+    if expression.value_type == LiteralKind.COLUMN:
+        cost += _COLUMN_REF_COST
+    if expression.values_types and LiteralKind.COLUMN in expression.values_types:
+        cost += _COLUMN_REF_COST
+    return cost
+
+
+def node_cost(node: Node, columns: Optional[ColumnSchema] = None) -> int:
+    """Worst-case cost of a subtree: every leaf evaluated once."""
+    return sum(
+        expression_cost(current.expression, columns)
+        for current in iter_nodes(node)
+        if current.expression is not None
+    )
+
+
+def chain_operands(node: Node) -> List[Node]:
+    """Flatten the same-operator chain headed by ``node`` into its operands.
+
+    ``node`` itself is the chain head (its own negation applies to the
+    combined result). Below it, non-negated nodes with the same
+    ``bool_operator`` and single-child wrapper nodes are transparent;
+    anything else — a leaf, a negated group, a group of the other
+    operator — is one operand.
+    """
+    operands: List[Node] = []
+    stack = [child for child in (node.right, node.left) if child is not None]
+    while stack:
+        current = stack.pop()
+        children = _transparent_children(current, node.bool_operator)
+        if children is None:
+            operands.append(current)
+        else:
+            stack.extend(reversed(children))
+    return operands
+
+
+def _transparent_children(node: Node, bool_operator: str) -> Optional[List[Node]]:
+    if node.expression is not None or node.negated:
+        return None
+    if node.left is not None and node.right is not None:
+        if node.bool_operator != bool_operator:
+            return None
+        return [node.left, node.right]
+    only = node.left if node.left is not None else node.right
+    return [only] if only is not None else None
+
+
+class OperandChain:
+    """Operands of one AND/OR chain in evaluation order.
+
+    Starts in static cost order. With ``adaptive=True`` the chain also
+    counts how often each operand decides the result (``False`` for AND,
+    ``True`` for OR) and periodically re-sorts by expected cost
+    ``cost / P(decides)``, so cheap-and-decisive operands run first.
+    """
+
+    RESORT_INTERVAL = 1024
+
+    __slots__ = ("is_and", "operands", "_costs", "_evals", "_decisive", "_countdown")
+
+    def __init__(
+        self, node: Node, columns: Optional[ColumnSchema] = None, adaptive: bool = False
+    ) -> None:
+        operands = chain_operands(node)
+        costs = [node_cost(o, columns) for o in operands]
+        order = sorted(range(len(operands)), key=lambda i: costs[i])
+        self.is_and = node.bool_operator == BoolOperator.AND.value
+        self.operands = [operands[i] for i in order]
+        self._costs = [costs[i] for i in order]
+        self._evals = [0] * len(operands)
+        self._decisive = [0] * len(operands)
+        self._countdown = self.RESORT_INTERVAL if adaptive else -1
+
+    def observe(self, index: int, decided: bool) -> None:
+        self._evals[index] += 1
+        if decided:
+            self._decisive[index] += 1
+
+    def tick(self) -> None:
+        if self._countdown < 0:
+            return
+        self._countdown -= 1
+        if self._countdown == 0:
+            self._countdown = self.RESORT_INTERVAL
+            self._resort()
+
+    def _resort(self) -> None:
+        def expected_cost(i: int) -> float:
+            p_decides = (self._decisive[i] + 1) / (self._evals[i] + 2)
+            return self._costs[i] / p_decides
+
+        order = sorted(range(len(self.operands)), key=expected_cost)
+        self.operands = [self.operands[i] for i in order]
+        self._costs = [self._costs[i] for i in order]
+        self._evals = [self._evals[i] for i in order]
+        self._decisive = [self._decisive[i] for i in order]
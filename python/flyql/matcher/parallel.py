@@ -0,0 +1,160 @@
+"""Parallel matching: filter large record sets in a pool of processes.
+
+The matcher is pure Python, so one process matches on one core.
+:func:`filter` spreads the work over worker processes:
+
+    from flyql.matcher import parallel
+
+    for row in parallel.filter("SeverityText = 'ERROR'", rows, workers=8):
+        ...
+
+The query is compiled and pickled once (a :class:`CompiledQuery` pickles
+as its AST and options) and handed to each worker when it starts; after
+that only record chunks travel to the workers and only the indexes of the
+matching records come back. The items yielded are the caller's own
+objects, exactly as for :func:`flyql.matcher.batch.filter`.
+
+- ``ordered=True`` (default) yields matches in input order; with
+  ``ordered=False`` chunks are yielded as soon as they finish.
+- Backpressure: at most ``max_pending`` chunks (default ``2 * workers``)
+  are in flight; ``records`` is only read when a slot frees up, and a
+  consumer that stops iterating stops the reading.
+- Unless ``chunk_size`` is given, the chunk size is tuned from measured
+  worker time so each chunk takes about ``_TARGET_CHUNK_SECONDS``, big
+  enough to amortize the inter-process round trip.
+
+Records must pickle (:class:`Record` objects send their ``data``); objects
+and namedtuples are read through the default record adapters (see
+:mod:`flyql.matcher.adapters`). As in the batch helpers, ``now()``/``ago()``/
+``today()``/``startOf()`` are resolved once per call, in the calling
+process, so every worker uses the same thresholds.
+"""
+
+import itertools
+import os
+import pickle
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from flyql.core.column import ColumnSchema
+from flyql.core.exceptions import FlyqlError
+from flyql.matcher.batch import QueryLike, RecordLike, _pinned, _tester
+from flyql.matcher.compiler import CompiledQuery
+from flyql.matcher.record import Record
+from flyql.transformers.registry import TransformerRegistry
+
+_INITIAL_CHUNK_SIZE = 256
+_MIN_CHUNK_SIZE = 16
+_MAX_CHUNK_SIZE = 65536
+_TARGET_CHUNK_SECONDS = 0.05
+
+# The query of the current worker process, set by _init_worker.
+_WORKER: Dict[str, CompiledQuery] = {}
+
+_Chunk = List[RecordLike]
+_ChunkResult = Tuple[List[int], float]
+
+
+def _init_worker(payload: bytes) -> None:
+    _WORKER["query"] = pickle.loads(payload)
+
+
+def _match_chunk(chunk: List[Any]) -> _ChunkResult:
+    """Worker side: indexes of the matching records and the time taken."""
+    start = time.perf_counter()
+    test = _tester(_WORKER["query"])
+    matched = [index for index, item in enumerate(chunk) if test(item)]
+    return matched, time.perf_counter() - start
+
+
+def _tuned_chunk_size(size: int, elapsed: float) -> int:
+    """Chunk size expected to take ``_TARGET_CHUNK_SECONDS`` given that
+    ``size`` records took ``elapsed``; moves at most 2x per step."""
+    if elapsed <= 0:
+        ideal = size * 2
+    else:
+        ideal = int(size * _TARGET_CHUNK_SECONDS / elapsed)
+    ideal = max(size // 2, min(size * 2, ideal))
+    return max(_MIN_CHUNK_SIZE, min(_MAX_CHUNK_SIZE, ideal))
+
+
+def _payload(item: RecordLike) -> Any:
+    return item.data if isinstance(item, Record) else item
+
+
+def filter(  # pylint: disable=redefined-builtin
+    query: QueryLike,
+    records: Iterable[RecordLike],
+    *,
+    workers: Optional[int] = None,
+    ordered: bool = True,
+    chunk_size: Optional[int] = None,
+    max_pending: Optional[int] = None,
+    columns: Optional[ColumnSchema] = None,
+    registry: Optional[TransformerRegistry] = None,
+    default_timezone: str = "UTC",
+    now: Optional[datetime] = None,
+) -> Iterator[RecordLike]:
+    """Lazily yield the items of ``records`` that match ``query``, matched
+    in ``workers`` processes (default: the CPU count).
+
+    ``columns``/``registry``/``default_timezone``/``now`` are as for
+    :func:`flyql.matcher.batch.filter`. Query errors, and options that do
+    not pickle, are raised here; worker processes start on first
+    iteration and stop when the iterator is exhausted or closed.
+    """
+    workers = workers if workers is not None else os.cpu_count() or 1
+    if workers < 1:
+        raise FlyqlError("workers must be positive")
+    if chunk_size is not None and chunk_size < 1:
+        raise FlyqlError("chunk_size must be positive")
+    if max_pending is None:
+        max_pending = 2 * workers
+    elif max_pending < 1:
+        raise FlyqlError("max_pending must be positive")
+    compiled = _pinned(query, columns, registry, default_timezone, now)
+    payload = pickle.dumps(compiled)
+    return _run(payload, iter(records), workers, ordered, chunk_size, max_pending)
+
+
+def _run(
+    payload: bytes,
+    records: Iterator[RecordLike],
+    workers: int,
+    ordered: bool,
+    chunk_size: Optional[int],
+    max_pending: int,
+) -> Iterator[RecordLike]:
+    size = chunk_size or _INITIAL_CHUNK_SIZE
+    pool = ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(payload,)
+    )
+    # Insertion order is submission order, which ordered mode follows.
+    pending: Dict["Future[_ChunkResult]", _Chunk] = {}
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                chunk = list(itertools.islice(records, size))
+                if not chunk:
+                    exhausted = True
+                    break
+                future = pool.submit(_match_chunk, [_payload(item) for item in chunk])
+                pending[future] = chunk
+            if not pending:
+                return
+            if ordered:
+                future = list(pending)[0]
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = done.pop()
+            chunk = pending.pop(future)
+            matched, elapsed = future.result()
+            if chunk_size is None:
+                size = _tuned_chunk_size(len(chunk), elapsed)
+            for index in matched:
+                yield chunk[index]
+    finally:
+        pool.shutdown(cancel_futures=True)
@@ -0,0 +1,151 @@
+"""Per-node evaluation profiling for :class:`~flyql.matcher.Evaluator`.
+
+Pass a :class:`Profile` to the evaluator and every AST node it evaluates
+is counted — evaluations, true/false results and cumulative time (the
+node's subtree included):
+
+    profile = Profile()
+    evaluator = Evaluator(profile=profile)
+    for row in rows:
+        evaluator.evaluate(root, Record(row))
+    report = profile.to_dict(root, text=query)
+
+:meth:`Profile.tree` and :meth:`Profile.to_dict` return the query tree
+annotated with each node's stats and source :class:`Range`, so the
+numbers can be drawn over the query text. Nodes skipped by
+short-circuiting show how often they ran; a leaf that is never decisive,
+or whose true ratio is always 0 or 1, is a candidate for removal or
+reordering (``Evaluator(reorder="selectivity")`` applies the same idea
+online).
+
+Without a profile the evaluator runs its plain, uninstrumented code path.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from flyql.core.range import Range
+from flyql.core.tree import Node
+
+
+@dataclass
+class NodeStats:
+    evaluations: int = 0
+    true_count: int = 0
+    time_ns: int = 0
+
+    @property
+    def false_count(self) -> int:
+        return self.evaluations - self.true_count
+
+    @property
+    def true_ratio(self) -> Optional[float]:
+        """Fraction of evaluations that were true; None if never evaluated."""
+        if not self.evaluations:
+            return None
+        return self.true_count / self.evaluations
+
+
+@dataclass
+class ProfiledNode:
+    """One node of a profiled query tree."""
+
+    node: Node
+    stats: NodeStats
+    children: List["ProfiledNode"] = field(default_factory=list)
+
+    @property
+    def range(self) -> Range:
+        return self.node.range
+
+    @property
+    def kind(self) -> str:
+        if self.node.expression is not None:
+            return "expression"
+        if self.node.left is not None and self.node.right is not None:
+            return self.node.bool_operator
+        return "group"
+
+    def to_dict(self, text: Optional[str] = None) -> Dict[str, Any]:
+        top = _node_dict(self, text)
+        stack = [(self, top)]
+        while stack:
+            current, out = stack.pop()
+            if current.children:
+                out["children"] = []
+                for child in current.children:
+                    child_out = _node_dict(child, text)
+                    out["children"].append(child_out)
+                    stack.append((child, child_out))
+        return top
+
+
+def _node_dict(profiled: ProfiledNode, text: Optional[str]) -> Dict[str, Any]:
+    """:meth:`ProfiledNode.to_dict` of one node, without its children."""
+    out: Dict[str, Any] = {
+        "kind": profiled.kind,
+        "range": [profiled.range.start, profiled.range.end],
+    }
+    if text is not None:
+        out["text"] = text[profiled.range.start : profiled.range.end]
+    node = profiled.node
+    if node.expression is not None:
+        out["expression"] = str(node.expression)
+    out.update(
+        negated=node.negated,
+        evaluations=profiled.stats.evaluations,
+        true=profiled.stats.true_count,
+        false=profiled.stats.false_count,
+        time_ns=profiled.stats.time_ns,
+    )
+    return out
+
+
+class Profile:
+    """Stats per evaluated AST node, keyed by node identity.
+
+    @threadsafe: no — one Profile per Evaluator (or per thread).
+    """
+
+    def __init__(self) -> None:
+        # The node is kept alongside its stats so its id() stays unique.
+        self._stats: Dict[int, Tuple[Node, NodeStats]] = {}
+
+    def observe(self, node: Node, result: bool, elapsed_ns: int) -> None:
+        entry = self._stats.get(id(node))
+        if entry is None:
+            entry = self._stats[id(node)] = (node, NodeStats())
+        stats = entry[1]
+        stats.evaluations += 1
+        if result:
+            stats.true_count += 1
+        stats.time_ns += elapsed_ns
+
+    def stats(self, node: Node) -> NodeStats:
+        """Stats of ``node`` (all zero if it was never evaluated)."""
+        entry = self._stats.get(id(node))
+        return entry[1] if entry is not None else NodeStats()
+
+    def reset(self) -> None:
+        self._stats.clear()
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    def tree(self, root: Node) -> ProfiledNode:
+        """``root``'s tree with the stats of every node."""
+        top = ProfiledNode(root, self.stats(root))
+        stack = [top]
+        while stack:
+            current = stack.pop()
+            for child in (current.node.left, current.node.right):
+                if child is not None:
+                    profiled = ProfiledNode(child, self.stats(child))
+                    current.children.append(profiled)
+                    stack.append(profiled)
+        return top
+
+    def to_dict(self, root: Node, text: Optional[str] = None) -> Dict[str, Any]:
+        """:meth:`tree` as plain data; with the query ``text`` each node
+        also carries the source slice its range covers."""
+        return self.tree(root).to_dict(text)
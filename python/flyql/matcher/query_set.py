@@ -0,0 +1,387 @@
+"""Match one record against many queries at once.
+
+:class:`QuerySet` holds any number of queries (alert rules, tenant
+subscriptions, ...) under caller-chosen ids and returns the ids of the
+queries a record matches:
+
+    from flyql.matcher import QuerySet
+
+    rules = QuerySet()
+    rules.add("api-errors", "service = 'api' and status >= 500")
+    rules.add("db-slow", "service in ['db', 'cache'] and latency > 250")
+    rules.add("any-panic", "message ~ 'panic'")
+    rules.match({"service": "api", "status": 503})  # ["api-errors"]
+
+Queries that must satisfy a top-level ``key = literal`` or ``key in
+[...]`` condition are indexed by that key and value, so a record is only
+checked against the queries whose condition it meets, plus the queries
+that have no such condition. Identical leaf expressions are evaluated at
+most once per record, however many queries contain them. Results are
+identical to evaluating each query with :class:`Evaluator`.
+"""
+
+# Leaves are compiled by the row compiler, so results stay identical; like
+# columnar.py this is a friend module of evaluator.py and compiler.py.
+# pylint: disable=protected-access
+
+import math
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from flyql.core.column import ColumnSchema
+from flyql.core.constants import BoolOperator, Operator
+from flyql.core.exceptions import FlyqlError
+from flyql.core.expression import Expression, FunctionCall
+from flyql.core.parser import parse
+from flyql.core.tree import Node, spine_operands
+from flyql.flyql_type import Type
+from flyql.literal import LiteralKind
+from flyql.matcher.adapters import Adapter, adapt
+from flyql.matcher.compiler import Predicate, _check_bound, _Compiler
+from flyql.matcher.evaluator import Evaluator, _function_key
+from flyql.matcher.key import Key
+from flyql.matcher.record import Record
+from flyql.transformers.registry import TransformerRegistry
+
+# Per-record leaf results, keyed by leaf slot.
+_Results = Dict[int, bool]
+_QueryFn = Callable[[Record, _Results], bool]
+
+# Literal kinds whose ``=`` is plain strict equality (no temporal coercion
+# on non-temporal columns, no record-dependent right-hand side).
+_INDEXABLE_KINDS = {
+    LiteralKind.STRING,
+    LiteralKind.INTEGER,
+    LiteralKind.FLOAT,
+    LiteralKind.BIGINT,
+    LiteralKind.BOOLEAN,
+    LiteralKind.NULL,
+}
+
+# Record values looked up in the index. Anything else (datetimes, which
+# switch on temporal coercion, containers, subclasses with their own
+# __eq__) makes every query indexed under that key a candidate.
+_LOOKUP_TYPES = (str, int, float, bool, type(None))
+
+
+def _index_key(value: Any) -> Tuple[bool, Any]:
+    # Strict equality keeps bools apart from the ints they hash like.
+    return (isinstance(value, bool), value)
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, FunctionCall):
+        return ("function", _function_key(value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return (type(value).__name__, value)
+
+
+def _leaf_key(expression: Expression) -> Hashable:
+    """Structural identity of a leaf: equal keys evaluate identically."""
+    key = expression.key
+    return (
+        key.raw,
+        tuple(key.segments),
+        tuple((t.name, _freeze(t.arguments)) for t in key.transformers),
+        expression.operator,
+        expression.value_type,
+        _freeze(expression.value),
+        _freeze(expression.values or []),
+        tuple(expression.values_types or []),
+    )
+
+
+class _Guard:
+    """A leaf every match of its query satisfies: ``key = v`` or ``key in [...]``."""
+
+    __slots__ = ("expression", "path", "values")
+
+    def __init__(self, expression: Expression, values: List[Any]) -> None:
+        self.expression = expression
+        self.path = tuple(expression.key.segments)
+        self.values = values
+
+
+class _Query:
+    __slots__ = ("seq", "root", "fn", "slots", "guard")
+
+    def __init__(
+        self,
+        seq: int,
+        root: Node,
+        fn: _QueryFn,
+        slots: List[int],
+        guard: Optional[Tuple[Tuple[str, ...], int]],
+    ) -> None:
+        self.seq = seq
+        self.root = root
+        self.fn = fn
+        self.slots = slots
+        self.guard = guard
+
+
+class _KeyIndex:
+    """Queries guarded on one key: value → {query id: guard slot}."""
+
+    __slots__ = ("key", "buckets", "queries")
+
+    def __init__(self, path: Tuple[str, ...]) -> None:
+        self.key = Key.from_segments(path)
+        self.buckets: Dict[Tuple[bool, Any], Dict[Hashable, int]] = {}
+        self.queries: Dict[Hashable, int] = {}
+
+
+class QuerySet:
+    """Many queries indexed together; see the module docstring.
+
+    ``columns``/``registry``/``default_timezone`` apply to every query, as
+    for :func:`compile`; ``adapter`` maps records that are not mappings
+    (see :mod:`flyql.matcher.adapters`). Query errors (syntax, unbound parameters, invalid
+    regex) are raised by :meth:`add`.
+
+    @threadsafe: :meth:`match` may run concurrently from several threads;
+    :meth:`add` and :meth:`remove` must not run concurrently with anything.
+    """
+
+    def __init__(
+        self,
+        *,
+        columns: Optional[ColumnSchema] = None,
+        registry: Optional[TransformerRegistry] = None,
+        default_timezone: str = "UTC",
+        adapter: Optional[Adapter] = None,
+    ) -> None:
+        self._adapter = adapter or adapt
+        self._evaluator = Evaluator(
+            registry=registry, default_timezone=default_timezone, columns=columns
+        )
+        self._compiler = _Compiler(self._evaluator, columns)
+        self._queries: Dict[Hashable, _Query] = {}
+        self._unindexed: Dict[Hashable, _Query] = {}
+        self._index: Dict[Tuple[str, ...], _KeyIndex] = {}
+        self._leaf_slots: Dict[Hashable, int] = {}
+        self._leaf_preds: Dict[int, Predicate] = {}
+        self._leaf_refs: Dict[int, int] = {}
+        self._leaf_keys: Dict[int, Hashable] = {}
+        self._next_slot = 0
+        self._next_seq = 0
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def __contains__(self, query_id: object) -> bool:
+        return query_id in self._queries
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._queries)
+
+    def add(self, query_id: Hashable, query: Union[str, Node]) -> None:
+        """Add ``query`` (a query string or parsed AST root) under ``query_id``,
+        replacing any query already registered under that id."""
+        if isinstance(query, str):
+            root = parse(query).root
+            if root is None:
+                raise FlyqlError("empty query has no AST root")
+        else:
+            root = query
+        slots: List[int] = []
+        try:
+            fn = self._node(root, slots)
+        except Exception:
+            self._release(slots)
+            raise
+        if query_id in self._queries:
+            self.remove(query_id)
+        guard = _find_guard(root, self._evaluator)
+        if guard is None:
+            entry = _Query(self._next_seq, root, fn, slots, None)
+            self._unindexed[query_id] = entry
+        else:
+            # The guard leaf was compiled above, so it already has a slot.
+            slot = self._leaf_slots[_leaf_key(guard.expression)]
+            entry = _Query(self._next_seq, root, fn, slots, (guard.path, slot))
+        self._next_seq += 1
+        self._queries[query_id] = entry
+        if guard is None:
+            return
+        index = self._index.get(guard.path)
+        if index is None:
+            index = self._index[guard.path] = _KeyIndex(guard.path)
+        index.queries[query_id] = slot
+        for value in guard.values:
+            index.buckets.setdefault(_index_key(value), {})[query_id] = slot
+
+    def remove(self, query_id: Hashable) -> None:
+        """Remove the query registered under ``query_id``; KeyError if none."""
+        entry = self._queries.pop(query_id)
+        self._unindexed.pop(query_id, None)
+        if entry.guard is not None:
+            path = entry.guard[0]
+            index = self._index[path]
+            del index.queries[query_id]
+            for value_key, bucket in list(index.buckets.items()):
+                if bucket.pop(query_id, None) is not None and not bucket:
+                    del index.buckets[value_key]
+            if not index.queries:
+                del self._index[path]
+        self._release(entry.slots)
+
+    def match(self, record: Any) -> List[Hashable]:
+        """Ids of the queries ``record`` matches, in the order they were added."""
+        if not isinstance(record, Record):
+            record = Record(self._adapter(record))
+        results: _Results = {}
+        candidates: List[Hashable] = list(self._unindexed)
+        for index in self._index.values():
+            value = record.get_value(index.key)
+            if type(value) not in _LOOKUP_TYPES:
+                candidates.extend(index.queries)
+                continue
+            bucket = index.buckets.get(_index_key(value))
+            if bucket:
+                for query_id, slot in bucket.items():
+                    results[slot] = True
+                    candidates.append(query_id)
+        queries = self._queries
+        matched = [
+            query_id for query_id in candidates if queries[query_id].fn(record, results)
+        ]
+        if len(matched) > 1:
+            matched.sort(key=lambda query_id: queries[query_id].seq)
+        return matched
+
+    def _node(self, node: Node, slots: List[int]) -> _QueryFn:
+        fn: _QueryFn
+        if node.expression is not None:
+            fn = self._leaf(node.expression, slots)
+        elif node.left is not None and node.right is not None:
+            fns = [self._node(operand, slots) for operand in spine_operands(node)]
+            fn = _combine(node.bool_operator, fns)
+        elif node.left is not None:
+            fn = self._node(node.left, slots)
+        elif node.right is not None:
+            fn = self._node(node.right, slots)
+        else:
+            raise ValueError("it should never happen")
+        if getattr(node, "negated", False):
+            inner = fn
+            return lambda record, results: not inner(record, results)
+        return fn
+
+    def _leaf(self, expression: Expression, slots: List[int]) -> _QueryFn:
+        _check_bound(expression)
+        leaf_key = _leaf_key(expression)
+        slot = self._leaf_slots.get(leaf_key)
+        if slot is None:
+            pred = self._compiler.expression(expression)
+            slot = self._next_slot
+            self._next_slot += 1
+            self._leaf_slots[leaf_key] = slot
+            self._leaf_keys[slot] = leaf_key
+            self._leaf_preds[slot] = pred
+            self._leaf_refs[slot] = 0
+        self._leaf_refs[slot] += 1
+        slots.append(slot)
+        pred = self._leaf_preds[slot]
+        leaf_slot = slot
+
+        def leaf(record: Record, results: _Results) -> bool:
+            result = results.get(leaf_slot)
+            if result is None:
+                result = results[leaf_slot] = pred(record)
+            return result
+
+        return leaf
+
+    def _release(self, slots: List[int]) -> None:
+        for slot in slots:
+            self._leaf_refs[slot] -= 1
+            if not self._leaf_refs[slot]:
+                del self._leaf_refs[slot]
+                del self._leaf_preds[slot]
+                del self._leaf_slots[self._leaf_keys.pop(slot)]
+
+
+def _combine(bool_operator: str, fns: List[_QueryFn]) -> _QueryFn:
+    if bool_operator == BoolOperator.AND.value:
+        if len(fns) == 2:
+            left, right = fns
+            return lambda record, results: left(record, results) and right(
+                record, results
+            )
+
+        def every(record: Record, results: _Results) -> bool:
+            for fn in fns:
+                if not fn(record, results):
+                    return False
+            return True
+
+        return every
+    if bool_operator == BoolOperator.OR.value:
+        if len(fns) == 2:
+            left, right = fns
+            return lambda record, results: left(record, results) or right(
+                record, results
+            )
+
+        def some(record: Record, results: _Results) -> bool:
+            for fn in fns:
+                if fn(record, results):
+                    return True
+            return False
+
+        return some
+    raise FlyqlError(f"Unknown boolean operator: {bool_operator}")
+
+
+def _find_guard(node: Node, evaluator: Evaluator) -> Optional[_Guard]:
+    """A leaf that must hold for ``node`` to match and that the index can
+    look up exactly; ``=`` is preferred over ``in`` (fewer buckets)."""
+    if getattr(node, "negated", False):
+        return None
+    if node.expression is not None:
+        return _guard_for(node.expression, evaluator)
+    children = [child for child in (node.left, node.right) if child is not None]
+    if len(children) == 2:
+        if node.bool_operator != BoolOperator.AND.value:
+            return None
+        children = spine_operands(node)
+    best: Optional[_Guard] = None
+    for child in children:
+        guard = _find_guard(child, evaluator)
+        if guard is not None and (best is None or len(guard.values) < len(best.values)):
+            best = guard
+    return best
+
+
+def _guard_for(expression: Expression, evaluator: Evaluator) -> Optional[_Guard]:
+    if expression.key.transformers:
+        return None
+    column = evaluator._resolve_column_for_expression(expression)
+    if column is not None and column.type in (Type.Date, Type.DateTime):
+        return None
+    if expression.operator == Operator.EQUALS.value:
+        if expression.value_type not in _INDEXABLE_KINDS:
+            return None
+        items = [expression.value]
+    elif expression.operator == Operator.IN.value:
+        kinds = expression.values_types or []
+        items = list(expression.values or [])
+        if len(kinds) != len(items) or any(k not in _INDEXABLE_KINDS for k in kinds):
+            return None
+    else:
+        return None
+    # NaN never equals anything, so it has no bucket.
+    values = [v for v in items if not (isinstance(v, float) and math.isnan(v))]
+    return _Guard(expression, values)
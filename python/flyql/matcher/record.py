@@ -1,15 +1,193 @@
+"""Matcher record wrapper.
+
+Nested keys into JSON-string fields (``Payload.user.id`` where
+``Payload`` holds ``'{"user": {"id": 1}}'``) decode the field on first
+access; the decoded value is cached on the Record, so any number of
+predicates on the same field decode it at most once per record.
+
+The decoder is pluggable (``Record(data, decoder=...)``); any callable
+``str -> Any`` that raises on malformed input works. :func:`fast_json_decoder`
+returns ``orjson.loads`` when orjson is installed. orjson is stricter
+than :func:`json.loads` (no NaN/Infinity literals, integers limited to
+64 bits); such values decode to ``None``, exactly like malformed JSON.
+
+Whole records arriving as JSON lines are decoded by :func:`json_projector`,
+which can keep just the top-level fields a query references (see
+:func:`flyql.references.referenced_paths`).
+"""
+
+import importlib
 import json
-from typing import Any, Dict, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from flyql.matcher.key import Key, Step, path_steps
+
+try:
+    simdjson: Any = importlib.import_module("simdjson")
+    _HAVE_SIMDJSON = True
+except ImportError:
+    simdjson = None
+    _HAVE_SIMDJSON = False
+
+Decoder = Callable[[str], Any]
+
+# Marks a cached field whose JSON decode failed.
+_UNDECODABLE = object()
+
+
+def fast_json_decoder() -> Decoder:
+    """Return ``orjson.loads`` when orjson is installed, else ``json.loads``."""
+    try:
+        orjson = importlib.import_module("orjson")
+    except ImportError:
+        return json.loads
+    loads: Decoder = orjson.loads
+    return loads
+
 
-from flyql.matcher.key import Key
+LineDecoder = Callable[[Union[str, bytes]], Optional[Dict[str, Any]]]
+
+
+def json_projector(fields: Optional[Iterable[str]] = None) -> LineDecoder:
+    """Return a decoder for one JSON-object line (NDJSON) that keeps only
+    the top-level ``fields`` (all fields when None).
+
+    With pysimdjson installed (the ``[simdjson]`` extra) the line is parsed
+    lazily and only ``fields`` are materialized, so the cost of wide
+    records no longer scales with the attributes a query never reads.
+    Otherwise (and for lines simdjson rejects: big integers, NaN/Infinity)
+    the whole line is decoded with :func:`fast_json_decoder` and then
+    projected, so both paths return the same fields. On the lazy path a
+    duplicated key keeps its first value, where :func:`json.loads` keeps
+    the last.
+
+    The decoder returns None for lines that are not a JSON object. It holds
+    a reusable parser: use one decoder per thread.
+    """
+    # json.loads and orjson.loads both accept bytes as well as str.
+    loads: Callable[[Any], Any] = fast_json_decoder()
+
+    def decode_all(line: Union[str, bytes]) -> Optional[Dict[str, Any]]:
+        try:
+            value = loads(line)
+        except Exception:  # pylint: disable=broad-exception-caught
+            return None
+        return value if isinstance(value, dict) else None
+
+    if fields is None:
+        return decode_all
+    names = tuple(dict.fromkeys(fields))
+
+    def decode_then_project(line: Union[str, bytes]) -> Optional[Dict[str, Any]]:
+        value = decode_all(line)
+        if value is None:
+            return None
+        return {name: value[name] for name in names if name in value}
+
+    if not _HAVE_SIMDJSON:
+        return decode_then_project
+    parser = simdjson.Parser()
+    lazy_types = (simdjson.Object, simdjson.Array)
+
+    def decode_projected(line: Union[str, bytes]) -> Optional[Dict[str, Any]]:
+        try:
+            doc = parser.parse(line)
+        except (ValueError, RuntimeError, UnicodeError):
+            return decode_then_project(line)
+        if not isinstance(doc, simdjson.Object):
+            return None
+        projected: Dict[str, Any] = {}
+        for name in names:
+            if name in doc:
+                value = doc[name]
+                if isinstance(value, lazy_types):
+                    value = (
+                        value.as_dict()
+                        if isinstance(value, simdjson.Object)
+                        else value.as_list()
+                    )
+                projected[name] = value
+        return projected
+
+    return decode_projected
+
+
+def walk_steps(
+    value: Any,
+    steps: Tuple[Step, ...],
+) -> Any:
+    """Follow precomputed path ``steps`` into nested dicts/lists.
+
+    Other mappings and sequences (tuples, protobuf map/repeated fields,
+    record adapter views) are walked the same way, after the dict/list
+    fast paths.
+    """
+    for name, index in steps:
+        if isinstance(value, list):
+            if index is None or index < 0 or index >= len(value):
+                return None
+            value = value[index]
+        elif isinstance(value, dict):
+            if name not in value:
+                return None
+            value = value[name]
+        elif isinstance(value, (str, bytes)):
+            return None
+        elif isinstance(value, Mapping):
+            if name not in value:
+                return None
+            value = value[name]
+        elif isinstance(value, Sequence):
+            if index is None or index < 0 or index >= len(value):
+                return None
+            value = value[index]
+        else:
+            return None
+    return value
 
 
 class Record:
     def __init__(
         self,
-        data: Dict[str, Any],
+        data: Mapping[str, Any],
+        *,
+        decoder: Optional[Decoder] = None,
+        decode_fields: Optional[Iterable[str]] = None,
     ) -> None:
+        """Wrap ``data`` for matching.
+
+        :param decoder: JSON decoder for JSON-string fields (default
+            :func:`json.loads`).
+        :param decode_fields: Top-level fields to decode eagerly, e.g.
+            :attr:`CompiledQuery.nested_fields` — the fields a query
+            reaches into. Other fields are still decoded lazily on access.
+        """
+        self.data = data
+        self._decoder: Decoder = decoder or json.loads
+        # field name -> (raw string, decoded value or _UNDECODABLE)
+        self._decoded: Dict[str, Tuple[str, Any]] = {}
+        if decode_fields is not None:
+            for name in decode_fields:
+                value = data.get(name)
+                if isinstance(value, str) and self.is_propbably_jsonstring(value):
+                    self._decode(name, value)
+
+    def rebind(self, data: Mapping[str, Any]) -> None:
+        """Point this Record at ``data`` and drop cached decodes, so a scan
+        over many mappings can reuse one wrapper."""
         self.data = data
+        if self._decoded:
+            self._decoded.clear()
 
     def is_propbably_jsonstring(
         self,
@@ -23,25 +201,24 @@ class Record:
             return True
         return False
 
+    def _decode(self, name: str, raw: str) -> Any:
+        cached = self._decoded.get(name)
+        # Identity check keeps the cache correct if data[name] is replaced.
+        if cached is not None and cached[0] is raw:
+            return cached[1]
+        try:
+            decoded = self._decoder(raw)
+        except Exception:  # pylint: disable=broad-exception-caught
+            decoded = _UNDECODABLE
+        self._decoded[name] = (raw, decoded)
+        return decoded
+
     def extract_path(
         self,
         value: Any,
         path: Tuple[str, ...],
     ) -> Any:
-        for key in path:
-            if isinstance(value, list):
-                try:
-                    idx = int(key)
-                except (ValueError, TypeError):
-                    return None
-                if idx < 0 or idx >= len(value):
-                    return None
-                value = value[idx]
-            elif isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return None
-        return value
+        return walk_steps(value, path_steps(path))
 
     def get_value(
         self,
@@ -50,14 +227,12 @@ class Record:
         value = self.data.get(key.value)
         if value is None:
             return None
-        if not key.path:
+        steps = key.steps
+        if not steps:
             return value
         else:
             if self.is_propbably_jsonstring(value):
-                try:
-                    value = json.loads(value)
-                except Exception:  # pylint: disable=broad-exception-caught
+                value = self._decode(key.value, value)
+                if value is _UNDECODABLE:
                     return None
-            elif not isinstance(value, (dict, list)):
-                return None
-            return self.extract_path(value, tuple(key.path))
+            return walk_steps(value, steps)
@@ -0,0 +1,172 @@
+"""Bounded, thread-safe cache of compiled RE2 patterns.
+
+Every :class:`~flyql.matcher.evaluator.Evaluator` compiles regex (and
+complex LIKE) patterns through a :class:`RegexCache`. By default they all
+share the process-wide :func:`default_regex_cache`, so per-request
+Evaluators do not pay RE2 compilation again for patterns other requests
+have already used, and memory stays bounded under user-supplied patterns:
+
+    from flyql.matcher import Evaluator, RegexCache
+
+    cache = RegexCache(max_entries=256, options={"max_mem": 8 << 20})
+    evaluator = Evaluator(regex_cache=cache)
+
+Entries are evicted least-recently-used once either ``max_entries`` or
+``max_program_size`` (the sum of RE2 ``programsize`` — a proxy for the
+compiled program's memory) is exceeded. All methods may be called from
+any thread; compilation happens outside the lock, so two threads missing
+on the same pattern may both compile it (the first insert wins).
+
+A cache pickles as its configuration: the unpickled copy starts empty.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from flyql.core.exceptions import FlyqlError
+from flyql.errors_generated import ERR_RE2_MISSING, MATCHER_MESSAGES
+
+try:
+    import re2  # type: ignore[import-untyped]
+
+    _HAVE_RE2 = True
+except ImportError:
+    re2 = None
+    _HAVE_RE2 = False
+
+DEFAULT_MAX_ENTRIES = 1024
+
+
+@dataclass(frozen=True)
+class RegexCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    program_size: int
+
+
+class RegexCache:
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_program_size: Optional[int] = None,
+        options: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        """Construct a cache.
+
+        :param max_entries: Maximum number of compiled patterns kept.
+        :param max_program_size: Optional bound on the summed RE2
+            ``programsize`` of all entries.
+        :param options: RE2 options applied to every pattern, by
+            ``re2.Options`` attribute name (e.g. ``{"max_mem": 8 << 20}``).
+        :raises FlyqlError: for a non-positive bound or unknown option.
+        """
+        if max_entries < 1:
+            raise FlyqlError("max_entries must be positive")
+        if max_program_size is not None and max_program_size < 1:
+            raise FlyqlError("max_program_size must be positive")
+        self.max_entries = max_entries
+        self.max_program_size = max_program_size
+        self._options: Dict[str, Any] = dict(options or {})
+        self._re2_options: Any = None
+        if _HAVE_RE2:
+            self._re2_options = self._build_options()
+        self._lock = threading.Lock()
+        # pattern -> (compiled regex, program size); order is recency.
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._program_size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _build_options(self) -> Any:
+        if not self._options:
+            return None
+        re2_options = re2.Options()
+        for name, value in self._options.items():
+            if name not in re2.Options.NAMES:
+                raise FlyqlError(f"unknown RE2 option: {name}")
+            setattr(re2_options, name, value)
+        return re2_options
+
+    def compile(self, pattern: str) -> Any:
+        """Return the compiled ``pattern``, compiling it on a miss.
+
+        :raises FlyqlError: when the pattern is invalid or the ``[re2]``
+            extra is not installed.
+        """
+        with self._lock:
+            entry = self._entries.get(pattern)
+            if entry is not None:
+                self._entries.move_to_end(pattern)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+        if not _HAVE_RE2:
+            raise FlyqlError(MATCHER_MESSAGES[ERR_RE2_MISSING])
+        try:
+            regex = re2.compile(pattern, options=self._re2_options)
+        except Exception as err:
+            raise FlyqlError(f"invalid regex given: {pattern} -> {err}") from err
+        size = int(getattr(regex, "programsize", 0) or 0)
+        with self._lock:
+            existing = self._entries.get(pattern)
+            if existing is not None:
+                return existing[0]
+            self._entries[pattern] = (regex, size)
+            self._program_size += size
+            self._evict()
+        return regex
+
+    def _evict(self) -> None:
+        # Keep at least the newest entry, even if it alone exceeds the
+        # program-size bound.
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries
+            or (
+                self.max_program_size is not None
+                and self._program_size > self.max_program_size
+            )
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._program_size -= size
+            self._evictions += 1
+
+    def stats(self) -> RegexCacheStats:
+        with self._lock:
+            return RegexCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                program_size=self._program_size,
+            )
+
+    def clear(self) -> None:
+        """Drop all entries; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._program_size = 0
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (
+            RegexCache,
+            (self.max_entries, self.max_program_size, dict(self._options)),
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, pattern: object) -> bool:
+        return pattern in self._entries
+
+
+_DEFAULT_CACHE = RegexCache()
+
+
+def default_regex_cache() -> RegexCache:
+    """The process-wide cache used by Evaluators built without one."""
+    return _DEFAULT_CACHE
@@ -0,0 +1,75 @@
+"""Hash-based IN-list membership with the matcher's strict equality.
+
+The matcher compares IN-list items with ``_strict_equal``: a bool only
+equals a bool (``True`` never matches ``1``), ``None`` only equals
+``None``, everything else uses ``==``. :class:`StrictValueSet`
+partitions the items so membership is an O(1) hash lookup that keeps
+exactly those semantics:
+
+  - bools live in their own set, consulted only for bool values;
+  - ``None`` is a flag;
+  - other hashable items share one set (``1 == 1.0`` as with ``==``);
+  - NaN items are dropped (``nan == x`` is never true);
+  - unhashable items fall back to a linear strict-equality scan.
+"""
+
+import math
+from typing import Any, FrozenSet, Iterable, List, Tuple
+
+
+def strict_equal(a: Any, b: Any) -> bool:
+    if isinstance(a, bool) != isinstance(b, bool):
+        return False
+    if a is None or b is None:
+        return a is b
+    return bool(a == b)
+
+
+class StrictValueSet:
+    __slots__ = ("_values", "_bools", "_has_none", "_residual")
+
+    def __init__(self, items: Iterable[Any]) -> None:
+        values = set()
+        bools = set()
+        has_none = False
+        residual: List[Any] = []
+        for item in items:
+            if item is None:
+                has_none = True
+            elif isinstance(item, bool):
+                bools.add(item)
+            elif isinstance(item, float) and math.isnan(item):
+                continue
+            else:
+                try:
+                    values.add(item)
+                except TypeError:
+                    residual.append(item)
+        self._values: FrozenSet[Any] = frozenset(values)
+        self._bools: FrozenSet[bool] = frozenset(bools)
+        self._has_none = has_none
+        self._residual: Tuple[Any, ...] = tuple(residual)
+
+    def __contains__(self, value: Any) -> bool:
+        if value is None:
+            return self._has_none
+        if isinstance(value, bool):
+            return value in self._bools
+        try:
+            if value in self._values:
+                return True
+        except TypeError:
+            # Unhashable record value (list/dict) can only equal an
+            # unhashable item.
+            pass
+        if self._residual:
+            return any(strict_equal(value, item) for item in self._residual)
+        return False
+
+    def __len__(self) -> int:
+        return (
+            len(self._values)
+            + len(self._bools)
+            + int(self._has_none)
+            + len(self._residual)
+        )
@@ -0,0 +1,59 @@
+"""Fields referenced by a FlyQL query and/or columns spec.
+
+`referenced_paths()` returns every key path a parsed query reads —
+expression keys, COLUMN-typed right-hand sides (`a = b`) and COLUMN-typed
+IN-list items (`a in [b, 'x']`) — plus the columns of a spec parsed with
+`flyql.columns.parse`. Each path is a tuple of key segments, so
+`{path[0] for path in paths}` is the set of top-level fields a record must
+carry for the query to be evaluated exactly.
+"""
+
+from typing import FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from flyql.columns.column import ParsedColumn
+from flyql.core.exceptions import KeyParseError
+from flyql.core.key import parse_key
+from flyql.core.tree import Node
+from flyql.literal import LiteralKind
+
+Path = Tuple[str, ...]
+
+
+def _column_ref_path(value: object) -> Optional[Path]:
+    """Segments of a COLUMN-typed literal, as the matcher resolves it."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        segments = parse_key(value).segments
+    except KeyParseError:
+        # The matcher then compares against the literal text instead.
+        return None
+    return tuple(segments) if segments else (value,)
+
+
+def referenced_paths(
+    root: Optional[Node] = None,
+    columns: Optional[Iterable[ParsedColumn]] = None,
+) -> FrozenSet[Path]:
+    """Key paths read by the query rooted at ``root`` and by ``columns``."""
+    paths: Set[Path] = set()
+    stack: List[Node] = [root] if root is not None else []
+    while stack:
+        node = stack.pop()
+        expression = node.expression
+        if expression is None:
+            stack.extend(child for child in (node.left, node.right) if child)
+            continue
+        paths.add(tuple(expression.key.segments))
+        if expression.value_type == LiteralKind.COLUMN:
+            ref = _column_ref_path(expression.value)
+            if ref is not None:
+                paths.add(ref)
+        for value, kind in zip(expression.values or [], expression.values_types or []):
+            if kind == LiteralKind.COLUMN:
+                ref = _column_ref_path(value)
+                if ref is not None:
+                    paths.add(ref)
+    for column in columns or ():
+        paths.add(tuple(column.segments))
+    return frozenset(paths)
@@ -0,0 +1,103 @@
+"""Compiled transformer chains.
+
+A chain such as ``message|lower|len`` is resolved against a registry once
+— names looked up, argument counts checked — into a
+:class:`TransformerChain` holding one fused Python callable and, per SQL
+dialect, one SQL template. :meth:`TransformerRegistry.chain` caches
+chains by their names and arguments, so the matcher (per Expression) and
+the SQL generators (per generation) do no registry lookups or validation
+on the hot path.
+
+SQL templates are built by running the chain once over a placeholder
+column reference, so ``Transformer.sql`` must treat ``column_ref`` as an
+opaque string (the built-in transformers only format it into the result).
+"""
+
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from flyql.core.exceptions import FlyqlError
+from flyql.core.key import KeyTransformer
+from flyql.flyql_type import Type
+from flyql.transformers.base import Transformer
+
+Step = Tuple[Transformer, Any]
+
+# Stands in for the column reference while a dialect's template is built.
+_COLUMN_REF = "\x00flyql_column_ref\x00"
+
+
+def _check_arguments(t: KeyTransformer, transformer: Transformer) -> None:
+    schema = transformer.arg_schema
+    required_count = sum(1 for s in schema if s.required)
+    max_count = len(schema)
+    got = len(t.arguments)
+    if got < required_count or got > max_count:
+        if required_count == max_count:
+            raise FlyqlError(f"{t.name} expects {required_count} arguments, got {got}")
+        raise FlyqlError(
+            f"{t.name} expects {required_count}..{max_count} arguments, got {got}"
+        )
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _fuse(steps: Tuple[Step, ...]) -> Callable[[Any], Any]:
+    """One callable applying every step, specialized for short chains."""
+    if not steps:
+        return _identity
+    if len(steps) == 1:
+        apply, args = steps[0][0].apply, steps[0][1]
+        return lambda value: apply(value, args)
+    if len(steps) == 2:
+        first, first_args = steps[0][0].apply, steps[0][1]
+        second, second_args = steps[1][0].apply, steps[1][1]
+        return lambda value: second(first(value, first_args), second_args)
+    bound = tuple((transformer.apply, args) for transformer, args in steps)
+
+    def fused(value: Any) -> Any:
+        for apply, args in bound:
+            value = apply(value, args)
+        return value
+
+    return fused
+
+
+class TransformerChain:
+    """A validated transformer chain; build with
+    :meth:`TransformerRegistry.chain`.
+
+    ``apply(value)`` runs the whole chain; ``sql(dialect, column_ref)``
+    renders it around ``column_ref``.
+    """
+
+    __slots__ = ("steps", "output_type", "apply", "_templates")
+
+    def __init__(
+        self,
+        transformers: Sequence[KeyTransformer],
+        lookup: Callable[[str], Optional[Transformer]],
+    ) -> None:
+        steps = []
+        for t in transformers:
+            transformer = lookup(t.name)
+            if transformer is None:
+                raise FlyqlError(f"unknown transformer: {t.name}")
+            _check_arguments(t, transformer)
+            steps.append((transformer, t.arguments))
+        self.steps: Tuple[Step, ...] = tuple(steps)
+        self.output_type: Optional[Type] = (
+            self.steps[-1][0].output_type if self.steps else None
+        )
+        self.apply = _fuse(self.steps)
+        self._templates: Dict[str, str] = {}
+
+    def sql(self, dialect: str, column_ref: str) -> str:
+        template = self._templates.get(dialect)
+        if template is None:
+            template = _COLUMN_REF
+            for transformer, args in self.steps:
+                template = transformer.sql(dialect, template, args)
+            self._templates[dialect] = template
+        return template.replace(_COLUMN_REF, column_ref)
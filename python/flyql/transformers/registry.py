@@ -1,9 +1,13 @@
-from typing import Dict, List, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from flyql.core.exceptions import FlyqlError
+from flyql.core.key import KeyTransformer
 from flyql.flyql_type import Type
 
 from .base import Transformer
+from .chain import TransformerChain
 from .builtins import (
     LenTransformer,
     LowerTransformer,
@@ -11,10 +15,33 @@ from .builtins import (
     UpperTransformer,
 )
 
+DEFAULT_MAX_CHAINS = 1024
+
+
+def _chain_key(transformers: Sequence[KeyTransformer]) -> Tuple[Any, ...]:
+    # Arguments are keyed with their types: 1, 1.0 and True are equal but
+    # render and apply differently.
+    return tuple(
+        (t.name, tuple((type(arg), arg) for arg in t.arguments)) for t in transformers
+    )
+
 
 class TransformerRegistry:
-    def __init__(self) -> None:
+    def __init__(self, max_chains: int = DEFAULT_MAX_CHAINS) -> None:
+        """Construct an empty registry keeping at most ``max_chains``
+        compiled chains.
+
+        :raises FlyqlError: for a non-positive bound.
+        """
+        if max_chains < 1:
+            raise FlyqlError("max_chains must be positive")
         self._transformers: Dict[str, Transformer] = {}
+        self.max_chains = max_chains
+        self._lock = threading.Lock()
+        # Compiled chains by (name, typed arguments) of each step, evicted
+        # least-recently-used; cleared by register() since a new name can
+        # make an invalid chain valid.
+        self._chains: "OrderedDict[Tuple[Any, ...], TransformerChain]" = OrderedDict()
 
     def get(self, name: str) -> Optional[Transformer]:
         return self._transformers.get(name)
@@ -32,10 +59,45 @@ class TransformerRegistry:
                     f"transformer {transformer.name!r}: ArgSpec.type cannot be Type.Any"
                 )
         self._transformers[transformer.name] = transformer
+        with self._lock:
+            self._chains.clear()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Pickles without its lock and compiled chains (e.g. inside a
+        # CompiledQuery's options); the copy compiles its own.
+        state = dict(vars(self))
+        del state["_lock"]
+        state["_chains"] = OrderedDict()
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        vars(self).update(state)
+        self._lock = threading.Lock()
 
     def names(self) -> List[str]:
         return list(self._transformers.keys())
 
+    def chain(self, transformers: Sequence[KeyTransformer]) -> TransformerChain:
+        """``transformers`` compiled and validated once (see
+        :mod:`flyql.transformers.chain`); raises :class:`FlyqlError` for
+        unknown names and wrong argument counts."""
+        try:
+            key = _chain_key(transformers)
+            with self._lock:
+                chain = self._chains.get(key)
+                if chain is not None:
+                    self._chains.move_to_end(key)
+                    return chain
+        except TypeError:
+            # Unhashable arguments: compile without caching.
+            return TransformerChain(transformers, self.get)
+        chain = TransformerChain(transformers, self.get)
+        with self._lock:
+            self._chains[key] = chain
+            while len(self._chains) > self.max_chains:
+                self._chains.popitem(last=False)
+        return chain
+
 
 def default_registry() -> TransformerRegistry:
     registry = TransformerRegistry()
@@ -44,3 +106,12 @@ def default_registry() -> TransformerRegistry:
     registry.register(LenTransformer())
     registry.register(SplitTransformer())
     return registry
+
+
+_SHARED_DEFAULT = default_registry()
+
+
+def shared_default_registry() -> TransformerRegistry:
+    """The process-wide default registry used when a caller passes none,
+    so its compiled chains are shared. Not for registering into."""
+    return _SHARED_DEFAULT
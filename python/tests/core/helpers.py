@@ -1,8 +1,16 @@
+import dataclasses
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List
 
-from flyql.core.expression import FunctionCall, Parameter
+from flyql.core.expression import Expression, FunctionCall, Parameter
+from flyql.core.key import Key
+from flyql.core.range import Range
+from flyql.core.tree import Node
+
+PARSER_DATA = (
+    Path(__file__).parent.parent.parent.parent / "tests-data" / "core" / "parser"
+)
 
 
 def get_expression(node):
@@ -276,3 +284,39 @@ def format_ast_mismatch_message(
         f"Expected: {json.dumps(expected, indent=2)}\n"
         f"Actual: {json.dumps(actual, indent=2)}"
     )
+
+
+def parser_fixture_inputs() -> Iterator[str]:
+    """Every string ``input`` of the parser fixtures, subdirectories included"""
+    for path in sorted(PARSER_DATA.rglob("*.json")):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        for test in data.get("tests", []):
+            if isinstance(test.get("input"), str):
+                yield test["input"]
+
+
+def ast_snapshot(value):
+    """Every attribute of the tree under ``value``, ranges included, in a
+    form that compares by value"""
+    if isinstance(value, (Node, Expression, Key)):
+        return type(value).__name__, {
+            name: ast_snapshot(item) for name, item in vars(value).items()
+        }
+    if isinstance(value, list):
+        return [ast_snapshot(item) for item in value]
+    return value
+
+
+def snapshot_ranges(snapshot) -> List[Range]:
+    """Every source range in an :func:`ast_snapshot`"""
+    if isinstance(snapshot, Range):
+        return [snapshot]
+    if isinstance(snapshot, dict):
+        items = list(snapshot.values())
+    elif isinstance(snapshot, (list, tuple)):
+        items = list(snapshot)
+    elif dataclasses.is_dataclass(snapshot) and not isinstance(snapshot, type):
+        items = [getattr(snapshot, f.name) for f in dataclasses.fields(snapshot)]
+    else:
+        return []
+    return [found for item in items for found in snapshot_ranges(item)]
@@ -0,0 +1,149 @@
+"""Long AND/OR chains: every consumer walks them without recursing once
+per term."""
+
+import pickle
+
+import pytest
+
+from flyql import bind_params, diagnose
+from flyql.core.column import Column as SchemaColumn
+from flyql.core.column import ColumnSchema
+from flyql.core.parser import parse
+from flyql.core.tree import chain_spine, iter_nodes, spine_operands
+from flyql.generators.clickhouse import generator as clickhouse
+from flyql.generators.clickhouse.column import Column as ClickHouseColumn
+from flyql.generators.postgresql import generator as postgresql
+from flyql.generators.postgresql.column import Column as PostgreSQLColumn
+from flyql.generators.starrocks import generator as starrocks
+from flyql.generators.starrocks.column import Column as StarRocksColumn
+from flyql.matcher import Evaluator, Profile, QuerySet, Record, compile
+from flyql.matcher.columnar import compile_columnar
+
+TERMS = 3000
+
+GENERATORS = [
+    (clickhouse, {"a": ClickHouseColumn("a", "Int64")}),
+    (postgresql, {"a": PostgreSQLColumn("a", "bigint")}),
+    (starrocks, {"a": StarRocksColumn("a", "BIGINT")}),
+]
+
+
+def _chain(op: str, term: str = "a={}") -> str:
+    return f" {op} ".join(term.format(i) for i in range(TERMS))
+
+
+@pytest.fixture(scope="module")
+def any_of():
+    return parse(_chain("or")).root
+
+
+@pytest.fixture(scope="module")
+def all_of():
+    return parse(_chain("and", "a!={}")).root
+
+
+def test_chain_spine() -> None:
+    root = parse("a=1 or b=2 or (c=3 or d=4) or not (e=5 or f=6) or g=7 and h=8").root
+    bottom, links = chain_spine(root)
+    assert links[-1] is root and len(links) == 4
+    assert str(bottom.expression) == str(parse("a=1").root.left.expression)
+    operands = spine_operands(root)
+    assert operands[0] is bottom
+    assert [operand.bool_operator for operand in operands[1:]] == [
+        "",
+        "or",
+        "or",
+        "and",
+    ]
+    assert operands[3].negated
+
+
+def test_iter_nodes_is_pre_order() -> None:
+    root = parse("a=1 and (b=2 or c=3)").root
+    leaves = [str(n.expression.key.raw) for n in iter_nodes(root) if n.expression]
+    assert leaves == ["a", "b", "c"]
+
+
+def test_evaluate(any_of, all_of) -> None:
+    last = Record({"a": TERMS - 1})
+    for evaluator in (Evaluator(), Evaluator(reorder="cost")):
+        assert evaluator.evaluate(any_of, last)
+        assert not evaluator.evaluate(any_of, Record({"a": -1}))
+        assert evaluator.evaluate(all_of, Record({"a": -1}))
+        assert not evaluator.evaluate(all_of, last)
+    assert compile(any_of)(last)
+    assert not compile(all_of)(last)
+
+
+def test_profile_observes_the_chain(any_of) -> None:
+    profile = Profile()
+    Evaluator(profile=profile).evaluate(any_of, Record({"a": 2}))
+    _, links = chain_spine(any_of)
+    assert profile.stats(any_of).true_count == 1
+    # a=2 decides the third link; every link above it is short-circuited
+    # but still evaluated, as with the recursive walk.
+    assert profile.stats(links[1]).evaluations == 1
+    assert profile.stats(links[2].right).evaluations == 0
+    assert len(profile.to_dict(any_of)["children"]) == 2
+
+
+def test_columnar_and_query_set(any_of) -> None:
+    block = {"a": [0, TERMS - 1, TERMS]}
+    assert list(compile_columnar(any_of).mask(block)) == [True, True, False]
+
+    queries = QuerySet()
+    queries.add("many", any_of)
+    assert queries.match(Record({"a": TERMS - 1})) == ["many"]
+
+
+def test_bind_and_diagnose() -> None:
+    root = parse(_chain("or", "a=$p{}")).root
+    bound = bind_params(root, {f"p{i}": i for i in range(TERMS)})
+    assert compile(bound)(Record({"a": TERMS - 1}))
+
+    schema = ColumnSchema.from_columns([SchemaColumn("a", "int")])
+    assert not diagnose(bound, schema)
+    unknown = diagnose(parse(_chain("or", "b{}=1")).root, schema)
+    assert len(unknown) == TERMS
+    assert unknown[0].range.start == 0
+
+
+@pytest.mark.parametrize("generator, columns", GENERATORS)
+def test_generators(generator, columns, any_of) -> None:
+    sql = generator.to_sql_where(any_of, columns)
+    assert sql.count(" OR ") == TERMS - 1
+    formatted = generator.to_sql_where_with_options(
+        any_of, columns, generator.GeneratorOptions(format=True)
+    )
+    assert formatted == sql.replace(" OR ", "\nOR ").replace("\nOR ", " OR ", 1)
+
+
+@pytest.mark.parametrize("generator, columns", GENERATORS)
+def test_generators_match_pairwise_joins(generator, columns) -> None:
+    root = parse(
+        "a=0 and (a=1 or a=2) and a=3 or not (a=4 and a=5 and a=6) or a=7"
+    ).root
+
+    def sql(options=None):
+        if options is None:
+            text = generator.to_sql_where(root, columns)
+        else:
+            text = generator.to_sql_where_with_options(root, columns, options)
+        return text.replace('"a"', "a").replace("`a`", "a")
+
+    assert sql() == (
+        "a = 0 AND (a = 1 OR a = 2) AND a = 3 OR NOT (a = 4 AND a = 5 AND a = 6)"
+        " OR a = 7"
+    )
+    assert sql(generator.GeneratorOptions(format=True)) == (
+        "a = 0\nAND (a = 1 OR a = 2)\nAND a = 3\n"
+        "OR NOT (\n  a = 4 AND a = 5\n  AND a = 6\n)\nOR a = 7"
+    )
+
+
+def test_pickle(any_of) -> None:
+    copy = pickle.loads(pickle.dumps(any_of))
+    assert len(spine_operands(copy)) == TERMS
+    assert [n.range for n in iter_nodes(copy)] == [n.range for n in iter_nodes(any_of)]
+    query = pickle.loads(pickle.dumps(compile(any_of)))
+    assert query(Record({"a": TERMS - 1}))
@@ -0,0 +1,165 @@
+"""Parse cache and frozen ASTs: ``flyql.core.ParseCache``."""
+
+import pickle
+import threading
+
+import pytest
+
+from flyql import bind_params
+from flyql.core import ParseCache, default_parse_cache
+from flyql.core.exceptions import FlyqlError
+from flyql.core.expression import Parameter
+from flyql.core.frozen import FrozenNode, freeze, is_frozen, thaw
+from flyql.core.parser import ParserError, parse
+from flyql.core.range import NO_RANGE
+from flyql.generators.clickhouse.column import Column
+from flyql.generators.clickhouse.generator import to_sql_where
+from flyql.matcher import Record, compile
+from tests.core.helpers import ast_to_dict
+
+QUERY = "status in [200, 201] and host|lower = 'prod' and not ts > ago(1h)"
+
+
+def _expression(node, key):
+    if node is None:
+        return None
+    if node.expression is not None and node.expression.key.raw == key:
+        return node.expression
+    return _expression(node.left, key) or _expression(node.right, key)
+
+
+def test_hits_misses_and_lru_eviction() -> None:
+    cache = ParseCache(max_entries=2)
+    first = cache.parse("a=1").root
+    assert cache.parse("a=1").root is first
+    cache.parse("b=1")
+    cache.parse("a=1")  # a=1 is now most recent
+    cache.parse("c=1")  # evicts b=1
+    assert "a=1" in cache and "c=1" in cache and "b=1" not in cache
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (2, 3, 1, 2)
+
+
+def test_keyed_by_mode() -> None:
+    cache = ParseCache()
+    full = cache.parse("a=1").root
+    lean = cache.parse("a=1", mode="lean").root
+    assert full is not lean
+    assert lean.left.expression.range is NO_RANGE
+    assert cache.parse("a=1", mode="lean").root is lean
+    assert len(cache) == 2
+
+
+def test_invalidate() -> None:
+    cache = ParseCache()
+    cache.parse("a=1")
+    cache.parse("a=1", mode="lean")
+    cache.parse("b=1")
+    assert cache.invalidate("a=1") == 2
+    assert "a=1" not in cache and "b=1" in cache
+    assert cache.invalidate("a=1") == 0
+    assert cache.invalidate() == 1
+    assert len(cache) == 0
+    assert cache.stats().misses == 3
+
+
+def test_errors_are_not_cached() -> None:
+    cache = ParseCache()
+    for _ in range(2):
+        with pytest.raises(ParserError):
+            cache.parse("a = 'x")
+    assert len(cache) == 0
+    assert cache.stats().misses == 2
+
+
+def test_invalid_bound() -> None:
+    with pytest.raises(FlyqlError):
+        ParseCache(max_entries=0)
+
+
+def test_default_cache_is_shared() -> None:
+    assert default_parse_cache() is default_parse_cache()
+
+
+def test_pickles_as_configuration() -> None:
+    cache = ParseCache(max_entries=7)
+    cache.parse("a=1")
+    copy = pickle.loads(pickle.dumps(cache))
+    assert copy.max_entries == 7 and len(copy) == 0
+
+
+def test_concurrent_parses_share_one_tree() -> None:
+    cache = ParseCache()
+    roots = []
+
+    def worker() -> None:
+        for _ in range(50):
+            roots.append(cache.parse(QUERY).root)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(root) for root in roots}) == 1
+    stats = cache.stats()
+    assert stats.hits + stats.misses == 400
+
+
+def test_cached_tree_is_frozen() -> None:
+    root = ParseCache().parse(QUERY).root
+    assert is_frozen(root)
+    expression = _expression(root, "status")
+    assert expression.values == (200, 201)
+    assert expression.key.segments == ("status",)
+    with pytest.raises(FlyqlError, match="frozen"):
+        root.left = None
+    with pytest.raises(FlyqlError, match="frozen"):
+        expression.value = 1
+    with pytest.raises(FlyqlError, match="frozen"):
+        expression.key.raw = "x"
+
+
+def test_frozen_tree_is_used_like_a_parsed_one() -> None:
+    frozen = ParseCache().parse(QUERY).root
+    fresh = parse(QUERY).root
+    assert ast_to_dict(thaw(frozen)) == ast_to_dict(fresh)
+
+    columns = {
+        "status": Column("status", "UInt32"),
+        "host": Column("host", "String"),
+        "ts": Column("ts", "DateTime"),
+    }
+    assert to_sql_where(frozen, columns) == to_sql_where(fresh, columns)
+
+    record = Record({"status": 200, "host": "PROD", "ts": "2000-01-01T00:00:00Z"})
+    assert compile(frozen)(record) == compile(fresh)(record) is True
+
+    unpickled = pickle.loads(pickle.dumps(frozen))
+    assert isinstance(unpickled, FrozenNode)
+    assert ast_to_dict(thaw(unpickled)) == ast_to_dict(fresh)
+
+
+def test_bind_params_copies_frozen_trees() -> None:
+    cache = ParseCache()
+    text = "a = $x and b in [$y, 2] and ts > ago($d)"
+    frozen = cache.parse(text).root
+
+    bound = bind_params(frozen, {"x": 1, "y": "v", "d": "5m"})
+    assert bound is not frozen and not is_frozen(bound)
+    again = bind_params(cache.parse(text).root, {"x": 2, "y": "w", "d": "1h"})
+
+    assert ast_to_dict(bound) != ast_to_dict(again)
+    assert isinstance(_expression(frozen, "a").value, Parameter)
+    assert ast_to_dict(thaw(frozen)) == ast_to_dict(parse(text).root)
+
+
+def test_bind_params_still_binds_in_place() -> None:
+    root = parse("a = $x").root
+    assert bind_params(root, {"x": 1}) is root
+
+
+def test_freeze_is_idempotent() -> None:
+    root = parse("a=1 or b=2").root
+    assert freeze(freeze(root)) is root
+    assert is_frozen(root.left)
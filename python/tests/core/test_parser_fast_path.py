@@ -0,0 +1,101 @@
+"""The trivial-query fast path of ``parse()`` builds the same AST as the
+state machine."""
+
+import random
+
+import pytest
+
+from flyql.core.exceptions import FlyqlError
+from flyql.core.parser import PARSE_MODES, Parser, parse
+from tests.core.helpers import ast_snapshot, parser_fixture_inputs
+
+
+def _state_machine(text, mode):
+    parser = Parser()
+    parser.parse(text, mode=mode)
+    return parser.root
+
+
+def _generated_queries():
+    rng = random.Random(25)
+    keys = ["a", "status", "a.b", "x_1.y.z", "_", "nothing", "and", "or", "in"]
+    operators = ["=", "!=", "~", "!~", ">", ">=", "<", "<="]
+    values = ["1", "-7", "007", "2.50", "9223372036854775808", "'x'", "''"]
+    values += ['"a\'b"', "'a or b'", "'('", "'null'", '"true"', "'é'"]
+    for _ in range(300):
+        terms = [
+            rng.choice(keys)
+            + " " * rng.randint(0, 2)
+            + rng.choice(operators)
+            + " " * rng.randint(0, 2)
+            + rng.choice(values)
+            for _ in range(rng.randint(1, 6))
+        ]
+        query = terms[0]
+        for term in terms[1:]:
+            query += " " * rng.randint(1, 2) + rng.choice(["and", "or"])
+            query += " " * rng.randint(1, 2) + term
+        yield query
+
+
+@pytest.mark.parametrize("mode", PARSE_MODES)
+def test_fixture_parity(mode) -> None:
+    hits = 0
+    for text in parser_fixture_inputs():
+        root = Parser()._parse_trivial(text, mode)
+        if root is None:
+            continue
+        hits += 1
+        assert ast_snapshot(root) == ast_snapshot(_state_machine(text, mode)), text
+    assert hits >= 50
+
+
+@pytest.mark.parametrize("mode", PARSE_MODES)
+def test_generated_parity(mode) -> None:
+    for text in _generated_queries():
+        root = Parser()._parse_trivial(text, mode)
+        assert root is not None, text
+        assert ast_snapshot(root) == ast_snapshot(_state_machine(text, mode)), text
+        assert ast_snapshot(parse(text, mode=mode).root) == ast_snapshot(root)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "a=1 and (b=2)",
+        "not a=1",
+        "a=1 and not b=2",
+        "not =1",
+        "a|upper='x'",
+        "a='x\\'y'",
+        "a=b",
+        "a=true",
+        "a in [1, 2]",
+        "a=ago(1h)",
+        "a=$x",
+        "a",
+        "a=1 AND b=2",
+        " a=1",
+        "a=1 ",
+        "a=1\tand b=2",
+        "a='x\ny'",
+        "a=1 and",
+        "a=1.5.6",
+        "'a'=1",
+        "",
+    ],
+)
+def test_other_queries_take_the_state_machine(text) -> None:
+    assert Parser()._parse_trivial(text, "full") is None
+
+
+def test_ignore_last_char_takes_the_state_machine() -> None:
+    parser = Parser()
+    parser.parse("a=1 and b=2", raise_error=False, ignore_last_char=True)
+    result = parse("a=1 and b=2", raise_error=False, ignore_last_char=True)
+    assert ast_snapshot(result.root) == ast_snapshot(parser.root)
+
+
+def test_invalid_mode_still_raises() -> None:
+    with pytest.raises(FlyqlError):
+        parse("a=1", mode="fast")
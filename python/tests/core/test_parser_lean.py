@@ -0,0 +1,67 @@
+"""Lean parse mode: the same AST and errors as a full parse, without
+typed_chars or source ranges."""
+
+import pytest
+
+from flyql.core.exceptions import FlyqlError
+from flyql.core.parser import Parser, ParserError, parse
+from flyql.core.range import NO_RANGE, Range
+from tests.core.helpers import (
+    ast_snapshot,
+    ast_to_dict,
+    parser_fixture_inputs,
+    snapshot_ranges,
+)
+
+QUERIES = [
+    "status = 200 and active and not archived",
+    "a.b.'c d'|upper|split(',')|chars(1, 3) = 'X' or (x in [1, 'two', $p] and y)",
+    "k not has 'foo' and ts > ago(1h30m) and ts < startOf('day', 'UTC')",
+    "k = '" + "x" * 2000 + "'",
+]
+
+
+def _parse(text, mode):
+    parser = Parser()
+    try:
+        parser.parse(text, mode=mode)
+    except ParserError as e:
+        return parser, (e.errno, e.range)
+    return parser, None
+
+
+@pytest.mark.parametrize("text", QUERIES + sorted(set(parser_fixture_inputs())))
+def test_lean_matches_full_parse(text):
+    full, full_error = _parse(text, "full")
+    lean, lean_error = _parse(text, "lean")
+    assert lean_error == full_error
+    assert ast_to_dict(lean.root) == ast_to_dict(full.root)
+    assert lean.typed_chars == []
+    assert all(r is NO_RANGE for r in snapshot_ranges(ast_snapshot(lean.root)))
+
+
+def test_lean_key_shape():
+    root = parse("a.b|chars(1, 3) = 'x'", mode="lean").root
+    key = root.left.expression.key
+    assert key.segments == ["a", "b"]
+    assert key.segment_ranges == [NO_RANGE, NO_RANGE]
+    assert key.transformers[0].arguments == [1, 3]
+    assert key.transformers[0].argument_ranges == [NO_RANGE, NO_RANGE]
+
+
+def test_lean_errors_keep_ranges():
+    with pytest.raises(ParserError) as exc_info:
+        parse("a = 1 and ^", mode="lean")
+    assert exc_info.value.range == Range(10, 11)
+
+
+def test_full_is_default():
+    parser = Parser()
+    parser.parse("a=1")
+    assert parser.typed_chars
+    assert parser.root.left.expression.key.range == Range(0, 1)
+
+
+def test_invalid_mode():
+    with pytest.raises(FlyqlError, match="invalid parse mode"):
+        parse("a=1", mode="fast")
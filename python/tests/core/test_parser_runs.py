@@ -0,0 +1,49 @@
+"""The run fast path in Parser.parse must behave exactly like feeding the
+state handlers one character at a time."""
+
+import pytest
+
+from flyql.core.parser import Parser
+from tests.core.helpers import ast_snapshot, parser_fixture_inputs
+
+QUERIES = [
+    "k='" + "x" * 5000 + "'",
+    'k="a\\"b c\\" d" and m=1',
+    'k=\'it\\\'s\' or k="say \\"hi\\""',
+    "k in [" + ", ".join(str(i) for i in range(200)) + "]",
+    "k in ['" + "', '".join(f"v {i}" for i in range(200)) + "']",
+    'k not in ["a", "b,c", "d]e"]',
+    "k = 'line one\nline two' and\nm = 2",
+    "k in ['a\nb', 1,\n2]",
+    "'quoted key' = 1 and \"other key\".x = 2",
+    "message|upper|split('a b', \"c\")|chars(10) = 'x'",
+    "a.b:c/d@e-f_g = héllo and ключ = значение",
+    "ts > ago(1h30m) and ts < now('Europe/Berlin')",
+    "k = $name and j in [$1, 'x']",
+    "k = 'unterminated",
+    "k in ['a', 'b'",
+    "key=valu=e",
+    "(a=1 or b='x y') and not c",
+]
+
+
+def _snapshot(text):
+    parser = Parser()
+    parser.parse(text, raise_error=False)
+    return {
+        "ast": ast_snapshot(parser.root),
+        "typed_chars": [
+            (char.value, char.pos, char.line, char.line_pos, char_type)
+            for char, char_type in parser.typed_chars
+        ],
+        "error": (parser.state, parser.errno, parser.error_text, parser._error_range),
+        "buffers": (parser.key, parser.value, parser.in_list_current_value),
+        "position": (parser.pos, parser.line, parser.line_pos),
+    }
+
+
+@pytest.mark.parametrize("text", QUERIES + sorted(set(parser_fixture_inputs())))
+def test_runs_match_per_character_parsing(text, monkeypatch):
+    fast = _snapshot(text)
+    monkeypatch.setattr(Parser, "_consume_run", lambda self, text, index: 0)
+    assert fast == _snapshot(text)
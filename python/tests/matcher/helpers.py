@@ -0,0 +1,47 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+try:
+    import re2  # type: ignore[import-untyped]  # noqa: F401
+
+    HAVE_RE2 = True
+except ImportError:
+    HAVE_RE2 = False
+
+TESTS_DATA = Path(__file__).resolve().parents[3] / "tests-data"
+MATCHER_DATA = TESTS_DATA / "matcher"
+OTEL: Dict[str, Any] = json.loads(
+    (TESTS_DATA / "otel" / "logs.json").read_text(encoding="utf-8")
+)
+OTEL_QUERIES: List[str] = OTEL["examples"] + [OTEL["defaults"]["query"]]
+REGEX_FIXTURES = {"like.json", "regex.json"}
+
+
+def load_matcher_test_data(filename: str) -> list:
+    with open(MATCHER_DATA / filename, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data["tests"]
+
+
+def matcher_fixture_cases() -> list:
+    """Every case in tests-data/matcher, skipping the regex files without re2"""
+    cases = []
+    for path in sorted(MATCHER_DATA.glob("*.json")):
+        marks = []
+        if path.name in REGEX_FIXTURES and not HAVE_RE2:
+            marks.append(pytest.mark.skip(reason="requires flyql[re2]"))
+        for case in load_matcher_test_data(path.name):
+            cases.append(
+                pytest.param(case, id=f"{path.stem}:{case['name']}", marks=marks)
+            )
+    return cases
+
+
+def counting(rows: List[Dict[str, Any]], seen: List[int]) -> Iterator[Dict[str, Any]]:
+    """Yield ``rows``, appending each index to ``seen`` as it is pulled"""
+    for i, row in enumerate(rows):
+        seen.append(i)
+        yield row
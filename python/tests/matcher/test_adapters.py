@@ -0,0 +1,169 @@
+"""Record adapters in ``flyql.matcher.adapters``."""
+
+from collections import namedtuple
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from flyql.core.column import ColumnSchema
+from flyql.core.exceptions import FlyqlError
+from flyql.matcher import QuerySet, Record, batch, match
+from flyql.matcher.adapters import (
+    AttributeView,
+    TupleView,
+    adapt,
+    adapter_for,
+    tuple_adapter,
+)
+
+QUERY = "status >= 500 and user.name = 'ann' and tags.1 = 'b'"
+DICTS: List[Dict[str, Any]] = [
+    {"status": 503, "user": {"name": "ann"}, "tags": ["a", "b"]},
+    {"status": 200, "user": {"name": "ann"}, "tags": ["a", "b"]},
+    {"status": 500, "user": {"name": "bob"}, "tags": ["a", "b"]},
+    {"status": 502, "user": {"name": "ann"}, "tags": ("a", "b")},
+]
+
+
+@dataclass
+class User:
+    name: str
+
+
+@dataclass
+class Event:
+    status: int
+    user: User
+    tags: List[str] = field(default_factory=list)
+    _secret: str = "x"
+
+
+class Plain:
+    def __init__(self, status: int, user: Any, tags: Any) -> None:
+        self.status = status
+        self.user = user
+        self.tags = tags
+
+
+Row = namedtuple("Row", ["status", "user", "tags"])
+
+
+def expected() -> List[bool]:
+    return [match(QUERY, row) for row in DICTS]
+
+
+def test_mapping_records_are_not_copied() -> None:
+    row = MappingProxyType(DICTS[0])
+    assert adapt(DICTS[0]) is DICTS[0]
+    assert adapt(row) is row
+    assert match(QUERY, row)
+    assert expected() == [True, False, False, True]
+
+
+def test_attribute_records() -> None:
+    events = [
+        Event(row["status"], User(row["user"]["name"]), list(row["tags"]))
+        for row in DICTS
+    ]
+    assert [match(QUERY, event) for event in events] == expected()
+    plain = [Plain(row["status"], row["user"], row["tags"]) for row in DICTS]
+    assert [match(QUERY, item) for item in plain] == expected()
+    assert not match("_secret = 'x'", events[0])
+    view = AttributeView(events[0])
+    assert list(view) == ["status", "user", "tags"] and "_secret" not in view
+    assert isinstance(view["user"], AttributeView)
+
+
+def test_namedtuples_and_row_tuples() -> None:
+    rows = [Row(row["status"], row["user"], row["tags"]) for row in DICTS]
+    assert [match(QUERY, row) for row in rows] == expected()
+    plain = [tuple(row) for row in rows]
+    with pytest.raises(FlyqlError):
+        match(QUERY, plain[0])
+    adapter = tuple_adapter(["status", "user", "tags"])
+    assert list(batch.filter(QUERY, plain, adapter=adapter)) == [plain[0], plain[3]]
+    schema = ColumnSchema.from_plain_object(
+        {"status": {"type": "int"}, "user": {"type": "map"}, "tags": {"type": "array"}}
+    )
+    assert batch.count(QUERY, plain, adapter=tuple_adapter(schema)) == 2
+    short = TupleView((503,), {"status": 0, "user": 1})
+    assert dict(short) == {"status": 503} and "user" not in short
+
+
+def test_batch_and_query_set_adapt_mixed_records() -> None:
+    records: List[Any] = [
+        DICTS[0],
+        Row(**DICTS[3]),
+        Event(503, User("ann"), ["a", "b"]),
+        Record(DICTS[1]),
+    ]
+    assert list(batch.filter(QUERY, records)) == [records[0], records[1], records[2]]
+    rules = QuerySet()
+    rules.add("q", QUERY)
+    assert [rules.match(record) for record in records] == [["q"], ["q"], ["q"], []]
+    tuples = QuerySet(adapter=tuple_adapter(["status"]))
+    tuples.add("q", "status = 1")
+    assert tuples.match((1,)) == ["q"]
+
+
+def test_adapter_is_chosen_once_per_type() -> None:
+    class Fresh:
+        status: Optional[int] = 1
+
+    adapter = adapter_for(Fresh)
+    assert adapter is AttributeView and adapter_for(Fresh) is adapter
+    assert adapter_for(dict)(DICTS[0]) is DICTS[0]
+
+
+def test_only_data_fields_are_exposed() -> None:
+    @dataclass
+    class Response:
+        status: int
+
+        def is_error(self) -> bool:
+            return self.status >= 500
+
+        @property
+        def slow(self) -> bool:
+            return True
+
+    class Slotted:
+        __slots__ = ("status", "handler", "_token", "unset")
+
+        def __init__(self) -> None:
+            self.status = 200
+            self.handler = print
+            self._token = "x"
+
+    response = Response(200)
+    assert not match("is_error", response) and not match("slow", response)
+    assert match("not is_error and status = 200", response)
+    assert dict(AttributeView(response)) == {"status": 200}
+    slotted = AttributeView(Slotted())
+    assert dict(slotted) == {"status": 200}
+    assert "handler" not in slotted and "unset" not in slotted
+    assert slotted.get("_token") is None
+
+
+def test_match_copies_other_dict_input() -> None:
+    assert match("status = 503", [("status", 503)])
+    assert not match("status = 503", (("status", 200),))
+    with pytest.raises(FlyqlError):
+        match("status = 503", (503,))
+
+
+@pytest.mark.parametrize("value", [5, 1.5, True, "abc", "", b"xx", bytearray(), None])
+def test_scalars_are_not_records(value: Any) -> None:
+    with pytest.raises(FlyqlError):
+        match("a = 1", value)
+    with pytest.raises(FlyqlError):
+        match("not a", value)
+    with pytest.raises(FlyqlError):
+        adapter_for(type(value))
+
+
+def test_undecoded_json_lines_are_rejected() -> None:
+    with pytest.raises(FlyqlError):
+        batch.count("not status", ['{"status": 500}'])
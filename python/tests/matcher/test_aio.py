@@ -0,0 +1,131 @@
+"""asyncio matching with ``flyql.matcher.afilter``."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import pytest
+
+from flyql.core.exceptions import FlyqlError
+from flyql.matcher import Record, afilter, batch
+
+ROWS: List[Dict[str, Any]] = [
+    {"status": 200 + (i * 37) % 400, "service": ["api", "db"][i % 2]}
+    for i in range(1000)
+]
+QUERY = "status >= 500 and service = 'api'"
+
+
+async def source(
+    rows: List[Any], seen: Optional[List[int]] = None, delay: Optional[float] = None
+) -> AsyncIterator[Any]:
+    for i, row in enumerate(rows):
+        if seen is not None:
+            seen.append(i)
+        if delay is not None:
+            await asyncio.sleep(delay)
+        yield row
+
+
+async def collect(matches: AsyncIterator[Any]) -> List[Any]:
+    return [item async for item in matches]
+
+
+@pytest.mark.parametrize("offload_threshold", [None, 1, 10_000])
+def test_matches_batch_filter(offload_threshold: Optional[int]) -> None:
+    rows: List[Any] = [Record(row) if i % 3 else row for i, row in enumerate(ROWS)]
+    expected = list(batch.filter(QUERY, rows))
+
+    async def run() -> List[Any]:
+        if offload_threshold is None:
+            return await collect(afilter(QUERY, source(rows), batch_size=64))
+        with ThreadPoolExecutor(2) as executor:
+            return await collect(
+                afilter(
+                    QUERY,
+                    source(rows),
+                    batch_size=64,
+                    executor=executor,
+                    offload_threshold=offload_threshold,
+                )
+            )
+
+    found = asyncio.run(run())
+    assert len(found) == len(expected) > 0
+    assert all(a is b for a, b in zip(found, expected))
+
+
+def test_inline_matching_yields_to_the_event_loop() -> None:
+    ticks: List[int] = []
+
+    async def ticker() -> None:
+        while True:
+            ticks.append(len(ticks))
+            await asyncio.sleep(0)
+
+    async def run() -> None:
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        # Nothing matches, so the consumer never suspends on its own.
+        await collect(afilter("status < 0", source(ROWS), batch_size=100))
+        task.cancel()
+
+    asyncio.run(run())
+    assert len(ticks) >= len(ROWS) // 100
+
+
+def test_slow_source_flushes_after_max_delay() -> None:
+    async def run() -> float:
+        loop = asyncio.get_running_loop()
+
+        async def trickle() -> AsyncIterator[Any]:
+            yield {"status": 503, "service": "api"}
+            await asyncio.sleep(10)
+            yield {"status": 503, "service": "api"}
+
+        with ThreadPoolExecutor(1) as executor:
+            start = loop.time()
+            matches = afilter(
+                QUERY, trickle(), executor=executor, offload_threshold=1, max_delay=0.01
+            )
+            await asyncio.wait_for(matches.__anext__(), timeout=2)
+            elapsed = loop.time() - start
+            await matches.aclose()
+            return elapsed
+
+    assert asyncio.run(run()) < 2
+
+
+def test_cancellation_stops_reading_the_source() -> None:
+    seen: List[int] = []
+
+    async def run() -> None:
+        with ThreadPoolExecutor(1) as executor:
+            matches = afilter(
+                "status >= 0",
+                source(ROWS, seen, delay=0.001),
+                executor=executor,
+                batch_size=10_000,
+                max_delay=60,
+            )
+            task = asyncio.create_task(collect(matches))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+    asyncio.run(run())
+    read = len(seen)
+    assert 0 < read < len(ROWS)
+
+
+def test_errors_raised_before_reading_the_source() -> None:
+    seen: List[int] = []
+    for query, kwargs in [
+        ("status=$code", {}),
+        ("status = 1", {"batch_size": 0}),
+        ("status = 1", {"max_delay": -1}),
+    ]:
+        with pytest.raises(FlyqlError):
+            afilter(query, source(ROWS, seen), **kwargs)
+    assert seen == []
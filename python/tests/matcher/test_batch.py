@@ -0,0 +1,116 @@
+"""Batch helpers in ``flyql.matcher.batch``."""
+
+import json
+import types
+from typing import Any, Dict, List
+
+import pytest
+
+from flyql.core.column import ColumnSchema
+from flyql.core.exceptions import FlyqlError
+from flyql.core.parser import parse
+from flyql.matcher import Evaluator, Record, batch, compile
+from tests.matcher.helpers import counting
+
+ROWS: List[Dict[str, Any]] = [
+    {"status": 200, "payload": '{"user": "a"}'},
+    {"status": 500, "payload": '{"user": "b"}'},
+    {"status": 503, "payload": '{"user": "a"}'},
+    {"status": 404},
+]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "status >= 500",
+        parse("status >= 500").root,
+        compile(parse("status >= 500").root),
+    ],
+)
+def test_filter_accepts_strings_asts_and_compiled_queries(query: Any) -> None:
+    assert list(batch.filter(query, ROWS)) == [ROWS[1], ROWS[2]]
+
+
+def test_filter_is_lazy_and_yields_original_items() -> None:
+    seen: List[int] = []
+    matches = batch.filter("status >= 500", counting(ROWS, seen))
+    assert isinstance(matches, types.GeneratorType)
+    assert seen == []
+    assert next(matches) is ROWS[1]
+    assert seen == [0, 1]
+
+
+def test_filter_mixes_records_and_mappings() -> None:
+    record = Record(ROWS[2])
+    assert list(batch.filter("status >= 500", [ROWS[1], record])) == [ROWS[1], record]
+
+
+def test_reused_wrapper_does_not_leak_decodes() -> None:
+    assert list(batch.filter("payload.user = 'a'", ROWS)) == [ROWS[0], ROWS[2]]
+
+
+def test_count_matches_evaluator() -> None:
+    root = parse("status >= 500 or payload.user = 'a'").root
+    evaluator = Evaluator()
+    expected = sum(evaluator.evaluate(root, Record(row)) for row in ROWS)
+    assert batch.count(root, ROWS) == expected == 3
+
+
+def test_any_stops_at_first_match() -> None:
+    seen: List[int] = []
+    assert batch.any("status = 500", counting(ROWS, seen)) is True
+    assert seen == [0, 1]
+    assert batch.any("status = 201", ROWS) is False
+
+
+def test_first_n_stops_early() -> None:
+    seen: List[int] = []
+    assert batch.first_n("status > 200", counting(ROWS, seen), 2) == ROWS[1:3]
+    assert seen == [0, 1, 2]
+    assert batch.first_n("status > 200", counting(ROWS, []), 0) == []
+    with pytest.raises(FlyqlError):
+        batch.first_n("status > 200", ROWS, -1)
+
+
+def test_query_errors_raised_before_reading_records() -> None:
+    seen: List[int] = []
+    with pytest.raises(FlyqlError):
+        batch.filter("status=$code", counting(ROWS, seen))
+    assert seen == []
+
+
+def test_compile_options_forwarded() -> None:
+    schema = ColumnSchema.from_plain_object({"ts": {"type": "date"}})
+    rows = [{"ts": "2024-05-01"}, {"ts": "2023-05-01"}]
+    assert batch.first_n("ts > '2024-01-01'", rows, 5, columns=schema) == rows[:1]
+
+
+LINES = [json.dumps(row) for row in ROWS] + ["not json", "[1]", ""]
+
+
+def test_filter_lines_yields_matching_lines_unchanged() -> None:
+    assert list(batch.filter_lines("status >= 500", LINES)) == LINES[1:3]
+    raw = [line.encode() for line in LINES]
+    assert list(batch.filter_lines("payload.user = 'a'", raw)) == [raw[0], raw[2]]
+
+
+def test_filter_lines_decodes_only_referenced_fields(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    projected: List[Any] = []
+    real = batch.json_projector
+
+    def tracking(fields: Any = None) -> Any:
+        projected.append(set(fields))
+        return real(fields)
+
+    monkeypatch.setattr(batch, "json_projector", tracking)
+    query = compile(parse("status >= limit and payload.user in ['a', other]").root)
+    list(batch.filter_lines(query, LINES))
+    assert projected == [{"status", "limit", "payload", "other"}]
+
+
+def test_filter_lines_raises_query_errors_eagerly() -> None:
+    with pytest.raises(FlyqlError):
+        batch.filter_lines("status=$code", LINES)
@@ -0,0 +1,170 @@
+"""Pinned clock for ``now()``/``ago()``/``today()``/``startOf()``."""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, List
+
+import pytest
+
+from flyql.core.column import ColumnSchema
+from flyql.core.parser import parse
+from flyql.matcher import Evaluator, Record, batch, compile, compile_columnar
+from flyql.matcher import columnar as columnar_module
+from flyql.matcher import compiler as compiler_module
+from flyql.matcher.evaluator import Evaluator as EvaluatorClass
+
+NOW = datetime(2024, 5, 15, 12, 30, tzinfo=timezone.utc)
+NOW_MS = int(NOW.timestamp() * 1000)
+HOUR_MS = 3_600_000
+
+
+@pytest.fixture
+def function_calls(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    calls: List[str] = []
+    real = EvaluatorClass._function_call_ms
+
+    def counting(self: Any, fc: Any, now: datetime) -> int:
+        calls.append(fc.name)
+        return real(self, fc, now)
+
+    monkeypatch.setattr(EvaluatorClass, "_function_call_ms", counting)
+    return calls
+
+
+ROWS = [{"ts": NOW_MS - i * HOUR_MS // 2} for i in range(6)]
+
+
+def test_pinned_evaluator_computes_each_function_once(
+    function_calls: List[str],
+) -> None:
+    root = parse("ts > ago(2h) and ts <= now()").root
+    evaluator = Evaluator(now=NOW)
+    assert [evaluator.evaluate(root, Record(r)) for r in ROWS] == [
+        True,
+        True,
+        True,
+        True,
+        False,
+        False,
+    ]
+    assert sorted(function_calls) == ["ago", "now"]
+
+
+def test_snapshot_pins_then_restores(function_calls: List[str]) -> None:
+    root = parse("ts > ago(1h)").root
+    evaluator = Evaluator()
+    with evaluator.snapshot(NOW.replace(tzinfo=None)):
+        assert [evaluator.evaluate(root, Record(r)) for r in ROWS[:3]] == [
+            True,
+            True,
+            False,
+        ]
+    assert function_calls == ["ago"]
+    evaluator.evaluate(root, Record(ROWS[0]))
+    assert evaluator._now is None
+    assert len(function_calls) == 2
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "ts > ago(1h)",
+        "ts >= today()",
+        "ts >= today('America/New_York')",
+        "ts < startOf('week')",
+        "ts >= startOf('month', 'Asia/Tokyo')",
+    ],
+)
+@pytest.mark.parametrize("typed", [False, True])
+def test_pinned_compiled_matches_pinned_evaluator(query: str, typed: bool) -> None:
+    schema = (
+        ColumnSchema.from_plain_object({"ts": {"type": "datetime"}}) if typed else None
+    )
+    root = parse(query).root
+    rows = ROWS + [
+        {"ts": NOW_MS},
+        {"ts": NOW - timedelta(minutes=30)},
+        {"ts": date(2024, 5, 1)},
+        {"ts": "2024-05-15T00:00:00Z"},
+        {"ts": None},
+    ]
+    evaluator = Evaluator(columns=schema, now=NOW)
+    expected = [evaluator.evaluate(root, Record(r)) for r in rows]
+    compiled = compile(root, columns=schema, now=NOW)
+    assert [compiled(Record(r)) for r in rows] == expected
+    columnar = compile_columnar(root, columns=schema, now=NOW)
+    block = {"ts": [r["ts"] for r in rows]}
+    assert columnar.mask(block) == expected
+
+
+def test_compiled_thresholds_resolved_at_compile_time(
+    function_calls: List[str],
+) -> None:
+    query = compile(parse("ts > ago(1h) or ts <= now()").root, now=NOW)
+    assert query.uses_clock and query.now == NOW
+    calls = len(function_calls)
+    for row in ROWS:
+        query(Record(row))
+    assert len(function_calls) == calls
+
+
+def test_at_pins_a_copy() -> None:
+    plain = compile(parse("a = 1").root)
+    assert not plain.uses_clock
+    assert plain.at(NOW) is plain
+    live = compile(parse("ts > ago(1h)").root)
+    assert live.now is None
+    pinned = live.at(NOW)
+    assert pinned is not live and pinned.now == NOW
+    assert [pinned(Record(r)) for r in ROWS[:3]] == [True, True, False]
+
+
+def test_batch_resolves_clock_once_per_call(function_calls: List[str]) -> None:
+    rows = ROWS * 20
+    assert batch.count("ts > ago(1h)", rows, now=NOW) == 40
+    assert function_calls == ["ago"]
+    live = compile(parse("ts > ago(1h)").root)
+    function_calls.clear()
+    batch.count(live, rows)
+    assert function_calls == ["ago"]
+
+
+def _count_builds(monkeypatch: pytest.MonkeyPatch, cls: Any, name: str) -> List[str]:
+    built: List[str] = []
+    real = getattr(cls, name)
+
+    def counting(self: Any, expression: Any) -> Any:
+        built.append(str(expression.key.raw))
+        return real(self, expression)
+
+    monkeypatch.setattr(cls, name, counting)
+    return built
+
+
+TEMPORAL_MIX = "service = 'api' and msg like 'GET%' and ts > ago(1h) or ts <= now()"
+MIXED_ROWS = [dict(row, service="api", msg="GET /") for row in ROWS]
+
+
+def test_at_rebuilds_only_temporal_leaves(monkeypatch: pytest.MonkeyPatch) -> None:
+    root = parse(TEMPORAL_MIX).root
+    live = compile(root, reorder="cost")
+    built = _count_builds(monkeypatch, compiler_module._Compiler, "_expression")
+    for now in (NOW, NOW + timedelta(hours=1)):
+        pinned = live.at(now)
+        assert built == ["ts", "ts"]
+        built.clear()
+        expected = compile(root, now=now, reorder="cost")
+        rows = [Record(r) for r in MIXED_ROWS]
+        assert [pinned(r) for r in rows] == [expected(r) for r in rows]
+        assert pinned.at(now + timedelta(hours=1)).now == now + timedelta(hours=1)
+        built.clear()
+
+
+def test_mask_rebuilds_only_temporal_leaves(monkeypatch: pytest.MonkeyPatch) -> None:
+    root = parse(TEMPORAL_MIX).root
+    columnar = compile_columnar(root)
+    built = _count_builds(monkeypatch, columnar_module._ColumnarCompiler, "_leaf")
+    block = {name: [row[name] for row in MIXED_ROWS] for name in MIXED_ROWS[0]}
+    expected = compile_columnar(root, now=datetime.now(timezone.utc)).mask(block)
+    built.clear()
+    assert columnar.mask(block) == expected
+    assert built == ["ts", "ts"]
@@ -0,0 +1,184 @@
+"""Columnar backend: ``flyql.matcher.compile_columnar``.
+
+Every mask is checked against :class:`Evaluator` on the same rows.
+"""
+
+import array
+from typing import Any, Dict, List, Optional, Sequence
+
+import pytest
+
+from flyql.core.column import ColumnSchema
+from flyql.core.exceptions import FlyqlError
+from flyql.core.parser import parse
+from flyql.matcher import ColumnarQuery, Evaluator, Record, compile_columnar
+from tests.matcher.helpers import HAVE_RE2, OTEL, OTEL_QUERIES, matcher_fixture_cases
+
+try:
+    import numpy as np  # type: ignore[import-not-found]
+
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+
+def _rows(block: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    length = len(next(iter(block.values()))) if block else 0
+    return [{name: block[name][i] for name in block} for i in range(length)]
+
+
+def _expected(
+    query: str, block: Dict[str, Sequence[Any]], schema: Optional[ColumnSchema] = None
+) -> List[bool]:
+    root = parse(query).root
+    evaluator = Evaluator(columns=schema)
+    return [evaluator.evaluate(root, Record(row)) for row in _rows(block)]
+
+
+@pytest.mark.parametrize("test_case", matcher_fixture_cases())
+def test_columnar_matches_fixtures(test_case: dict) -> None:
+    schema = None
+    if "columns" in test_case:
+        schema = ColumnSchema.from_plain_object(test_case["columns"])
+    query = compile_columnar(parse(test_case["query"]).root, columns=schema)
+    block = {name: [value] for name, value in test_case["data"].items()}
+    assert query.mask(block) == [test_case["expected"]]
+
+
+@pytest.mark.skipif(not HAVE_RE2, reason="requires flyql[re2]")
+@pytest.mark.parametrize("query", OTEL_QUERIES)
+def test_columnar_parity_on_otel_logs(query: str) -> None:
+    names = sorted({name for record in OTEL["records"] for name in record})
+    block = {name: [record.get(name) for record in OTEL["records"]] for name in names}
+    mask = compile_columnar(parse(query).root).mask(block)
+    assert mask == _expected(query, block)
+
+
+BLOCK: Dict[str, Sequence[Any]] = {
+    "status": [200, 503, 500, None, 404],
+    "service": ["api", "API", "db", "api", None],
+    "ok": [True, False, 1, 0, None],
+    "ref": [200, 500, 0, None, 404],
+    "payload": ['{"user": "a"}', '{"user": "b"}', None, "x", '{"user": "a"}'],
+}
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "status >= 500",
+        "status != 500",
+        "status in [200, 404] or not service",
+        "status not in [200, 404]",
+        "service|upper = 'API'",
+        "service|lower in ['api']",
+        "service|len > 2",
+        "ok = true",
+        "ok = 1",
+        "ok",
+        "not ok and status",
+        "status = ref",
+        "status in [ref, 503]",
+        "payload.user = 'a'",
+        "status > 1000 and service = 'api'",
+        "status > 0 or service = 'nope'",
+    ],
+)
+def test_columnar_matches_evaluator(query: str) -> None:
+    assert compile_columnar(parse(query).root).mask(BLOCK) == _expected(query, BLOCK)
+
+
+def test_array_module_columns() -> None:
+    block = {"n": array.array("q", [1, 5, 10]), "f": array.array("d", [0.5, 2.5, 0.0])}
+    query = compile_columnar(parse("n > 2 and f").root)
+    assert query.mask(block) == [False, True, False]
+
+
+def test_missing_column_reads_as_none() -> None:
+    block = {"a": [1, 2]}
+    assert compile_columnar(parse("b = null").root).mask(block) == [True, True]
+
+
+def test_unequal_columns_rejected() -> None:
+    with pytest.raises(FlyqlError):
+        compile_columnar(parse("a = 1").root).mask({"a": [1], "b": [1, 2]})
+
+
+def test_and_skips_right_side_when_left_matches_nothing() -> None:
+    calls: List[int] = []
+
+    class Counting(list):
+        def __iter__(self):  # type: ignore[no-untyped-def]
+            calls.append(1)
+            return super().__iter__()
+
+    block = {"a": [1, 2], "b": Counting(["x", "y"])}
+    query = compile_columnar(parse("a > 5 and b = 'x'").root)
+    assert isinstance(query, ColumnarQuery)
+    assert query.mask(block) == [False, False]
+    assert calls == []
+
+
+def test_right_side_sees_only_undecided_rows() -> None:
+    read: List[int] = []
+
+    class Recording(list):
+        def __getitem__(self, index):  # type: ignore[no-untyped-def]
+            read.append(index)
+            return super().__getitem__(index)
+
+    block = {"a": [1, 6, 7, 2], "b": Recording(["x", "y", "x", "x"])}
+    query = compile_columnar(parse("a > 5 and b = 'x'").root)
+    assert query.mask(block) == [False, False, True, False]
+    assert read == [1, 2]
+    read.clear()
+    query = compile_columnar(parse("a > 5 or (b = 'x' and a = 1)").root)
+    assert query.mask(block) == [True, True, True, False]
+    assert read == [0, 3]
+
+
+@pytest.mark.skipif(not HAVE_NUMPY, reason="requires numpy")
+@pytest.mark.parametrize(
+    "query",
+    [
+        "n > 2",
+        "n = 5 or f <= 0.5",
+        "n in [1, 10, true, 'x']",
+        "n not in [1]",
+        "f",
+        "b = true",
+        "b != false and not n = 1",
+        "n = 'x'",
+        "s = 'a'",
+        "n = 5.0 or n < 0.5",
+        "f in [0, 3]",
+        "big = 9007199254740992.0",
+        "big in [9007199254740992.0]",
+        "big > 9007199254740992.0",
+        "big in [9007199254740993, 9007199254740993.0, 0.5]",
+        "fbig = 9007199254740993",
+        "small = 2.5 or small in [1.5, 300]",
+        "u = -1 or u >= 18446744073709551615",
+        "u8 = 300 or u8 = 255",
+        "text|len > 1",
+        "text|len in [0, 3]",
+    ],
+)
+def test_numpy_columns_match_evaluator(query: str) -> None:
+    block = {
+        "n": np.array([1, 5, 10, 0]),
+        "f": np.array([0.5, float("nan"), 0.0, 3.0]),
+        "b": np.array([True, False, True, False]),
+        "s": np.array(["a", "b", "a", "c"], dtype=object),
+        # Above 2**53 an int64 and its float64 rounding differ.
+        "big": np.array([9007199254740993, 9007199254740992, 1, 0]),
+        "fbig": np.array([2.0**53, 2.0**53 + 2, 0.0, 1.0]),
+        "small": np.array([2.5, 1.5, 300.0, 0.1], dtype=np.float32),
+        "u": np.array([2**64 - 1, 0, 1, 2], dtype=np.uint64),
+        "u8": np.array([255, 0, 44, 1], dtype=np.uint8),
+        "text": np.array(["ab", "ß", "", "abc"]),
+    }
+    mask = compile_columnar(parse(query).root).mask(block)
+    assert isinstance(mask, np.ndarray) and mask.dtype == bool
+    rows = {name: column.tolist() for name, column in block.items()}
+    assert mask.tolist() == _expected(query, rows)
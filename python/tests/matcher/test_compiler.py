@@ -0,0 +1,164 @@
+"""Tests for ``flyql.matcher.compile`` — the compiled predicate engine.
+
+The shared matcher fixtures are replayed through ``compile`` so the
+compiled path stays result-identical to :class:`Evaluator`.
+"""
+
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from flyql.bind import bind_params
+from flyql.core.column import ColumnSchema
+from flyql.core.exceptions import FlyqlError
+from flyql.core.frozen import freeze, is_frozen
+from flyql.core.parser import parse
+from flyql.matcher import CompiledQuery, Evaluator, Record, compile, compile_columnar
+from tests.matcher.helpers import HAVE_RE2, OTEL, OTEL_QUERIES, matcher_fixture_cases
+
+
+@pytest.mark.parametrize("test_case", matcher_fixture_cases())
+def test_compiled_matches_fixtures(test_case: dict) -> None:
+    root = parse(test_case["query"]).root
+    schema = None
+    if "columns" in test_case:
+        schema = ColumnSchema.from_plain_object(test_case["columns"])
+    record = Record(data=test_case["data"])
+    compiled = compile(root, columns=schema)
+    expected = Evaluator(columns=schema).evaluate(root, record)
+    assert compiled(record) is expected is test_case["expected"]
+
+
+@pytest.mark.skipif(not HAVE_RE2, reason="requires flyql[re2]")
+def test_compile_returns_reusable_query() -> None:
+    query = compile(parse("status=200 and host like 'prod%'").root)
+    assert isinstance(query, CompiledQuery)
+    rows = [
+        {"status": 200, "host": "prod-1"},
+        {"status": 500, "host": "prod-2"},
+        {"status": 200, "host": "dev-1"},
+    ]
+    assert [query(Record(r)) for r in rows] == [True, False, False]
+
+
+def test_column_reference_resolved_per_record() -> None:
+    query = compile(parse("field=other").root)
+    assert query(Record({"field": "x", "other": "x"})) is True
+    assert query(Record({"field": "x", "other": "y"})) is False
+    # Missing column falls back to the literal, as in Evaluator.
+    assert query(Record({"field": "other"})) is True
+
+
+def test_in_list_with_column_reference() -> None:
+    query = compile(parse("a in [b, 'z']").root)
+    assert query(Record({"a": 1, "b": 1})) is True
+    assert query(Record({"a": "z", "b": 1})) is True
+    assert query(Record({"a": 2, "b": 1})) is False
+
+
+def test_schemaless_native_datetime() -> None:
+    query = compile(parse("ts > '2026-04-06T20:00:00Z'").root)
+    rec = Record({"ts": datetime(2026, 4, 6, 21, 0, tzinfo=timezone.utc)})
+    assert query(rec) is True
+
+
+def test_function_threshold_evaluated() -> None:
+    query = compile(parse("ts > ago(1h)").root)
+    now = datetime.now(timezone.utc)
+    assert query(Record({"ts": now.isoformat()})) is True
+    assert query(Record({"ts": "2001-01-01T00:00:00Z"})) is False
+
+
+def test_unbound_parameter_raises_at_compile_time() -> None:
+    root = parse("status=$code").root
+    with pytest.raises(FlyqlError, match="unbound parameter"):
+        compile(root)
+    query = compile(bind_params(root, {"code": 200}))
+    assert query(Record({"status": 200})) is True
+
+
+def test_unknown_transformer_raises_at_compile_time() -> None:
+    with pytest.raises(FlyqlError, match="unknown transformer"):
+        compile(parse("msg|nope='x'").root)
+
+
+@pytest.mark.skipif(not HAVE_RE2, reason="requires flyql[re2]")
+def test_invalid_regex_raises_at_compile_time() -> None:
+    with pytest.raises(FlyqlError, match="invalid regex"):
+        compile(parse(r'message~"(\w+)\s+\1"').root)
+
+
+def test_short_circuits_boolean_operators() -> None:
+    calls = []
+
+    class CountingRecord(Record):
+        def get_value(self, key):  # type: ignore[no-untyped-def]
+            calls.append(key.value)
+            return super().get_value(key)
+
+    query = compile(parse("a=1 or b=2").root)
+    assert query(CountingRecord({"a": 1, "b": 2})) is True
+    assert calls == ["a"]
+
+
+@pytest.mark.skipif(not HAVE_RE2, reason="requires flyql[re2]")
+@pytest.mark.parametrize("query", OTEL_QUERIES)
+def test_compiled_parity_on_otel_logs(query: str) -> None:
+    root = parse(query).root
+    compiled = compile(root)
+    evaluator = Evaluator()
+    for data in OTEL["records"]:
+        record = Record(data)
+        assert compiled(record) is evaluator.evaluate(root, record), (query, data)
+
+
+def test_compiled_query_is_immutable() -> None:
+    query = compile(parse("a=1").root)
+    with pytest.raises(AttributeError):
+        query.root = parse("a=2").root  # type: ignore[misc]
+    with pytest.raises(AttributeError):
+        del query.nested_fields
+    with pytest.raises(TypeError):
+        query._options["reorder"] = "cost"  # type: ignore[index]
+
+
+def test_later_changes_to_the_tree_do_not_reach_the_query() -> None:
+    root = parse("a = 1 and ts > ago(1h)").root
+    query = compile(root)
+    columnar = compile_columnar(root)
+    assert query.root is not root and is_frozen(query.root)
+    root.left.expression.value = 2
+    record = Record({"a": 1, "ts": datetime.now(timezone.utc) + timedelta(days=1)})
+    assert query(record)
+    assert query.at()(record)
+    assert pickle.loads(pickle.dumps(query))(record)
+    assert columnar.mask({"a": [1], "ts": [record.data["ts"]]}) == [True]
+    frozen = freeze(parse("a = 1").root)
+    assert compile(frozen).root is frozen
+
+
+def test_timezones_resolved_at_compile_time() -> None:
+    schema = ColumnSchema.from_plain_object(
+        {"ts": {"type": "datetime", "tz": "Europe/Berlin"}}
+    )
+    query = compile(
+        parse("ts > today('America/New_York') or ts > '2024-01-01'").root,
+        columns=schema,
+    )
+    assert {"Europe/Berlin", "America/New_York"} <= set(query._evaluator._tz_cache)
+
+
+@pytest.mark.skipif(not HAVE_RE2, reason="requires flyql[re2]")
+def test_compiled_query_shared_across_threads() -> None:
+    query = compile(parse(OTEL["defaults"]["query"]).root)
+    records = [Record(data) for data in OTEL["records"]] * 50
+    expected = [query(record) for record in records]
+
+    def run(_: int) -> list:
+        return [query(record) for record in records]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(run, range(16)))
+    assert all(result == expected for result in results)
@@ -0,0 +1,87 @@
+"""Precompiled key accessors: ``flyql.matcher.key.Key`` and the
+Evaluator's per-Expression plan cache."""
+
+import gc
+
+import pytest
+
+from flyql.core.parser import parse
+from flyql.matcher import Evaluator, Record
+from flyql.matcher import key as key_module
+from flyql.matcher.key import Key, path_steps
+
+
+@pytest.mark.parametrize(
+    "raw,value,steps",
+    [
+        ("a", "a", ()),
+        ("a.b", "a", (("b", None),)),
+        ("items.0.name", "items", (("0", 0), ("name", None))),
+        ("a.'b.c'", "a", (("b.c", None),)),
+    ],
+)
+def test_key_precomputes_steps(raw: str, value: str, steps: tuple) -> None:
+    key = Key(raw)
+    assert key.value == value
+    assert key.steps == steps
+    from_segments = Key.from_segments([value] + [s for s, _ in steps])
+    assert (from_segments.value, from_segments.path, from_segments.steps) == (
+        key.value,
+        key.path,
+        key.steps,
+    )
+
+
+def test_path_steps_non_integer_segment() -> None:
+    assert path_steps(["-1", "x", "10"]) == (("-1", -1), ("x", None), ("10", 10))
+
+
+@pytest.mark.parametrize(
+    "raw,data,expected",
+    [
+        ("items.1", {"items": ["a", "b"]}, "b"),
+        ("items.2", {"items": ["a", "b"]}, None),
+        ("items.-1", {"items": ["a", "b"]}, None),
+        ("items.x", {"items": ["a", "b"]}, None),
+        ("m.items.0.k", {"m": {"items": [{"k": 1}]}}, 1),
+        ("j.items.0", {"j": '{"items": [7]}'}, 7),
+        ("j.items", {"j": "{not json}"}, None),
+        ("s.x", {"s": "scalar"}, None),
+    ],
+)
+def test_record_get_value_with_steps(raw: str, data: dict, expected: object) -> None:
+    assert Record(data).get_value(Key(raw)) == expected
+
+
+def test_record_extract_path_still_accepts_string_paths() -> None:
+    assert Record({}).extract_path({"a": [1, {"b": 2}]}, ("a", "1", "b")) == 2
+
+
+def test_evaluator_parses_keys_once_per_expression(monkeypatch) -> None:
+    calls = []
+    real_parse_key = key_module.parse_key
+
+    def counting_parse_key(value: str):  # type: ignore[no-untyped-def]
+        calls.append(value)
+        return real_parse_key(value)
+
+    monkeypatch.setattr(key_module, "parse_key", counting_parse_key)
+    root = parse("a.b=other and c in [x.y, 'lit', z]").root
+    evaluator = Evaluator()
+    records = [
+        Record({"a": {"b": i}, "other": i, "c": i, "x": {"y": i}, "z": 0})
+        for i in range(50)
+    ]
+    assert all(evaluator.evaluate(root, r) for r in records)
+    # One parse per COLUMN-typed reference; the LHS reuses parsed segments.
+    assert sorted(calls) == ["other", "x.y", "z"]
+
+
+def test_expression_plan_evicted_with_expression() -> None:
+    evaluator = Evaluator()
+    root = parse("a=1").root
+    evaluator.evaluate(root, Record({"a": 1}))
+    assert len(evaluator._expr_plan_cache) == 1
+    del root
+    gc.collect()
+    assert len(evaluator._expr_plan_cache) == 0
@@ -0,0 +1,118 @@
+"""LIKE/ILIKE fast paths in ``flyql.matcher.like`` agree with the RE2
+translation they replace."""
+
+import itertools
+
+import pytest
+
+from flyql.core.parser import parse
+from flyql.matcher import Record, compile
+from flyql.matcher import evaluator as evaluator_module
+from flyql.matcher.evaluator import Evaluator, _like_to_regex
+from flyql.matcher.like import LikeMatcher
+
+try:
+    import re2  # type: ignore[import-untyped]  # noqa: F401
+
+    HAVE_RE2 = True
+except ImportError:
+    HAVE_RE2 = False
+
+PATTERNS = [
+    "",
+    "abc",
+    "abc%",
+    "%abc",
+    "%abc%",
+    "a%c",
+    "a%b%c",
+    "%a%b%",
+    "%%",
+    "%",
+    "a_c",
+    "_",
+    "__",
+    "a_%",
+    "50\\%",
+    "a\\_c",
+    "%\\%%",
+    "a\nb%",
+    "ABC%",
+    "%Straße%",
+]
+
+VALUES = [
+    "",
+    "abc",
+    "abcd",
+    "xabc",
+    "xabcx",
+    "ac",
+    "aXc",
+    "a_c",
+    "abbc",
+    "aXbYc",
+    "ab\nc",
+    "abc\n",
+    "\nabc",
+    "a\nc",
+    "\n",
+    "50%",
+    "500",
+    "ABC",
+    "AbCd",
+    "a\nbcd",
+    "x%y",
+    "STRASSE",
+    "straße",
+    "Kbc",
+]
+
+
+def _ref(pattern: str, value: str, insensitive: bool) -> bool:
+    source = _like_to_regex(pattern)
+    regex = re2.compile("(?i)" + source if insensitive else source)
+    return bool(regex.search(value))
+
+
+@pytest.mark.skipif(not HAVE_RE2, reason="reference translation requires re2")
+@pytest.mark.parametrize("insensitive", [False, True])
+def test_fast_paths_match_regex_translation(insensitive: bool) -> None:
+    evaluator = Evaluator()
+    for pattern, value in itertools.product(PATTERNS, VALUES):
+        like = LikeMatcher(pattern, insensitive, evaluator._like_regex)
+        assert like(value) is _ref(pattern, value, insensitive), (pattern, value)
+
+
+def test_simple_shapes_do_not_build_a_regex() -> None:
+    def no_regex(pattern: str, insensitive: bool) -> None:
+        raise AssertionError(f"regex requested for {pattern!r}")
+
+    for pattern in ["abc", "abc%", "%abc", "%abc%", "a%b%c", "a_c", "50\\%"]:
+        assert LikeMatcher(pattern, False, no_regex)("abc") is (pattern != "50\\%")
+    assert LikeMatcher("ABC%", True, no_regex)("abcdef") is True
+
+
+def test_matcher_reused_per_pattern() -> None:
+    evaluator = Evaluator()
+    assert evaluator._get_like("a%", True) is evaluator._get_like("a%", True)
+    assert evaluator._get_like("a%", True) is not evaluator._get_like("a%", False)
+
+
+def test_matcher_cache_is_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(evaluator_module, "_LIKE_CACHE_SIZE", 4)
+    # Patterns read from records: one cache entry per distinct pattern.
+    query = compile(parse("name like pattern").root)
+    for i in range(10):
+        assert query(Record({"name": f"v{i}x", "pattern": f"v{i}%"}))
+    cache = query._evaluator._like_cache
+    assert len(cache) == 4
+    assert [pattern for pattern, _ in cache] == ["v6%", "v7%", "v8%", "v9%"]
+    evaluator = Evaluator()
+    first = evaluator._get_like("a%", False)
+    for pattern in ["b%", "c%", "d%"]:
+        evaluator._get_like(pattern, False)
+    assert evaluator._get_like("a%", False) is first
+    evaluator._get_like("e%", False)
+    assert ("a%", False) in evaluator._like_cache
+    assert ("b%", False) not in evaluator._like_cache
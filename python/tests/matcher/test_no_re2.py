@@ -12,14 +12,14 @@ from flyql.errors_generated import ERR_RE2_MISSING, MATCHER_MESSAGES
     [
         'msg~"hi"',
         'msg!~"hi"',
-        'msg like "h%"',
-        'msg not like "h%"',
-        'msg ilike "h%"',
-        'msg not ilike "h%"',
+        'msg like "h_%"',
+        'msg not like "h_%"',
+        'msg ilike "h_%"',
+        'msg not ilike "h_%"',
     ],
 )
 def test_no_re2_raises_err_re2_missing(monkeypatch, query):
-    """When re2 is unavailable, every regex/LIKE-adjacent operator raises ERR_RE2_MISSING."""
+    """When re2 is unavailable, regex and LIKE patterns without a fast path raise ERR_RE2_MISSING."""
     from flyql.matcher import evaluator as ev_mod
 
     monkeypatch.setattr(ev_mod, "_HAVE_RE2", False)
@@ -28,3 +28,23 @@ def test_no_re2_raises_err_re2_missing(monkeypatch, query):
     with pytest.raises(FlyqlError) as exc_info:
         Evaluator().evaluate(root, Record({"msg": "hi"}))
     assert exc_info.value.message == MATCHER_MESSAGES[ERR_RE2_MISSING]
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ('msg like "h%"', True),
+        ('msg not like "%i"', False),
+        ('msg ilike "H_"', True),
+        ('msg not ilike "%X%"', True),
+        ('msg like "a%b%c"', False),
+    ],
+)
+def test_no_re2_simple_like_patterns_work(monkeypatch, query, expected):
+    """LIKE/ILIKE shapes lowered to string operations need no regex engine."""
+    from flyql.matcher import evaluator as ev_mod
+
+    monkeypatch.setattr(ev_mod, "_HAVE_RE2", False)
+    monkeypatch.setattr(ev_mod, "re2", None)
+    root = parse(query).root
+    assert Evaluator().evaluate(root, Record({"msg": "hi"})) is expected
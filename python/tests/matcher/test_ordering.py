@@ -0,0 +1,124 @@
+"""Short-circuiting and cost/selectivity-ordered AND/OR evaluation."""
+
+from typing import Any, List
+
+import pytest
+
+from flyql.core.column import ColumnSchema
+from flyql.core.exceptions import FlyqlError
+from flyql.core.parser import parse
+from flyql.matcher import Evaluator, Record, compile
+from flyql.matcher.key import Key
+from flyql.matcher.ordering import OperandChain, chain_operands, node_cost
+from tests.matcher.helpers import HAVE_RE2, OTEL, OTEL_QUERIES
+
+
+class CountingRecord(Record):
+    def __init__(self, data: dict) -> None:
+        super().__init__(data)
+        self.reads: List[str] = []
+
+    def get_value(self, key: Key) -> Any:
+        self.reads.append(key.value)
+        return super().get_value(key)
+
+
+def test_evaluator_short_circuits_or() -> None:
+    record = CountingRecord({"a": 1, "b": 2})
+    assert Evaluator().evaluate(parse("a=1 or b=2").root, record) is True
+    assert record.reads == ["a"]
+
+
+def test_evaluator_short_circuits_and() -> None:
+    record = CountingRecord({"a": 0, "b": 2})
+    assert Evaluator().evaluate(parse("a=1 and b=2").root, record) is False
+    assert record.reads == ["a"]
+
+
+@pytest.mark.skipif(not HAVE_RE2, reason="requires flyql[re2]")
+def test_cost_order_runs_cheap_operand_first() -> None:
+    root = parse("msg~'^GET' and status=200").root
+    record = CountingRecord({"msg": "GET /", "status": 500})
+    assert Evaluator(reorder="cost").evaluate(root, record) is False
+    assert record.reads == ["status"]
+
+
+def test_chain_operands_flattens_same_operator_only() -> None:
+    root = parse("a=1 and (b=2 and c=3) and not (d=4 and e=5) and (f=6 or g=7)").root
+    operands = chain_operands(root)
+    rendered = [
+        str(o.expression) if o.expression else o.bool_operator for o in operands
+    ]
+    assert rendered == ["a=1", "b=2", "c=3", "and", "or"]
+    assert operands[3].negated is True
+
+
+def test_cost_model_ranks_operators() -> None:
+    schema = ColumnSchema.from_plain_object({"Payload": {"type": "jsonstring"}})
+    costs = [
+        node_cost(parse(q).root, schema)
+        for q in [
+            "a=1",
+            "a in [1, 2]",
+            "a like 'x%'",
+            "a~'x'",
+            "Payload.user=1",
+        ]
+    ]
+    assert costs == sorted(costs)
+    assert len(set(costs)) == len(costs)
+
+
+def test_selectivity_mode_promotes_decisive_operand() -> None:
+    root = parse("a in [1, 2] and b=1").root
+    evaluator = Evaluator(reorder="selectivity")
+    record = Record({"a": 3, "b": 1})
+    chain = evaluator._chain_for_node(root)
+    assert [str(o.expression) for o in chain.operands][0] == "b=1"
+    for _ in range(OperandChain.RESORT_INTERVAL):
+        assert evaluator.evaluate(root, record) is False
+    # `b=1` never decides, `a in [...]` always does: the IN moves first.
+    assert str(chain.operands[0].expression).startswith("a in")
+
+
+def test_invalid_reorder_mode() -> None:
+    with pytest.raises(FlyqlError, match="invalid reorder mode"):
+        Evaluator(reorder="random")
+    with pytest.raises(FlyqlError, match="supports reorder='cost' only"):
+        compile(parse("a=1").root, reorder="selectivity")
+
+
+@pytest.mark.skipif(not HAVE_RE2, reason="requires flyql[re2]")
+@pytest.mark.parametrize("query", OTEL_QUERIES)
+def test_reordered_results_identical(query: str) -> None:
+    root = parse(query).root
+    baseline = Evaluator()
+    cost = Evaluator(reorder="cost")
+    selectivity = Evaluator(reorder="selectivity")
+    compiled = compile(root, reorder="cost")
+    for data in OTEL["records"]:
+        record = Record(data)
+        expected = baseline.evaluate(root, record)
+        assert cost.evaluate(root, record) is expected
+        assert selectivity.evaluate(root, record) is expected
+        assert compiled(record) is expected
+
+
+@pytest.mark.parametrize(
+    "query,data,expected",
+    [
+        ("not (a=1 and b=2) or c=3", {"a": 1, "b": 2, "c": 3}, True),
+        ("not (a=1 and b=2) or c=3", {"a": 1, "b": 2, "c": 4}, False),
+        ("a=1 and not b=2 and c=3", {"a": 1, "b": 3, "c": 3}, True),
+        ("(a=1 or b=2) and (c=3 or d=4)", {"a": 0, "b": 2, "c": 0, "d": 4}, True),
+        ("(a=1 or b=2) and (c=3 or d=4)", {"a": 0, "b": 0, "c": 3, "d": 4}, False),
+    ],
+)
+def test_reorder_preserves_negation_and_grouping(
+    query: str, data: dict, expected: bool
+) -> None:
+    root = parse(query).root
+    record = Record(data)
+    for reorder in (None, "cost", "selectivity"):
+        assert Evaluator(reorder=reorder).evaluate(root, record) is expected
+    assert compile(root, reorder="cost")(record) is expected
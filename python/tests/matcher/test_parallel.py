@@ -0,0 +1,80 @@
+"""Process-pool matching in ``flyql.matcher.parallel``."""
+
+import pickle
+from typing import Any, Dict, List
+
+import pytest
+
+from flyql.core.exceptions import FlyqlError
+from flyql.core.parser import parse
+from flyql.matcher import Record, RegexCache, batch, compile, parallel
+from tests.matcher.helpers import counting
+
+ROWS: List[Dict[str, Any]] = [
+    {
+        "service": ["api", "db", "cache"][i % 3],
+        "status": 200 + (i * 37) % 400,
+        "message": "read timeout" if i % 11 == 0 else "ok",
+    }
+    for i in range(2000)
+]
+
+QUERY = "(status >= 500 and service = 'api') or message ~ 'time(out)?$'"
+
+
+def test_compiled_query_and_regex_cache_pickle() -> None:
+    cache = RegexCache(max_entries=8)
+    query = compile(parse(QUERY).root, regex_cache=cache)
+    clone = pickle.loads(pickle.dumps(query))
+    assert [clone(Record(row)) for row in ROWS[:50]] == [
+        query(Record(row)) for row in ROWS[:50]
+    ]
+    cache_clone = pickle.loads(pickle.dumps(cache))
+    assert cache_clone.max_entries == 8 and len(cache_clone) == 0
+
+
+@pytest.mark.parametrize("chunk_size", [None, 7])
+def test_ordered_matches_batch_filter(chunk_size: Any) -> None:
+    expected = list(batch.filter(QUERY, ROWS))
+    found = list(parallel.filter(QUERY, ROWS, workers=2, chunk_size=chunk_size))
+    assert found == expected
+    assert all(a is b for a, b in zip(found, expected))
+
+
+def test_unordered_yields_the_same_items() -> None:
+    records = [Record(row) if i % 2 else row for i, row in enumerate(ROWS)]
+    expected = list(batch.filter(QUERY, records))
+    found = list(parallel.filter(QUERY, records, workers=3, ordered=False))
+    assert sorted(map(id, found)) == sorted(map(id, expected))
+
+
+def test_input_is_read_with_backpressure() -> None:
+    seen: List[int] = []
+    matches = parallel.filter(
+        "status >= 0", counting(ROWS, seen), workers=1, chunk_size=10, max_pending=2
+    )
+    assert seen == []
+    assert next(matches) is ROWS[0]
+    assert len(seen) <= 30
+    matches.close()
+
+
+def test_errors_raised_before_reading_records() -> None:
+    seen: List[int] = []
+    for kwargs in ({}, {"workers": 0}, {"chunk_size": 0}, {"max_pending": 0}):
+        query = "status=$code" if not kwargs else "status = 1"
+        with pytest.raises(FlyqlError):
+            parallel.filter(query, counting(ROWS, seen), **kwargs)
+    assert seen == []
+
+
+def test_tuned_chunk_size_moves_towards_target() -> None:
+    target = parallel._TARGET_CHUNK_SECONDS
+    assert parallel._tuned_chunk_size(1000, target) == 1000
+    assert parallel._tuned_chunk_size(1000, target / 10) == 2000
+    assert parallel._tuned_chunk_size(1000, target * 10) == 500
+    assert parallel._tuned_chunk_size(1000, 0.0) == 2000
+    assert parallel._tuned_chunk_size(parallel._MAX_CHUNK_SIZE, 0.0) == (
+        parallel._MAX_CHUNK_SIZE
+    )
+    assert parallel._tuned_chunk_size(1, 1.0) == parallel._MIN_CHUNK_SIZE
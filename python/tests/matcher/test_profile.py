@@ -0,0 +1,75 @@
+"""Per-node profiling with ``Evaluator(profile=...)``."""
+
+from typing import Any, Dict, List
+
+import pytest
+
+from flyql.core.parser import parse
+from flyql.matcher import Evaluator, Profile, Record
+from flyql.matcher.profile import NodeStats
+
+QUERY = "status >= 500 and (service = 'api' or not region = 'eu')"
+ROWS: List[Dict[str, Any]] = [
+    {"status": 200, "service": "api", "region": "eu"},
+    {"status": 503, "service": "api", "region": "eu"},
+    {"status": 500, "service": "db", "region": "eu"},
+    {"status": 502, "service": "db", "region": "us"},
+]
+
+
+def leaves(tree: Dict[str, Any]) -> List[Dict[str, Any]]:
+    if "children" not in tree:
+        return [tree]
+    return [leaf for child in tree["children"] for leaf in leaves(child)]
+
+
+@pytest.mark.parametrize("reorder", [None, "cost"])
+def test_results_are_unchanged(reorder: Any) -> None:
+    root = parse(QUERY).root
+    plain = Evaluator(reorder=reorder)
+    profiled = Evaluator(reorder=reorder, profile=Profile())
+    assert [profiled.evaluate(root, Record(row)) for row in ROWS] == [
+        plain.evaluate(root, Record(row)) for row in ROWS
+    ]
+
+
+def test_counts_follow_short_circuiting() -> None:
+    root = parse(QUERY).root
+    profile = Profile()
+    evaluator = Evaluator(profile=profile)
+    for row in ROWS:
+        evaluator.evaluate(root, Record(row))
+
+    report = profile.to_dict(root, text=QUERY)
+    assert (report["kind"], report["evaluations"], report["true"]) == ("and", 4, 2)
+    by_text = {leaf["text"]: leaf for leaf in leaves(report)}
+    assert set(by_text) == {"status >= 500", "service = 'api'", "not region = 'eu'"}
+    status = by_text["status >= 500"]
+    assert (status["evaluations"], status["true"], status["false"]) == (4, 3, 1)
+    assert status["expression"] == "status>=500"
+    assert by_text["service = 'api'"]["evaluations"] == 3
+    # Only reached when service != 'api'; the negation sits on this node.
+    region = by_text["not region = 'eu'"]
+    assert (region["evaluations"], region["true"], region["negated"]) == (2, 1, True)
+    assert all(leaf["time_ns"] >= 0 for leaf in leaves(report))
+    assert report["time_ns"] >= status["time_ns"]
+
+
+def test_tree_and_stats_accessors() -> None:
+    root = parse("a = 1 or b = 2").root
+    profile = Profile()
+    evaluator = Evaluator(profile=profile)
+    evaluator.evaluate(root, Record({"a": 1}))
+    tree = profile.tree(root)
+    assert tree.node is root and tree.range == root.range
+    left, right = tree.children
+    assert profile.stats(left.node).true_ratio == 1.0
+    assert right.stats == NodeStats() and right.stats.true_ratio is None
+    profile.reset()
+    assert len(profile) == 0 and profile.stats(root).evaluations == 0
+
+
+def test_disabled_profiling_uses_the_plain_method() -> None:
+    evaluator = Evaluator()
+    assert evaluator.profile is None
+    assert "evaluate" not in vars(evaluator)
@@ -0,0 +1,157 @@
+"""Multi-query matching with ``flyql.matcher.QuerySet``."""
+
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List
+
+import pytest
+
+from flyql.core.column import ColumnSchema
+from flyql.core.exceptions import FlyqlError
+from flyql.core.parser import parse
+from flyql.matcher import Evaluator, QuerySet, Record
+from flyql.matcher import compiler as compiler_module
+
+QUERIES = {
+    "api-errors": "service = 'api' and status >= 500",
+    "db": "service in ['db', 'cache'] and latency > 250",
+    "api-or-db": "service = 'api' or service = 'db'",
+    "not-api": "not service = 'api'",
+    "panic": "message ~ 'panic'",
+    "flag-true": "flag = true and service = 'api'",
+    "flag-one": "flag = 1",
+    "nullish": "region = null",
+    "nested": "payload.user = 'alice' and status in [200, 201]",
+    "float": "ratio = 1.0",
+    "mixed-in": "code in [1, true, 'x', null]",
+    "like": "service like 'ap%' and status = 503",
+    "empty-in": "service in []",
+    "not-in": "service not in ['api']",
+    "upper": "service|upper = 'API'",
+    "ts": "ts > '2024-01-01'",
+}
+
+RECORDS: List[Dict[str, Any]] = [
+    {"service": "api", "status": 503, "flag": True, "code": True},
+    {"service": "api", "status": 200, "flag": 1, "code": 1, "ratio": 1},
+    {"service": "db", "latency": 300, "message": "kernel panic", "region": None},
+    {"service": "cache", "latency": 100, "code": "x", "ratio": 1.0},
+    {"payload": '{"user": "alice"}', "status": 201, "code": None},
+    {
+        "service": ["api"],
+        "flag": False,
+        "ts": datetime(2024, 5, 1, tzinfo=timezone.utc),
+    },
+    {"service": "API", "code": 1.0, "ts": "2023-12-31"},
+    {},
+]
+
+
+def build(queries: Dict[str, str] = QUERIES) -> QuerySet:
+    query_set = QuerySet()
+    for query_id, query in queries.items():
+        query_set.add(query_id, query)
+    return query_set
+
+
+def evaluate_each(queries: Dict[str, str], record: Dict[str, Any]) -> List[str]:
+    evaluator = Evaluator()
+    return [
+        query_id
+        for query_id, query in queries.items()
+        if evaluator.evaluate(parse(query).root, Record(record))
+    ]
+
+
+@pytest.mark.parametrize("record", RECORDS)
+def test_match_equals_evaluating_each_query(record: Dict[str, Any]) -> None:
+    assert build().match(record) == evaluate_each(QUERIES, record)
+
+
+def test_match_accepts_records() -> None:
+    assert build().match(Record(RECORDS[0])) == evaluate_each(QUERIES, RECORDS[0])
+
+
+def test_indexed_queries_are_not_evaluated_for_other_values(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    evaluated: List[str] = []
+    real = compiler_module._Compiler.expression
+
+    def tracking(self: Any, expression: Any) -> Any:
+        pred = real(self, expression)
+
+        def traced(record: Record) -> bool:
+            evaluated.append(str(expression))
+            return bool(pred(record))
+
+        return traced
+
+    monkeypatch.setattr(compiler_module._Compiler, "expression", tracking)
+    query_set = QuerySet()
+    for tenant in range(1000):
+        query_set.add(tenant, f"tenant = 't{tenant}' and level >= 3")
+    query_set.add("global", "level >= 5")
+    assert query_set.match({"tenant": "t42", "level": 5}) == [42, "global"]
+    # The guard is known to hold; only the shared residual leaf runs.
+    assert sorted(evaluated) == ["level>=3", "level>=5"]
+
+
+def test_identical_leaves_are_evaluated_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: List[str] = []
+    real = compiler_module._Compiler.expression
+
+    def tracking(self: Any, expression: Any) -> Any:
+        pred = real(self, expression)
+        return lambda record: calls.append(str(expression)) or pred(record)
+
+    monkeypatch.setattr(compiler_module._Compiler, "expression", tracking)
+    query_set = QuerySet()
+    for i in range(50):
+        query_set.add(i, f"message ~ 'timeout' and attempt >= {i % 5}")
+    query_set.match({"message": "read timeout", "attempt": 3})
+    assert calls.count("message~timeout") == 1
+    assert len(calls) == 1 + 5
+
+
+def test_add_replaces_and_remove_unindexes() -> None:
+    query_set = build({"a": "service = 'api'", "b": "service = 'api'"})
+    assert query_set.match({"service": "api"}) == ["a", "b"]
+    query_set.add("a", "service = 'db'")
+    assert len(query_set) == 2 and "a" in query_set
+    assert query_set.match({"service": "api"}) == ["b"]
+    assert query_set.match({"service": "db"}) == ["a"]
+    query_set.remove("b")
+    assert query_set.match({"service": "api"}) == []
+    query_set.remove("a")
+    assert list(query_set) == []
+    assert query_set._index == {} and query_set._leaf_preds == {}
+    with pytest.raises(KeyError):
+        query_set.remove("a")
+
+
+def test_add_errors_leave_the_set_unchanged() -> None:
+    query_set = build({"a": "status = 1"})
+    with pytest.raises(FlyqlError):
+        query_set.add("a", "status = 1 and code = $code")
+    with pytest.raises(FlyqlError):
+        query_set.add("b", "")
+    assert query_set.match({"status": 1}) == ["a"]
+    assert len(query_set._leaf_preds) == 1
+
+
+def test_schema_temporal_columns_stay_exact() -> None:
+    schema = ColumnSchema.from_plain_object(
+        {"day": {"type": "date"}, "service": {"type": "string"}}
+    )
+    queries = {"day": "day = '2024-05-01'", "svc": "service = 'api'"}
+    query_set = QuerySet(columns=schema)
+    for query_id, query in queries.items():
+        query_set.add(query_id, query)
+    record = {"day": date(2024, 5, 1), "service": "api"}
+    evaluator = Evaluator(columns=schema)
+    expected = [
+        query_id
+        for query_id, query in queries.items()
+        if evaluator.evaluate(parse(query).root, Record(record))
+    ]
+    assert query_set.match(record) == expected == ["day", "svc"]
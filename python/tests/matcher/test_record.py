@@ -0,0 +1,107 @@
+"""Per-record JSON-string decode cache and decoder hook in ``Record``."""
+
+import json
+from typing import Any, List
+
+import pytest
+
+from flyql.core.parser import parse
+from flyql.matcher import Evaluator, Record, compile
+from flyql.matcher.key import Key
+from flyql.matcher import record as record_module
+from flyql.matcher.record import fast_json_decoder, json_projector
+
+PAYLOAD = json.dumps({"userId": "u-1", "action": "view", "latencyMs": 10, "tags": [1]})
+
+
+class CountingDecoder:
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    def __call__(self, raw: str) -> Any:
+        self.calls.append(raw)
+        return json.loads(raw)
+
+
+def test_jsonstring_field_decoded_once_per_record() -> None:
+    decoder = CountingDecoder()
+    root = parse(
+        "Payload.userId='u-1' and Payload.action='view' and Payload.latencyMs>5 "
+        "and Payload.tags.0=1 and Payload.missing!='x'"
+    ).root
+    record = Record({"Payload": PAYLOAD}, decoder=decoder)
+    evaluator = Evaluator()
+    assert evaluator.evaluate(root, record) is False
+    assert compile(root)(record) is False
+    assert len(decoder.calls) == 1
+
+
+def test_undecodable_field_cached_as_none() -> None:
+    decoder = CountingDecoder()
+    record = Record({"Payload": "{broken}"}, decoder=decoder)
+    assert record.get_value(Key("Payload.a")) is None
+    assert record.get_value(Key("Payload.b")) is None
+    assert decoder.calls == ["{broken}"]
+
+
+def test_replaced_field_is_decoded_again() -> None:
+    record = Record({"j": '{"a": 1}'})
+    assert record.get_value(Key("j.a")) == 1
+    record.data["j"] = '{"a": 2}'
+    assert record.get_value(Key("j.a")) == 2
+
+
+def test_decode_fields_predecodes_eagerly() -> None:
+    decoder = CountingDecoder()
+    query = compile(parse("Payload.action='view' and Metadata.a.b=1 and Body").root)
+    assert query.nested_fields == frozenset({"Payload", "Metadata"})
+    record = Record(
+        {"Payload": PAYLOAD, "Metadata": {"a": {"b": 1}}, "Body": "x", "Other": "{}"},
+        decoder=decoder,
+        decode_fields=query.nested_fields,
+    )
+    assert decoder.calls == [PAYLOAD]
+    assert query(record) is True
+    assert decoder.calls == [PAYLOAD]
+
+
+def test_nested_fields_include_column_references() -> None:
+    query = compile(parse("a=b.c and d in [e.f, 'g']").root)
+    assert query.nested_fields == frozenset({"b", "e"})
+
+
+def test_fast_json_decoder_decodes() -> None:
+    decoder = fast_json_decoder()
+    assert decoder('{"a": [1, 2]}') == {"a": [1, 2]}
+    record = Record({"j": '{"a": 3}'}, decoder=decoder)
+    assert record.get_value(Key("j.a")) == 3
+
+
+JSON_LINE = json.dumps(
+    {"status": 500, "payload": {"user": "a"}, "noise": list(range(50))}
+)
+
+
+@pytest.mark.parametrize("lazy", [True, False])
+def test_json_projector_keeps_referenced_fields(
+    lazy: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    if lazy and not record_module._HAVE_SIMDJSON:
+        pytest.skip("pysimdjson not installed")
+    monkeypatch.setattr(record_module, "_HAVE_SIMDJSON", lazy)
+    decode = json_projector(["status", "payload", "missing"])
+    projected = decode(JSON_LINE)
+    assert projected is not None
+    assert projected["status"] == 500 and projected["payload"] == {"user": "a"}
+    assert list(projected) == ["status", "payload"]
+    assert decode(JSON_LINE.encode()) == projected
+    # Integers beyond 64 bits fall back to the full decoder, still projected.
+    wide = decode('{"status": 1, "big": 123456789012345678901234567890}')
+    assert wide == {"status": 1}
+    assert decode("[1, 2]") is None
+    assert decode("not json") is None
+    assert decode('{"status": 1} trailing') is None
+
+
+def test_json_projector_without_fields_decodes_everything() -> None:
+    assert json_projector()(JSON_LINE) == json.loads(JSON_LINE)
@@ -0,0 +1,94 @@
+"""Bounded, shareable regex cache: ``flyql.matcher.RegexCache``."""
+
+import threading
+
+import pytest
+
+from flyql.core.exceptions import FlyqlError
+from flyql.core.parser import parse
+from flyql.matcher import Evaluator, Record, RegexCache, compile, default_regex_cache
+
+try:
+    import re2  # type: ignore[import-untyped]  # noqa: F401
+
+    HAVE_RE2 = True
+except ImportError:
+    HAVE_RE2 = False
+
+pytestmark = pytest.mark.skipif(not HAVE_RE2, reason="requires the [re2] extra")
+
+
+def test_hits_misses_and_lru_eviction() -> None:
+    cache = RegexCache(max_entries=2)
+    first = cache.compile("a+")
+    assert cache.compile("a+") is first
+    cache.compile("b+")
+    cache.compile("a+")  # a+ is now most recent
+    cache.compile("c+")  # evicts b+
+    assert "a+" in cache and "c+" in cache and "b+" not in cache
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (2, 3, 1, 2)
+
+
+def test_program_size_bound() -> None:
+    cache = RegexCache(max_program_size=1)
+    cache.compile("abc")
+    cache.compile("def")
+    stats = cache.stats()
+    assert stats.entries == 1
+    assert stats.evictions == 1
+    assert stats.program_size == cache.compile("def").programsize
+
+
+def test_options_applied() -> None:
+    cache = RegexCache(options={"case_sensitive": False})
+    assert cache.compile("abc").search("xABCx")
+    with pytest.raises(FlyqlError):
+        RegexCache(options={"no_such_option": True})
+
+
+@pytest.mark.parametrize("kwargs", [{"max_entries": 0}, {"max_program_size": 0}])
+def test_invalid_bounds(kwargs: dict) -> None:
+    with pytest.raises(FlyqlError):
+        RegexCache(**kwargs)
+
+
+def test_invalid_pattern_raises() -> None:
+    with pytest.raises(FlyqlError, match="invalid regex given"):
+        RegexCache().compile("(")
+
+
+def test_evaluators_share_the_process_cache_by_default() -> None:
+    assert Evaluator().cache is default_regex_cache()
+    cache = RegexCache()
+    root = parse("msg~'^GET' and path like 'a_%'").root
+    record = Record({"msg": "GET /", "path": "abc"})
+    for _ in range(3):
+        assert Evaluator(regex_cache=cache).evaluate(root, record) is True
+    assert compile(root, regex_cache=cache)(record) is True
+    stats = cache.stats()
+    assert stats.misses == 2
+    assert stats.entries == 2
+
+
+def test_concurrent_access() -> None:
+    cache = RegexCache(max_entries=8)
+    errors = []
+
+    def worker(offset: int) -> None:
+        try:
+            for i in range(200):
+                pattern = f"x{(i + offset) % 16}"
+                assert cache.compile(pattern).search(pattern)
+        except Exception as err:  # pragma: no cover - surfaced below
+            errors.append(err)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    stats = cache.stats()
+    assert stats.entries <= 8
+    assert stats.hits + stats.misses == 8 * 200
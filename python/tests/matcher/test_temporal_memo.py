@@ -0,0 +1,129 @@
+"""Memoized ISO-8601 / numeric temporal coercion and the fixed-width parser."""
+
+from datetime import datetime, timezone
+from typing import Any, List
+
+import pytest
+
+from flyql.core.column import Column
+from flyql.flyql_type import Type
+from flyql.matcher import evaluator as evaluator_module
+from flyql.matcher.evaluator import Evaluator, _parse_fixed_iso
+
+
+@pytest.mark.parametrize(
+    "s",
+    [
+        "2024-05-15T12:30:45",
+        "2024-05-15 12:30:45",
+        "2024-05-15T12:30:45Z",
+        "2024-05-15T12:30:45.123",
+        "2024-05-15 12:30:45.007Z",
+        "1970-01-01T00:00:00Z",
+        "2024-02-29T23:59:59.999Z",
+    ],
+)
+def test_fixed_width_parser_matches_fromisoformat(s: str) -> None:
+    general = Evaluator._parse_iso_general(s)
+    assert _parse_fixed_iso(s) == general
+    fast = _parse_fixed_iso(s)
+    assert fast is not None and general is not None
+    assert fast.utcoffset() == general.utcoffset()
+
+
+@pytest.mark.parametrize(
+    "s",
+    [
+        "2024-05-15",
+        "2024-05-15T12:30",
+        "2024-05-15T12:30:45+02:00",
+        "2024-05-15T12:30:45.123456",
+        "2024-05-15T12:30:45.12Z",
+        "2024-13-15T12:30:45",
+        "2024-02-30T12:30:45Z",
+        "2024/05/15T12:30:45",
+        "2024-05-15x12:30:45",
+        "２０２４-05-15T12:30:45",
+        "2024-05-15T12:30:4a",
+    ],
+)
+def test_fixed_width_parser_declines_other_shapes(s: str) -> None:
+    assert _parse_fixed_iso(s) is None
+
+
+def test_fixed_width_and_general_paths_agree_on_ms() -> None:
+    evaluator = Evaluator()
+    for s in ["2024-05-15T12:30:45.123Z", "2024-05-15 12:30:45", "2024-05-15"]:
+        expected = int(
+            Evaluator._parse_iso_general(s)  # type: ignore[union-attr]
+            .replace(tzinfo=timezone.utc)
+            .timestamp()
+            * 1000
+        )
+        assert evaluator._parse_iso_string_to_ms(s, None) == expected
+
+
+def test_dst_gap_still_rejected_on_fast_path() -> None:
+    column = Column("ts", Type.DateTime, tz="America/New_York")
+    evaluator = Evaluator()
+    assert evaluator._parse_iso_string_to_ms("2026-03-08T02:30:00", column) is None
+    assert evaluator._parse_iso_string_to_ms("2026-03-08T03:30:00", column) == int(
+        datetime(2026, 3, 8, 7, 30, tzinfo=timezone.utc).timestamp() * 1000
+    )
+
+
+@pytest.fixture
+def parses(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    calls: List[str] = []
+    real = Evaluator._parse_iso_string_uncached
+
+    def counting(self: Any, s: str, column: Any) -> Any:
+        calls.append(s)
+        return real(self, s, column)
+
+    monkeypatch.setattr(Evaluator, "_parse_iso_string_uncached", counting)
+    return calls
+
+
+def test_string_to_ms_memoized_per_timezone(parses: List[str]) -> None:
+    evaluator = Evaluator()
+    moscow = Column("ts", Type.DateTime, tz="Europe/Moscow")
+    s = "2026-04-06T21:00:00"
+    utc_ms = evaluator._resolve_record_value_as_ms(s)
+    assert evaluator._resolve_record_value_as_ms(s) == utc_ms
+    moscow_ms = evaluator._resolve_record_value_as_ms(s, moscow)
+    assert utc_ms is not None and moscow_ms == utc_ms - 3 * 3_600_000
+    assert evaluator._resolve_record_value_as_ms(s, moscow) == moscow_ms
+    assert parses == [s, s]
+
+
+def test_invalid_strings_memoized_too(parses: List[str]) -> None:
+    evaluator = Evaluator()
+    for _ in range(3):
+        assert evaluator._resolve_record_value_as_ms("2024-99-99") is None
+    assert len(parses) == 1
+
+
+def test_date_memo_keyed_by_unit_and_timezone() -> None:
+    evaluator = Evaluator()
+    seconds = Column("d", Type.Date, unit="s")
+    millis = Column("d", Type.Date, unit="ms")
+    tokyo = Column("d", Type.Date, tz="Asia/Tokyo")
+    value = 1_715_700_000  # 2024-05-14T15:20:00Z in seconds
+    assert evaluator._resolve_record_value_as_date(value, seconds) == 20240514
+    assert evaluator._resolve_record_value_as_date(value, millis) == 19700120
+    assert evaluator._resolve_record_value_as_date(value * 1000, tokyo) == 20240515
+    assert evaluator._resolve_record_value_as_date(value, seconds) == 20240514
+    s = "2024-05-14T20:00:00Z"
+    assert evaluator._resolve_record_value_as_date(s, None) == 20240514
+    assert evaluator._resolve_record_value_as_date(s, tokyo) == 20240515
+
+
+def test_memo_is_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(evaluator_module, "_TEMPORAL_MEMO_SIZE", 4)
+    evaluator = Evaluator()
+    for second in range(10):
+        evaluator._resolve_record_value_as_ms(f"2024-05-15T12:30:{second:02d}Z")
+        evaluator._resolve_record_value_as_date(second * 86_400_000)
+    assert 0 < len(evaluator._iso_ms_memo) <= 4
+    assert 0 < len(evaluator._date_memo) <= 4
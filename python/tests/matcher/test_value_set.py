@@ -0,0 +1,62 @@
+"""Hash-based IN-list membership: ``StrictValueSet`` and its use by the
+Evaluator and compiled queries."""
+
+import pytest
+
+from flyql.core.parser import parse
+from flyql.matcher import Evaluator, Record, compile
+from flyql.matcher.value_set import StrictValueSet, strict_equal
+
+ITEMS = [1, 2.5, "a", True, None, float("nan"), [1, 2], {"k": 1}]
+
+
+@pytest.mark.parametrize(
+    "value",
+    [1, 1.0, 2.5, "a", "b", True, False, 0, None, float("nan"), [1, 2], [1], {"k": 1}],
+)
+def test_membership_matches_linear_strict_scan(value: object) -> None:
+    expected = any(strict_equal(value, item) for item in ITEMS)
+    assert (value in StrictValueSet(ITEMS)) is expected
+
+
+def test_bool_and_int_are_distinct() -> None:
+    assert True not in StrictValueSet([1])
+    assert 1 not in StrictValueSet([True])
+    assert 0 not in StrictValueSet([False])
+    assert False in StrictValueSet([False, 0])
+
+
+def test_len_counts_partitions() -> None:
+    assert len(StrictValueSet(ITEMS)) == 7
+
+
+def test_static_in_list_hashed_once_per_expression(monkeypatch) -> None:
+    calls = []
+    evaluator = Evaluator()
+    real = evaluator._resolve_in_values
+
+    def counting(*args, **kwargs):  # type: ignore[no-untyped-def]
+        calls.append(args)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(evaluator, "_resolve_in_values", counting)
+    root = parse("status in [200, 201, 204] and region not in ['eu', 'us']").root
+    records = [Record({"status": 200 + i, "region": "ap"}) for i in range(10)]
+    assert [evaluator.evaluate(root, r) for r in records] == [
+        i in (0, 1, 4) for i in range(10)
+    ]
+    assert len(calls) == 2
+
+
+def test_column_reference_in_list_resolved_per_record() -> None:
+    root = parse("a in [b, 3]").root
+    evaluator = Evaluator()
+    query = compile(root)
+    for data, expected in [
+        ({"a": 1, "b": 1}, True),
+        ({"a": 2, "b": 1}, False),
+        ({"a": 3, "b": 1}, True),
+        ({"a": "b"}, True),
+    ]:
+        assert evaluator.evaluate(root, Record(data)) is expected
+        assert query(Record(data)) is expected
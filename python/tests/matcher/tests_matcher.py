@@ -1,6 +1,4 @@
-import json
 from datetime import date, datetime, timedelta, timezone
-from pathlib import Path
 
 import pytest
 
@@ -9,25 +7,7 @@ from flyql.core.parser import parse
 from flyql.core.exceptions import FlyqlError
 from flyql.matcher.evaluator import Evaluator
 from flyql.matcher.record import Record
-
-try:
-    import re2  # type: ignore[import-untyped]
-
-    HAVE_RE2 = True
-except ImportError:
-    HAVE_RE2 = False
-
-
-def load_matcher_test_data(filename: str) -> list:
-    test_data_path = (
-        Path(__file__).resolve().parent.parent.parent.parent
-        / "tests-data"
-        / "matcher"
-        / filename
-    )
-    with open(test_data_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return data["tests"]
+from tests.matcher.helpers import HAVE_RE2, load_matcher_test_data
 
 
 @pytest.mark.parametrize(
@@ -0,0 +1,121 @@
+"""``python -m flyql.grep``: NDJSON filter CLI."""
+
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from flyql import grep
+
+ROWS = [
+    {"service": "api", "status": 200},
+    {"service": "api", "status": 503},
+    {"service": "db", "status": 500, "payload": '{"user": "a"}'},
+    {"service": "api", "status": 502},
+]
+
+
+@pytest.fixture
+def log(tmp_path: Path) -> Path:
+    path = tmp_path / "app.log"
+    lines = [json.dumps(row) for row in ROWS] + ["not json", "", "[1]"]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def run(capsysbinary: pytest.CaptureFixture[bytes], *argv: str) -> tuple:
+    status = grep.main(list(argv))
+    return status, capsysbinary.readouterr().out.decode().splitlines()
+
+
+def matching(*indexes: int) -> List[str]:
+    return [json.dumps(ROWS[i]) for i in indexes]
+
+
+@pytest.mark.parametrize("extra", [[], ["--mmap"]])
+def test_prints_matching_lines(
+    log: Path, capsysbinary: pytest.CaptureFixture[bytes], extra: List[str]
+) -> None:
+    status, out = run(capsysbinary, *extra, "status >= 500", str(log))
+    assert (status, out) == (0, matching(1, 2, 3))
+
+
+def test_count_limit_and_no_match(
+    log: Path, capsysbinary: pytest.CaptureFixture[bytes]
+) -> None:
+    assert run(capsysbinary, "-c", "service = 'api'", str(log)) == (0, ["3"])
+    assert run(capsysbinary, "-m", "2", "service = 'api'", str(log)) == (
+        0,
+        matching(0, 1),
+    )
+    assert run(capsysbinary, "-c", "-m", "1", "status > 0", str(log)) == (0, ["1"])
+    assert run(capsysbinary, "service = 'web'", str(log)) == (1, [])
+
+
+def test_reads_stdin(
+    log: Path,
+    capsysbinary: pytest.CaptureFixture[bytes],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    stdin = io.TextIOWrapper(io.BytesIO(log.read_bytes()))
+    monkeypatch.setattr(sys, "stdin", stdin)
+    assert run(capsysbinary, "payload.user = 'a'") == (0, matching(2))
+
+
+def test_schema_file(
+    tmp_path: Path, capsysbinary: pytest.CaptureFixture[bytes]
+) -> None:
+    schema = tmp_path / "schema.json"
+    schema.write_text(json.dumps({"day": {"type": "date"}}), encoding="utf-8")
+    data = tmp_path / "days.log"
+    data.write_text('{"day": "2024-05-01"}\n{"day": "2023-01-01"}\n', encoding="utf-8")
+    status, out = run(
+        capsysbinary, "--schema", str(schema), "day > '2024-01-01'", str(data)
+    )
+    assert (status, out) == (0, ['{"day": "2024-05-01"}'])
+
+
+def test_errors(log: Path, capsysbinary: pytest.CaptureFixture[bytes]) -> None:
+    with pytest.raises(SystemExit) as exc:
+        grep.main(["status =", str(log)])
+    assert exc.value.code == 2
+    status, out = run(capsysbinary, "status = 503", str(log), str(log) + ".missing")
+    assert (status, out) == (2, matching(1))
+
+
+@pytest.mark.parametrize("size", [1, 7, 50])
+def test_byte_ranges_partition_lines(log: Path, size: int) -> None:
+    data = log.read_bytes()
+    lines: List[bytes] = []
+    with open(log, "rb") as handle:
+        for start in range(0, len(data), size):
+            lines.extend(grep._lines(handle, start, start + size))
+    assert b"".join(lines) == data
+
+
+@pytest.mark.parametrize("extra", [[], ["--mmap"], ["-c"], ["-m", "2"]])
+def test_jobs_match_serial_output(
+    log: Path,
+    capsysbinary: pytest.CaptureFixture[bytes],
+    monkeypatch: pytest.MonkeyPatch,
+    extra: List[str],
+) -> None:
+    monkeypatch.setattr(grep, "_MIN_SHARD_BYTES", 16)
+    serial = run(capsysbinary, *extra, "status >= 500", str(log), str(log))
+    assert len(grep._shards(str(log), 3, False)) == 3
+    parallel = run(capsysbinary, "-j", "3", *extra, "status >= 500", str(log), str(log))
+    assert parallel == serial
+
+
+def test_module_entry_point(log: Path) -> None:
+    result = subprocess.run(
+        [sys.executable, "-m", "flyql.grep", "-c", "status = 503", str(log)],
+        capture_output=True,
+        check=False,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+    assert (result.returncode, result.stdout) == (0, b"1\n")
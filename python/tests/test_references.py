@@ -0,0 +1,44 @@
+"""Referenced key paths: ``flyql.referenced_paths``."""
+
+import pytest
+
+from flyql import referenced_paths
+from flyql.columns import parse as parse_columns
+from flyql.core.parser import parse
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("status = 200", {("status",)}),
+        ("a = 1 and (b = 2 or not c)", {("a",), ("b",), ("c",)}),
+        ("payload.user.id = 7", {("payload", "user", "id")}),
+        ("min <= max", {("min",), ("max",)}),
+        ("a = other.field", {("a",), ("other", "field")}),
+        ("a in [b, 'c', 1, d.e]", {("a",), ("b",), ("d", "e")}),
+        ("message|upper = 'X'", {("message",)}),
+        ("ts > ago(1h)", {("ts",)}),
+    ],
+)
+def test_query_paths(query: str, expected: set) -> None:
+    assert referenced_paths(parse(query).root) == expected
+
+
+def test_columns_spec_paths() -> None:
+    columns = parse_columns(
+        "message|chars(25) as msg, meta.labels.tier", {"transformers": True}
+    )
+    root = parse("status = 500").root
+    assert referenced_paths(root, columns) == {
+        ("status",),
+        ("message",),
+        ("meta", "labels", "tier"),
+    }
+    assert referenced_paths(columns=columns) == {
+        ("message",),
+        ("meta", "labels", "tier"),
+    }
+
+
+def test_empty() -> None:
+    assert referenced_paths() == frozenset()
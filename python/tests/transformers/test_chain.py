@@ -0,0 +1,179 @@
+import pickle
+from typing import Any, List
+
+import pytest
+
+from flyql.core.exceptions import FlyqlError
+from flyql.core.parser import parse
+from flyql.flyql_type import Type
+from flyql.generators.transformer_helpers import apply_transformer_sql
+from flyql.matcher import Evaluator, Record
+from flyql.transformers.base import ArgSpec, Transformer
+from flyql.transformers.builtins import SplitTransformer
+from flyql.transformers.registry import (
+    TransformerRegistry,
+    default_registry,
+    shared_default_registry,
+)
+
+
+class _Noop(Transformer):
+    @property
+    def name(self) -> str:
+        return "noop"
+
+    @property
+    def input_type(self) -> Type:
+        return Type.Any
+
+    @property
+    def output_type(self) -> Type:
+        return Type.String
+
+    def sql(self, dialect: str, column_ref: str, args: Any = None) -> str:
+        return column_ref
+
+    def apply(self, value: Any, args: Any = None) -> Any:
+        return value
+
+
+def chain_of(query: str) -> List[Any]:
+    node = parse(query).root
+    while node is not None and node.expression is None:
+        node = node.left
+    assert node is not None and node.expression is not None
+    return node.expression.key.transformers
+
+
+class TestTransformerChain:
+    @pytest.mark.parametrize(
+        "query,value,expected",
+        [
+            ("m = 1", "Ab", "Ab"),
+            ("m|upper = 1", "Ab", "AB"),
+            ("m|lower|len = 1", "Ab", 2),
+            ("m|split(',') = 1", "a,b,c", ["a", "b", "c"]),
+            ("m|upper|lower|len = 1", "Abc", 3),
+        ],
+    )
+    def test_apply_matches_step_by_step(
+        self, query: str, value: Any, expected: Any
+    ) -> None:
+        transformers = chain_of(query)
+        registry = default_registry()
+        step_by_step = value
+        for t in transformers:
+            transformer = registry.get(t.name)
+            assert transformer is not None
+            step_by_step = transformer.apply(step_by_step, t.arguments)
+        assert registry.chain(transformers).apply(value) == step_by_step == expected
+
+    @pytest.mark.parametrize("dialect", ["clickhouse", "postgresql", "starrocks"])
+    def test_sql_template_matches_step_by_step(self, dialect: str) -> None:
+        transformers = chain_of("m|split(',')|len = 1")
+        registry = default_registry()
+        chain = registry.chain(transformers)
+        expected = "col"
+        for t in transformers:
+            transformer = registry.get(t.name)
+            assert transformer is not None
+            expected = transformer.sql(dialect, expected, t.arguments)
+        assert chain.sql(dialect, "col") == expected
+        assert chain.sql(dialect, "other") == expected.replace("col", "other")
+        assert chain.output_type == Type.Int
+
+    def test_chains_are_cached_until_register(self) -> None:
+        registry = default_registry()
+        transformers = chain_of("m|lower|len = 1")
+        chain = registry.chain(transformers)
+        assert registry.chain(chain_of("x|lower|len = 2")) is chain
+        assert registry.chain(chain_of("m|upper|len = 1")) is not chain
+        registry.register(_Noop())
+        assert registry.chain(transformers) is not chain
+
+    def test_validation_happens_when_compiling(self) -> None:
+        registry = default_registry()
+        with pytest.raises(FlyqlError, match="unknown transformer: nope"):
+            registry.chain(chain_of("m|nope = 1"))
+        with pytest.raises(FlyqlError, match="upper expects 0 arguments, got 1"):
+            registry.chain(chain_of("m|upper('x') = 1"))
+        with pytest.raises(FlyqlError, match="upper expects 0 arguments, got 1"):
+            apply_transformer_sql("m", chain_of("m|upper('x') = 1"), "clickhouse")
+
+    def test_default_registry_is_shared_for_callers_without_one(self) -> None:
+        transformers = chain_of("m|lower = 1")
+        apply_transformer_sql("m", transformers, "clickhouse")
+        assert shared_default_registry().chain(transformers).sql(
+            "clickhouse", "m"
+        ) == apply_transformer_sql("m", transformers, "clickhouse")
+        assert default_registry() is not shared_default_registry()
+
+    def test_evaluator_compiles_each_chain_once(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        registry = default_registry()
+        lookups: List[str] = []
+        real_get = registry.get
+
+        def get(name: str) -> Any:
+            lookups.append(name)
+            return real_get(name)
+
+        monkeypatch.setattr(registry, "get", get)
+        root = parse("m|lower|len = 2").root
+        assert root is not None
+        evaluator = Evaluator(registry=registry)
+        results = [evaluator.evaluate(root, Record({"m": m})) for m in ["Ab", "abc"]]
+        assert results == [True, False]
+        assert lookups == ["lower", "len"]
+
+
+class _Mul(Transformer):
+    arg_schema = (ArgSpec(Type.Float),)
+
+    @property
+    def name(self) -> str:
+        return "mul"
+
+    @property
+    def input_type(self) -> Type:
+        return Type.Any
+
+    @property
+    def output_type(self) -> Type:
+        return Type.Float
+
+    def sql(self, dialect: str, column_ref: str, args: Any = None) -> str:
+        return f"({column_ref} * {args[0]})"
+
+    def apply(self, value: Any, args: Any = None) -> Any:
+        return value * args[0]
+
+
+class TestChainCache:
+    def test_arguments_are_keyed_with_their_types(self) -> None:
+        registry = default_registry()
+        registry.register(_Mul())
+        integral = registry.chain(chain_of("x|mul(1) = 1"))
+        real = registry.chain(chain_of("x|mul(1.0) = 1"))
+        assert real is not integral
+        assert real.sql("clickhouse", "x") == "(x * 1.0)"
+        assert isinstance(real.apply(3), float)
+
+    def test_cache_is_bounded(self) -> None:
+        registry = TransformerRegistry(max_chains=8)
+        registry.register(SplitTransformer())
+        for n in range(100):
+            registry.chain(chain_of(f"x|split('{n}') = 1"))
+        assert len(registry._chains) == 8
+        recent = registry.chain(chain_of("x|split('99') = 1"))
+        assert registry.chain(chain_of("x|split('99') = 1")) is recent
+        with pytest.raises(FlyqlError):
+            TransformerRegistry(max_chains=0)
+
+    def test_pickles_without_its_chains(self) -> None:
+        registry = default_registry()
+        registry.chain(chain_of("x|upper = 1"))
+        copy = pickle.loads(pickle.dumps(registry))
+        assert copy.names() == registry.names() and not copy._chains
+        assert copy.chain(chain_of("x|upper = 1")).apply("a") == "A"